@@ -8,11 +8,13 @@ from tkinter import messagebox, filedialog
 from database import db
 from config import COLORS
 import re
-import csv
-import json
+import os
+import threading
 from datetime import datetime
 from email_utils import generate_otp, send_otp_email
 from otp_dialog import OTPVerificationDialog
+import data_export
+import data_import
 
 class AccountSettings:
     """Account Settings View"""
@@ -87,12 +89,22 @@ class AccountSettings:
         self.create_action_card(
             actions_container,
             "📥 Export Data",
-            "Download your study data as CSV",
+            "Download all your study data (CSV, JSONL, Zip)",
             COLORS['primary'],
             self.export_data,
             row=1, col=0
         )
         
+        # Data Import
+        self.create_action_card(
+            actions_container,
+            "📤 Import Data",
+            "Bring in sessions, notes and goals from CSV, JSONL or Zip",
+            COLORS['success'],
+            self.import_data,
+            row=1, col=1
+        )
+        
         # Logout
         self.create_action_card(
             actions_container,
@@ -100,7 +112,7 @@ class AccountSettings:
             "Sign out of your account",
             COLORS['secondary'],
             self.logout_account,
-            row=1, col=1
+            row=2, col=0
         )
         
         # Danger Zone
@@ -700,51 +712,17 @@ class AccountSettings:
                 label.configure(text=txt.replace("✓", "○"), text_color=COLORS['text_light'])
 
     def export_data(self):
-        """Export user data to CSV"""
-        filename = filedialog.asksaveasfilename(
-            defaultextension=".csv",
-            filetypes=[("CSV Files", "*.csv")],
-            title="Export Study Data"
+        """Export user data (streamed in the background)"""
+        ExportDialog(self.parent, self.user_id)
+
+    def import_data(self):
+        """Import study data from a file (batched, in the background)"""
+        filename = filedialog.askopenfilename(
+            filetypes=[("Study data", "*.csv *.jsonl *.zip"), ("All Files", "*.*")],
+            title="Import Study Data"
         )
-        
-        if not filename:
-            return
-            
-        try:
-            # Gather data
-            sessions = db.get_user_sessions(self.user_id) or []
-            subjects = db.get_user_subjects(self.user_id) or []
-            goals = db.get_user_goals(self.user_id) or []
-            
-            with open(filename, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                
-                # Write Subjects
-                writer.writerow(["--- SUBJECTS ---"])
-                writer.writerow(["ID", "Name", "Code", "Created At"])
-                for s in subjects:
-                    writer.writerow([s['subject_id'], s['subject_name'], s['subject_code'], s['created_at']])
-                
-                writer.writerow([])
-                
-                # Write Sessions
-                writer.writerow(["--- STUDY SESSIONS ---"])
-                writer.writerow(["ID", "Subject", "Date", "Duration (mins)", "Notes"])
-                for s in sessions:
-                    writer.writerow([s['session_id'], s['subject_name'], s['session_date'], s['duration_minutes'], s['notes']])
-                
-                writer.writerow([])
-                
-                # Write Goals
-                writer.writerow(["--- GOALS ---"])
-                writer.writerow(["ID", "Subject", "Goal Type", "Target", "Status", "Deadline"])
-                for g in goals:
-                    writer.writerow([g['goal_id'], g.get('subject_name', 'General'), g['goal_type'], g['target_value'], g['status'], g['target_date']])
-            
-            messagebox.showinfo("Success", "Data exported successfully!", parent=self.parent)
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to export data: {str(e)}", parent=self.parent)
+        if filename:
+            ImportDialog(self.parent, self.dashboard, filename)
 
     def logout_account(self):
         """Logout from account"""
@@ -884,4 +862,231 @@ class AccountSettings:
             hover_color="#E53935",
             text_color="white",
             command=confirm_delete
-        ).pack(side="right")
\ No newline at end of file
+        ).pack(side="right")
+
+
+class ExportDialog(ctk.CTkToplevel):
+    """Pick an export format and stream the export in a background thread"""
+    
+    def __init__(self, parent, user_id):
+        super().__init__(parent)
+        self.user_id = user_id
+        self.running = False
+        self.cancelled = False
+        self.path = None
+        
+        self.title("Export Study Data")
+        self.configure(fg_color=COLORS['background'])
+        self.geometry("420x300")
+        self.resizable(False, False)
+        
+        x = (self.winfo_screenwidth() - 420) // 2
+        y = (self.winfo_screenheight() - 300) // 2
+        self.geometry(f"+{x}+{y}")
+        
+        self.transient(parent)
+        self.grab_set()
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+        
+        self.create_ui()
+        
+    def create_ui(self):
+        ctk.CTkLabel(
+            self,
+            text="📥 Export Data",
+            font=("Segoe UI Display", 20, "bold"),
+            text_color=COLORS['text']
+        ).pack(pady=(20, 5))
+        
+        ctk.CTkLabel(
+            self,
+            text="Subjects, sessions, goals, notes, moods, plans and chat history",
+            font=("Segoe UI", 12),
+            text_color=COLORS['text_light']
+        ).pack(pady=(0, 15))
+        
+        self.formats = {data_export.EXPORT_FORMATS[f][0]: f for f in data_export.available_formats()}
+        self.format_menu = ctk.CTkOptionMenu(
+            self,
+            values=list(self.formats),
+            width=300,
+            fg_color=COLORS['card'],
+            button_color=COLORS['primary']
+        )
+        self.format_menu.pack(pady=(0, 15))
+        
+        self.progress = ctk.CTkProgressBar(self, width=300, progress_color=COLORS['primary'])
+        self.progress.set(0)
+        self.progress.pack(pady=(0, 5))
+        
+        self.status_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=("Segoe UI", 12),
+            text_color=COLORS['text_light']
+        )
+        self.status_label.pack(pady=(0, 10))
+        
+        self.export_btn = ctk.CTkButton(
+            self,
+            text="Export",
+            width=200,
+            height=38,
+            font=("Segoe UI Bold", 14),
+            fg_color=COLORS['primary'],
+            hover_color=COLORS['secondary'],
+            text_color=COLORS['background'],
+            command=self.start_export
+        )
+        self.export_btn.pack()
+        
+    def start_export(self):
+        fmt = self.formats[self.format_menu.get()]
+        label, extension = data_export.EXPORT_FORMATS[fmt]
+        
+        self.path = filedialog.asksaveasfilename(
+            parent=self,
+            defaultextension=extension,
+            filetypes=[(label, f"*{extension}")],
+            initialfile=f"study_data_{datetime.now().strftime('%Y%m%d')}{extension}",
+            title="Export Study Data"
+        )
+        if not self.path:
+            return
+        
+        self.running = True
+        self.export_btn.configure(state="disabled", text="Exporting...")
+        self.format_menu.configure(state="disabled")
+        threading.Thread(target=self.run_export, args=(fmt,), daemon=True).start()
+        
+    def run_export(self, fmt):
+        """Worker thread: stream the export, reporting progress to the Tk thread"""
+        rows, error = 0, None
+        try:
+            rows = data_export.export_user_data(db, self.user_id, self.path, fmt, progress=self.on_progress)
+        except Exception as e:
+            error = e
+        
+        if error or self.cancelled:
+            self.remove_partial_file()
+        if self.cancelled:
+            return  # Dialog is already gone
+        self.after(0, lambda: self.finish(rows, error))
+            
+    def on_progress(self, table, index, total, rows):
+        if self.cancelled:
+            raise RuntimeError("Export cancelled")
+        text = f"Exporting {table}... {rows:,} rows" if table else f"{rows:,} rows exported"
+        self.after(0, lambda: self.update_progress(index / total if total else 1, text))
+        
+    def update_progress(self, fraction, text):
+        if self.winfo_exists():
+            self.progress.set(fraction)
+            self.status_label.configure(text=text)
+        
+    def finish(self, rows, error):
+        self.running = False
+        if error:
+            messagebox.showerror("Error", f"Failed to export data: {str(error)}", parent=self)
+            self.export_btn.configure(state="normal", text="Export")
+            self.format_menu.configure(state="normal")
+            return
+        messagebox.showinfo("Success", f"Data exported successfully! ({rows:,} rows)", parent=self)
+        self.destroy()
+        
+    def remove_partial_file(self):
+        try:
+            if self.path and os.path.exists(self.path):
+                os.remove(self.path)
+        except OSError:
+            pass
+        
+    def cancel(self):
+        if self.running:
+            self.cancelled = True
+        self.destroy()
+
+
+class ImportDialog(ctk.CTkToplevel):
+    """Runs a StudyDataImporter in a background thread and reports progress"""
+    
+    def __init__(self, parent, dashboard, path):
+        super().__init__(parent)
+        self.dashboard = dashboard
+        self.path = path
+        
+        self.title("Import Study Data")
+        self.configure(fg_color=COLORS['background'])
+        self.geometry("420x220")
+        self.resizable(False, False)
+        
+        x = (self.winfo_screenwidth() - 420) // 2
+        y = (self.winfo_screenheight() - 220) // 2
+        self.geometry(f"+{x}+{y}")
+        
+        self.transient(parent)
+        self.grab_set()
+        
+        ctk.CTkLabel(
+            self,
+            text="📤 Importing...",
+            font=("Segoe UI Display", 20, "bold"),
+            text_color=COLORS['text']
+        ).pack(pady=(25, 5))
+        
+        ctk.CTkLabel(
+            self,
+            text=os.path.basename(path),
+            font=("Segoe UI", 12),
+            text_color=COLORS['text_light']
+        ).pack()
+        
+        self.progress = ctk.CTkProgressBar(self, width=300, mode="indeterminate",
+                                           progress_color=COLORS['success'])
+        self.progress.pack(pady=20)
+        self.progress.start()
+        
+        self.status_label = ctk.CTkLabel(
+            self,
+            text="Starting...",
+            font=("Segoe UI", 12),
+            text_color=COLORS['text_light']
+        )
+        self.status_label.pack()
+        
+        threading.Thread(target=self.run_import, daemon=True).start()
+        
+    def run_import(self):
+        importer = data_import.StudyDataImporter(db, self.dashboard.user['user_id'],
+                                                 progress=self.on_progress)
+        try:
+            report = importer.import_file(self.path)
+            self.after(0, lambda: self.finish(report, None))
+        except Exception as e:
+            self.after(0, lambda err=e: self.finish(None, err))
+            
+    def on_progress(self, position, report):
+        self.after(0, lambda: self.status_label.configure(text=f"{position:,} records processed"))
+        
+    def finish(self, report, error):
+        self.progress.stop()
+        if error:
+            messagebox.showerror(
+                "Import Failed",
+                f"{error}\n\nImported rows so far are kept; importing the same file again resumes.",
+                parent=self
+            )
+            self.destroy()
+            return
+        
+        imported = sum(report['imported'].values())
+        skipped = sum(report['skipped'].values())
+        lines = [f"Imported {imported:,} rows."]
+        lines += [f"  • {table}: {count:,}" for table, count in report['imported'].items()]
+        if skipped:
+            lines.append(f"Skipped {skipped:,} rows.")
+        for position, table, message in report['errors'][:5]:
+            lines.append(f"  • record {position} ({table}): {message}")
+        
+        messagebox.showinfo("Import Complete", "\n".join(lines), parent=self)
+        self.destroy()
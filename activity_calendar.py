@@ -0,0 +1,108 @@
+"""
+Activity Calendar - Bit-packed yearly study activity
+One row per user per year: a 366-bit "studied" bitmap (46 bytes) plus
+366 little-endian uint16 minute buckets (732 bytes). A full year heatmap
+is a single ~800 byte read instead of one row per day.
+"""
+
+from array import array
+from datetime import date, timedelta
+import sys
+
+DAYS = 366
+BITMAP_BYTES = (DAYS + 7) // 8
+MINUTES_BYTES = DAYS * 2
+MAX_MINUTES = 0xFFFF
+LEVELS = 4  # Heatmap intensity levels above "none" (GitHub style)
+
+
+def day_index(day):
+    return day.timetuple().tm_yday - 1
+
+
+def empty():
+    return bytes(BITMAP_BYTES), bytes(MINUTES_BYTES)
+
+
+def decode_minutes(blob):
+    """BLOB -> list of 366 minute totals"""
+    values = array('H')
+    values.frombytes(bytes(blob or b'').ljust(MINUTES_BYTES, b'\0')[:MINUTES_BYTES])
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tolist()
+
+
+def encode_minutes(values):
+    packed = array('H', (max(0, min(MAX_MINUTES, int(v))) for v in values))
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def decode_bits(blob):
+    """BINARY(46) -> list of 366 booleans"""
+    data = bytes(blob or b'').ljust(BITMAP_BYTES, b'\0')
+    return [bool(data[i >> 3] >> (i & 7) & 1) for i in range(DAYS)]
+
+
+def encode_bits(flags):
+    data = bytearray(BITMAP_BYTES)
+    for i, flag in enumerate(flags):
+        if flag:
+            data[i >> 3] |= 1 << (i & 7)
+    return bytes(data)
+
+
+def add_minutes(day_bits, minutes_blob, day, delta):
+    """Return updated (day_bits, minutes) with `delta` minutes added to `day`"""
+    index = day_index(day)
+    minutes = decode_minutes(minutes_blob)
+    minutes[index] = max(0, min(MAX_MINUTES, minutes[index] + int(delta)))
+    bits = bytearray(bytes(day_bits or b'').ljust(BITMAP_BYTES, b'\0'))
+    if minutes[index]:
+        bits[index >> 3] |= 1 << (index & 7)
+    else:
+        bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+    return bytes(bits), encode_minutes(minutes)
+
+
+def build(day_minutes):
+    """{date: minutes} for one year -> (day_bits, minutes)"""
+    minutes = [0] * DAYS
+    for day, total in day_minutes.items():
+        minutes[day_index(day)] += int(total or 0)
+    return encode_bits(m > 0 for m in minutes), encode_minutes(minutes)
+
+
+def intensity_levels(minutes):
+    """0 for no study, else 1..LEVELS by quartile of the user's own active days"""
+    active = sorted(m for m in minutes if m > 0)
+    if not active:
+        return [0] * len(minutes)
+    cuts = [active[min(len(active) - 1, len(active) * q // LEVELS)] for q in range(1, LEVELS)]
+    levels = []
+    for m in minutes:
+        if m <= 0:
+            levels.append(0)
+        else:
+            levels.append(1 + sum(1 for c in cuts if m > c))
+    return levels
+
+
+def year_cells(year, minutes):
+    """
+    Heatmap layout: (column, row, date, minutes, level) per day of `year`.
+    Columns are weeks, rows are weekdays (Monday = 0).
+    """
+    start = date(year, 1, 1)
+    first_column_start = start - timedelta(days=start.weekday())
+    levels = intensity_levels(minutes)
+    cells = []
+    day = start
+    while day.year == year:
+        index = day_index(day)
+        column = (day - first_column_start).days // 7
+        cells.append((column, day.weekday(), day, minutes[index], levels[index]))
+        day += timedelta(days=1)
+    return cells
@@ -34,8 +34,9 @@ class StreakGarden(ctk.CTkFrame):
             text_color=COLORS['text']
         ).pack(pady=(25, 15), padx=25, anchor="w")
         
-        # Current streak
-        streak_days = db.get_current_streak(self.user_id)
+        # Current streak and garden come from one precomputed row
+        summary = db.get_streak_summary(self.user_id, days=7)
+        streak_days = summary['current_streak']
         
         streak_frame = ctk.CTkFrame(
             self,
@@ -49,7 +50,14 @@ class StreakGarden(ctk.CTkFrame):
             text=f"🔥 {streak_days} Day Streak!",
             font=("Arial Black", 24),
             text_color="white"
-        ).pack(pady=15)
+        ).pack(pady=(15, 0))
+        
+        ctk.CTkLabel(
+            streak_frame,
+            text=f"🏆 Best: {summary['longest_streak']} days",
+            font=("Arial", 12, "bold"),
+            text_color="white"
+        ).pack(pady=(0, 12))
         
         # Garden visualization (last 7 days)
         garden_frame = ctk.CTkFrame(
@@ -59,23 +67,18 @@ class StreakGarden(ctk.CTkFrame):
         )
         garden_frame.pack(fill="x", padx=25, pady=(0, 20))
         
-        garden_data = db.get_streak_garden(self.user_id, days=7)
+        garden_data = summary['garden']
         
         # Days grid
         days_container = ctk.CTkFrame(garden_frame, fg_color="transparent")
         days_container.pack(padx=15, pady=15)
         
-        for i in range(7):
+        for day in garden_data:
             day_col = ctk.CTkFrame(days_container, fg_color="transparent")
             day_col.pack(side="left", padx=8)
             
-            # Check if studied
-            studied = False
-            if i < len(garden_data):
-                studied = garden_data[i]['studied']
-            
-            # Flower emoji
-            flower = "🌸" if studied else "🥀"
+            # Flower emoji: studied > logged in > missed
+            flower = "🌸" if day['studied'] else "🌱" if day['active'] else "🥀"
             
             ctk.CTkLabel(
                 day_col,
@@ -84,8 +87,7 @@ class StreakGarden(ctk.CTkFrame):
             ).pack()
             
             # Day label
-            date_obj = datetime.now().date() - timedelta(days=6-i)
-            day_name = date_obj.strftime("%a")
+            day_name = day['streak_date'].strftime("%a")
             
             ctk.CTkLabel(
                 day_col,
@@ -484,7 +486,7 @@ class NotificationsPanel(ctk.CTkFrame):
         ).pack(side="left")
         
         # Get notifications
-        notifications = db.get_notifications(self.user_id)
+        notifications = db.get_notifications(self.user_id, limit=5)
         
         if not notifications:
             ctk.CTkLabel(
@@ -4,11 +4,23 @@ Beautiful progress tracking and statistics with Custom Graphs
 """
 
 import customtkinter as ctk
+import threading
 from database import db
+from groq_service import groq_ai
+import event_bus
+from event_bus import bus
 from datetime import datetime, timedelta
 from config import COLORS
+from charts import PieChart, LineChart, HeatmapChart
+import activity_calendar
 import math
 
+# Heatmap colours, "no study" first, then increasing intensity
+HEATMAP_COLORS = ['#263449', '#0E4F66', '#0F7A99', '#22A6CF', COLORS['primary']]
+
+# Study trend ranges: button text -> (days, axis label format)
+TREND_RANGES = {"7D": (7, "%a"), "30D": (30, "%d %b"), "1Y": (365, "%b")}
+
 class AnalyticsView:
     """Analytics with Premium Aurora Theme"""
     
@@ -16,8 +28,11 @@ class AnalyticsView:
         self.parent = parent
         self.dashboard = dashboard
         self.user_id = dashboard.user['user_id']
+        self.trend_range = "7D"
         
         self.create_ui()
+        bus.subscribe(event_bus.USER_DATA_EVENTS, lambda events: self.refresh_analytics(),
+                      widget=self.legend_frame, user_id=self.user_id)
     
     def create_ui(self):
         """Create analytics interface"""
@@ -83,22 +98,37 @@ class AnalyticsView:
         # Daily Activity (Line Chart)
         self.create_activity_chart(charts_row)
         
+        # Next-week forecast and progress analysis
+        self.create_forecast_section(main_frame)
+        
+        # Year heatmap
+        self.heatmap_year = datetime.now().year
+        self.create_heatmap_section(main_frame)
+        
         # Goals progress
         self.create_goals_section(main_frame)
     
-    def load_analytics_data(self):
-        """Load analytics data"""
-        self.total_time = db.get_total_study_time(self.user_id)
-        self.sessions = db.get_user_sessions(self.user_id) or []
+    def load_analytics_data(self, refresh=False):
+        """Load analytics data (refresh=True recomputes today's forecast after a change)"""
+        self.frame = db.get_session_frame(self.user_id)
+        self.total_time = self.frame.total()
         self.subjects = db.get_user_subjects(self.user_id) or []
-        self.subject_stats = db.get_subject_wise_time(self.user_id) or []
+        self.subject_stats = self.frame.subject_breakdown()
         self.goals = db.get_user_goals(self.user_id) or []
+        self.forecast = db.get_study_forecast(self.user_id, refresh=refresh)
         
         # Weekly stats
         today = datetime.now().date()
         week_ago = today - timedelta(days=7)
-        self.weekly_sessions = [s for s in self.sessions if s['session_date'] >= week_ago]
-        self.weekly_time = sum(s['duration_minutes'] for s in self.weekly_sessions)
+        self.weekly_time = self.frame.total(week_ago)
+    
+    def stats_values(self):
+        return [
+            f"{self.total_time // 60}h {self.total_time % 60}m",
+            str(len(self.frame)),
+            str(len(self.subjects)),
+            f"{self.weekly_time // 60}h {self.weekly_time % 60}m",
+        ]
     
     def create_overall_stats(self, parent):
         """Create overall statistics cards"""
@@ -106,13 +136,14 @@ class AnalyticsView:
         stats_container.pack(fill="x", pady=(0, 25))
         
         stats_data = [
-            ("⏱️", "Total Study Time", f"{self.total_time // 60}h {self.total_time % 60}m", COLORS['info'], COLORS['background']),
-            ("📚", "Total Sessions", str(len(self.sessions)), COLORS['success'], COLORS['background']),
-            ("📖", "Active Subjects", str(len(self.subjects)), COLORS['warning'], COLORS['background']),
-            ("📅", "This Week", f"{self.weekly_time // 60}h {self.weekly_time % 60}m", COLORS['secondary'], COLORS['background']),
+            ("⏱️", "Total Study Time", COLORS['info'], COLORS['background']),
+            ("📚", "Total Sessions", COLORS['success'], COLORS['background']),
+            ("📖", "Active Subjects", COLORS['warning'], COLORS['background']),
+            ("📅", "This Week", COLORS['secondary'], COLORS['background']),
         ]
         
-        for i, (icon, label, value, color, text_color) in enumerate(stats_data):
+        self.stat_labels = []
+        for i, ((icon, label, color, text_color), value) in enumerate(zip(stats_data, self.stats_values())):
             card = ctk.CTkFrame(
                 stats_container,
                 fg_color=color, # Using colored cards for emphasis
@@ -150,18 +181,20 @@ class AnalyticsView:
             ).pack()
             
             # Value
-            ctk.CTkLabel(
+            value_label = ctk.CTkLabel(
                 card,
                 text=value,
                 font=("Segoe UI Display", 30, "bold"),
                 text_color=text_color
-            ).pack(pady=(8, 30))
+            )
+            value_label.pack(pady=(8, 30))
+            self.stat_labels.append(value_label)
     
     def create_subject_chart(self, parent):
         """Create Subject Distribution Pie Chart"""
         card = ctk.CTkFrame(
             parent,
-            fg_color=COLORS['card'], 
+            fg_color=COLORS['card'],
             corner_radius=20,
             border_width=1,
             border_color=COLORS['border']
@@ -175,45 +208,35 @@ class AnalyticsView:
             text_color=COLORS['text']
         ).pack(pady=(20, 10), padx=20, anchor="w")
         
-        if not self.subject_stats:
-            ctk.CTkLabel(card, text="No data", text_color=COLORS['text_light']).pack(pady=50)
-            return
-            
         # Canvas for Pie Chart - Use CARD color for background
-        canvas_bg = COLORS['card']
-        canvas = ctk.CTkCanvas(card, width=300, height=300, bg=canvas_bg, highlightthickness=0)
+        canvas = ctk.CTkCanvas(card, width=300, height=300, bg=COLORS['card'], highlightthickness=0)
         canvas.pack(pady=10)
+        self.subject_chart = PieChart(canvas, 300, 300, COLORS['card'], radius=100)
         
-        total_minutes = sum(s['total_minutes'] for s in self.subject_stats)
-        if total_minutes == 0:
+        # Legend below
+        self.legend_frame = ctk.CTkFrame(card, fg_color="transparent")
+        self.legend_frame.pack(pady=10, padx=20, fill="x")
+        
+        self.update_subject_chart()
+    
+    def update_subject_chart(self):
+        """Move the existing arcs to the current subject split"""
+        stats = [s for s in self.subject_stats if s['total_minutes']]
+        values = tuple(int(s['total_minutes']) for s in stats)
+        colors = tuple(s['color_code'] for s in stats)
+        if not self.subject_chart.update(values, colors):
             return
-            
-        start_angle = 90
-        center_x, center_y = 150, 150
-        radius = 100
         
-        for subject in self.subject_stats:
-            minutes = subject['total_minutes']
-            if minutes == 0: continue
-            
-            extent = (minutes / total_minutes) * 360
-            color = subject['color_code']
-            
-            canvas.create_arc(
-                center_x - radius, center_y - radius,
-                center_x + radius, center_y + radius,
-                start=start_angle, extent=-extent,
-                fill=color, outline=canvas_bg, width=2 # Outline matches background to look like gap
-            )
-            
-            start_angle -= extent
-            
-        # Legend below
-        legend_frame = ctk.CTkFrame(card, fg_color="transparent")
-        legend_frame.pack(pady=10, padx=20, fill="x")
+        for widget in self.legend_frame.winfo_children():
+            widget.destroy()
+        
+        total_minutes = sum(values)
+        if not total_minutes:
+            ctk.CTkLabel(self.legend_frame, text="No data", text_color=COLORS['text_light']).pack(pady=10)
+            return
         
-        for subject in self.subject_stats[:4]: # Show top 4
-            row = ctk.CTkFrame(legend_frame, fg_color="transparent")
+        for subject in stats[:4]: # Show top 4
+            row = ctk.CTkFrame(self.legend_frame, fg_color="transparent")
             row.pack(fill="x", pady=2)
             
             box = ctk.CTkFrame(row, width=12, height=12, fg_color=subject['color_code'], corner_radius=4)
@@ -221,7 +244,7 @@ class AnalyticsView:
             
             ctk.CTkLabel(row, text=subject['subject_name'], font=("Segoe UI", 11), text_color=COLORS['text']).pack(side="left")
             ctk.CTkLabel(row, text=f"{int(subject['total_minutes']/total_minutes*100)}%", font=("Segoe UI Bold", 11), text_color=COLORS['text_light']).pack(side="right")
-
+    
     def create_activity_chart(self, parent):
         """Create Daily Activity Line Chart"""
         card = ctk.CTkFrame(
@@ -233,56 +256,216 @@ class AnalyticsView:
         )
         card.grid(row=0, column=1, padx=(10, 0), sticky="nsew")
         
+        header = ctk.CTkFrame(card, fg_color="transparent")
+        header.pack(fill="x", padx=20, pady=(20, 10))
+        
+        self.trend_title = ctk.CTkLabel(
+            header,
+            text="",
+            font=("Segoe UI Display", 18, "bold"),
+            text_color=COLORS['text']
+        )
+        self.trend_title.pack(side="left")
+        
+        self.trend_buttons = {}
+        for name in reversed(TREND_RANGES):
+            button = ctk.CTkButton(
+                header, text=name, width=44, height=28, corner_radius=8,
+                fg_color=COLORS['background'], hover_color=COLORS['hover'],
+                text_color=COLORS['text'],
+                command=lambda n=name: self.change_trend_range(n)
+            )
+            button.pack(side="right", padx=(5, 0))
+            self.trend_buttons[name] = button
+        
+        # Canvas for Line Chart
+        canvas = ctk.CTkCanvas(card, width=400, height=300, bg=COLORS['card'], highlightthickness=0)
+        canvas.pack(pady=10, padx=20)
+        self.activity_chart = LineChart(
+            canvas, 400, 250, COLORS['card'], COLORS['primary'], COLORS['border'], COLORS['text_light']
+        )
+        
+        self.update_activity_chart()
+    
+    def change_trend_range(self, name):
+        if name != self.trend_range:
+            self.trend_range = name
+            self.update_activity_chart()
+    
+    def daily_series(self, days):
+        """Minutes per day for the last `days` days, oldest first, gaps as 0"""
+        today = datetime.now().date()
+        dates = [today - timedelta(days=i) for i in range(days - 1, -1, -1)]
+        return dates, self.frame.series(dates[0], today)
+    
+    def update_activity_chart(self):
+        days, fmt = TREND_RANGES[self.trend_range]
+        title = "Last Year" if days == 365 else f"Last {days} Days"
+        self.trend_title.configure(text=f"📅 Study Trends ({title})")
+        for name, button in self.trend_buttons.items():
+            selected = name == self.trend_range
+            button.configure(fg_color=COLORS['primary'] if selected else COLORS['background'],
+                             text_color=COLORS['background'] if selected else COLORS['text'])
+        
+        dates, minutes = self.daily_series(days)
+        self.activity_chart.update(tuple(d.strftime(fmt) for d in dates), tuple(minutes))
+    
+    def create_forecast_section(self, parent):
+        """Next week's forecast, at-risk goals and an on-demand progress analysis"""
+        card = ctk.CTkFrame(
+            parent,
+            fg_color=COLORS['card'],
+            corner_radius=20,
+            border_width=1,
+            border_color=COLORS['border']
+        )
+        card.pack(fill="x", pady=(0, 25))
+        
+        header = ctk.CTkFrame(card, fg_color="transparent")
+        header.pack(fill="x", padx=20, pady=(20, 5))
+        
         ctk.CTkLabel(
-            card,
-            text="📅 Study Trends (Last 7 Days)",
+            header,
+            text="🔮 Next Week Forecast",
             font=("Segoe UI Display", 18, "bold"),
             text_color=COLORS['text']
-        ).pack(pady=(20, 10), padx=20, anchor="w")
+        ).pack(side="left")
         
-        daily_stats = db.get_daily_study_stats(self.user_id, days=7) or []
+        self.analyze_button = ctk.CTkButton(
+            header, text="🤖 Analyze My Progress", height=32, corner_radius=8,
+            fg_color=COLORS['secondary'], hover_color=COLORS['primary'],
+            text_color=COLORS['background'], font=("Segoe UI Bold", 13),
+            command=self.analyze_progress
+        )
+        self.analyze_button.pack(side="right")
         
-        if not daily_stats:
-            ctk.CTkLabel(card, text="No data", text_color=COLORS['text_light']).pack(pady=50)
+        self.forecast_summary = ctk.CTkLabel(
+            card, text="", font=("Segoe UI", 13), text_color=COLORS['text_light'], justify="left"
+        )
+        self.forecast_summary.pack(padx=20, pady=(0, 15), anchor="w")
+        
+        self.analysis_box = ctk.CTkTextbox(
+            card, height=220, font=("Segoe UI", 13), wrap="word",
+            fg_color=COLORS['background'], text_color=COLORS['text']
+        )
+        self.update_forecast_section()
+    
+    def update_forecast_section(self):
+        report = self.forecast
+        lines = [f"{report['next_week_minutes'] / 60:.1f} hours expected next week  •  "
+                 f"Productivity {report['productivity_score']}/100"]
+        for risk in report['at_risk']:
+            lines.append(f"⚠️ {risk['subject_name']}: {risk['goal_title']} due in {risk['days_left']} days, "
+                         f"{risk['forecast_minutes']} min forecast vs {risk['usual_minutes']} usual")
+        self.forecast_summary.configure(text="\n".join(lines))
+    
+    def analyze_progress(self):
+        """Routine weeks are summarised locally; otherwise the AI coach gets the forecast as context"""
+        self.analyze_button.configure(state="disabled", text="Analyzing...")
+        study_data = {
+            'total_hours': round(self.total_time / 60, 1),
+            'sessions': len(self.frame),
+            'subjects': [s['subject_name'] for s in self.subjects],
+            'streak': db.get_current_streak(self.user_id),
+            'avg_session': round(self.total_time / len(self.frame)) if len(self.frame) else 0,
+        }
+        forecast = self.forecast
+        
+        def run():
+            try:
+                analysis = groq_ai.analyze_study_progress(study_data, forecast=forecast)
+            except Exception as e:
+                analysis = f"❌ Could not analyze progress: {e}"
+            self.parent.after(0, lambda: self.show_analysis(analysis))
+        
+        threading.Thread(target=run, daemon=True).start()
+    
+    def show_analysis(self, analysis):
+        if not self.analysis_box.winfo_exists():
             return
-
-        # Canvas for Line Chart
-        canvas_bg = COLORS['card']
-        canvas = ctk.CTkCanvas(card, width=400, height=300, bg=canvas_bg, highlightthickness=0)
-        canvas.pack(pady=10, padx=20)
+        self.analyze_button.configure(state="normal", text="🤖 Analyze My Progress")
+        self.analysis_box.configure(state="normal")
+        self.analysis_box.delete("1.0", "end")
+        self.analysis_box.insert("1.0", analysis)
+        self.analysis_box.configure(state="disabled")
+        self.analysis_box.pack(fill="x", padx=20, pady=(0, 20))
+    
+    def create_heatmap_section(self, parent):
+        """GitHub-style yearly heatmap from the packed activity calendar"""
+        card = ctk.CTkFrame(
+            parent,
+            fg_color=COLORS['card'],
+            corner_radius=20,
+            border_width=1,
+            border_color=COLORS['border']
+        )
+        card.pack(fill="x", pady=(0, 25))
         
-        # Dimensions
-        w, h = 400, 250
-        padding = 30
-        graph_w = w - 2 * padding
-        graph_h = h - 2 * padding
+        header = ctk.CTkFrame(card, fg_color="transparent")
+        header.pack(fill="x", padx=20, pady=(20, 5))
         
-        # Axes
-        canvas.create_line(padding, h - padding, w - padding, h - padding, fill=COLORS['border'], width=2) # X
-        canvas.create_line(padding, h - padding, padding, padding, fill=COLORS['border'], width=2) # Y
+        self.heatmap_title = ctk.CTkLabel(
+            header,
+            text="",
+            font=("Segoe UI Display", 18, "bold"),
+            text_color=COLORS['text']
+        )
+        self.heatmap_title.pack(side="left")
+        
+        for text, step in (("▶", 1), ("◀", -1)):
+            ctk.CTkButton(
+                header, text=text, width=36, height=30, corner_radius=8,
+                fg_color=COLORS['background'], hover_color=COLORS['hover'],
+                text_color=COLORS['text'],
+                command=lambda s=step: self.change_heatmap_year(s)
+            ).pack(side="right", padx=(5, 0))
+        
+        self.heatmap_summary = ctk.CTkLabel(
+            card, text="", font=("Segoe UI", 12), text_color=COLORS['text_light']
+        )
+        self.heatmap_summary.pack(padx=20, anchor="w")
         
-        # Data points
-        max_mins = max((s['total_minutes'] for s in daily_stats), default=60)
-        points = []
+        canvas = ctk.CTkCanvas(
+            card, width=760, height=130, bg=COLORS['card'], highlightthickness=0
+        )
+        canvas.pack(padx=20, pady=(5, 20), anchor="w")
+        self.heatmap_chart = HeatmapChart(canvas, 760, 130, COLORS['card'], COLORS['text_light'])
         
-        num_days = len(daily_stats)
-        step_x = graph_w / (num_days - 1) if num_days > 1 else graph_w
+        created = self.dashboard.user.get('created_at')
+        self.first_heatmap_year = min(
+            [created.year if created else self.heatmap_year] + db.get_activity_years(self.user_id)
+        )
+        self.draw_heatmap()
+    
+    def change_heatmap_year(self, step):
+        year = self.heatmap_year + step
+        if not self.first_heatmap_year <= year <= datetime.now().year:
+            return
+        self.heatmap_year = year
+        self.draw_heatmap()
+    
+    def draw_heatmap(self):
+        """Recolour one year: 53 week columns x 7 weekday rows"""
+        calendar = db.get_activity_calendar(self.user_id, self.heatmap_year)
+        
+        self.heatmap_title.configure(text=f"🗓️ Study Heatmap {self.heatmap_year}")
+        hours = calendar['total_minutes'] / 60
+        self.heatmap_summary.configure(
+            text=f"{hours:.1f} hours across {calendar['active_days']} days"
+        )
         
-        for i, stat in enumerate(daily_stats):
-            x = padding + i * step_x
-            y = (h - padding) - (stat['total_minutes'] / max_mins) * graph_h
-            points.append((x, y))
-            
-            # Draw point
-            canvas.create_oval(x-4, y-4, x+4, y+4, fill=COLORS['primary'], outline=canvas_bg, width=2)
-            
-            # Draw label (Day)
-            canvas.create_text(x, h - padding + 15, text=stat['session_date'].strftime("%a"), font=("Segoe UI", 9), fill=COLORS['text_light'])
-            
-        # Draw line
-        if len(points) > 1:
-            canvas.create_line(points, fill=COLORS['primary'], width=3, smooth=True)
-
+        cells = activity_calendar.year_cells(self.heatmap_year, calendar['minutes'])
+        months = {}
+        for column, row, day, minutes, level in cells:
+            if day.day <= 7 and day.month not in months:
+                months[day.month] = (column, day.strftime("%b"))
+        self.heatmap_chart.update(
+            tuple((column, row) for column, row, _, _, _ in cells),
+            tuple(HEATMAP_COLORS[level] for _, _, _, _, level in cells),
+            tuple(months.values()),
+            ((0, "Mon"), (2, "Wed"), (4, "Fri")),
+        )
+    
     def create_goals_section(self, parent):
         """Create goals overview"""
         card = ctk.CTkFrame(
@@ -302,26 +485,43 @@ class AnalyticsView:
             text_color=COLORS['text']
         ).pack(pady=(30, 25), padx=30, anchor="w")
         
-        if not self.goals:
-            ctk.CTkLabel(card, text="No goals set yet", font=("Segoe UI", 14), text_color=COLORS['text_light']).pack(pady=30)
-            return
-        
-        # Goals stats
+        self.goals_body = ctk.CTkFrame(card, fg_color="transparent")
+        self.goals_body.pack(fill="x")
+        self.goal_labels = []
+        self.update_goals_section()
+    
+    def goal_counts(self):
         completed = len([g for g in self.goals if g['status'] == 'completed'])
         in_progress = len([g for g in self.goals if g['status'] == 'in_progress'])
         pending = len([g for g in self.goals if g['status'] == 'pending'])
+        return [completed, in_progress, pending, len(self.goals)]
+    
+    def update_goals_section(self):
+        """Update the goal counters in place; rebuild only when goals appear or vanish"""
+        if self.goals and self.goal_labels:
+            for label, value in zip(self.goal_labels, self.goal_counts()):
+                label.configure(text=str(value))
+            return
+        
+        for widget in self.goals_body.winfo_children():
+            widget.destroy()
+        self.goal_labels = []
         
-        stats_grid = ctk.CTkFrame(card, fg_color="transparent")
+        if not self.goals:
+            ctk.CTkLabel(self.goals_body, text="No goals set yet", font=("Segoe UI", 14), text_color=COLORS['text_light']).pack(pady=30)
+            return
+        
+        stats_grid = ctk.CTkFrame(self.goals_body, fg_color="transparent")
         stats_grid.pack(fill="x", padx=30, pady=(0, 30))
         
         goal_stats = [
-            ("✅", "Completed", completed, COLORS['success']),
-            ("🔄", "In Progress", in_progress, COLORS['warning']),
-            ("⏳", "Pending", pending, COLORS['text_light']),
-            ("📊", "Total Goals", len(self.goals), COLORS['primary'])
+            ("✅", "Completed", COLORS['success']),
+            ("🔄", "In Progress", COLORS['warning']),
+            ("⏳", "Pending", COLORS['text_light']),
+            ("📊", "Total Goals", COLORS['primary'])
         ]
         
-        for i, (icon, label, value, color) in enumerate(goal_stats):
+        for i, ((icon, label, color), value) in enumerate(zip(goal_stats, self.goal_counts())):
             stat_card = ctk.CTkFrame(
                 stats_grid,
                 fg_color=COLORS['background'],
@@ -334,10 +534,17 @@ class AnalyticsView:
             
             ctk.CTkLabel(stat_card, text=icon, font=("Segoe UI", 30)).pack(pady=(15, 5))
             ctk.CTkLabel(stat_card, text=label, font=("Segoe UI", 12), text_color=COLORS['text_light']).pack()
-            ctk.CTkLabel(stat_card, text=str(value), font=("Segoe UI Display", 24, "bold"), text_color=COLORS['text']).pack(pady=(5, 15))
-
+            value_label = ctk.CTkLabel(stat_card, text=str(value), font=("Segoe UI Display", 24, "bold"), text_color=COLORS['text'])
+            value_label.pack(pady=(5, 15))
+            self.goal_labels.append(value_label)
+    
     def refresh_analytics(self):
-        """Refresh analytics"""
-        for widget in self.parent.winfo_children():
-            widget.destroy()
-        self.__init__(self.parent, self.dashboard)
\ No newline at end of file
+        """Reload data and update the existing widgets and canvas items in place"""
+        self.load_analytics_data(refresh=True)
+        for label, value in zip(self.stat_labels, self.stats_values()):
+            label.configure(text=value)
+        self.update_subject_chart()
+        self.update_activity_chart()
+        self.update_forecast_section()
+        self.draw_heatmap()
+        self.update_goals_section()
@@ -0,0 +1,183 @@
+"""
+Batch Jobs - Headless nightly maintenance for all users
+
+Usage:
+    python batch_jobs.py                              # run every job for today
+    python batch_jobs.py --jobs weekly_reports pet_decay
+    python batch_jobs.py --date 2025-06-15 --workers 8
+    python batch_jobs.py --status                     # show today's checkpoints
+    python batch_jobs.py --force                      # rerun jobs already done today
+
+Users are processed in keyset-paginated chunks. After each chunk the job's
+row in batch_runs records the last user id, so a crashed or interrupted run
+resumes where it stopped, and a finished job is skipped on rerun. Every job
+is also idempotent on its own (upserts, once-per-day markers), so a forced
+rerun does not duplicate anything.
+
+Schedule it nightly (cron / Task Scheduler) and set BATCH_JOBS['enabled'] in
+config.py so clients stop running the same checks hourly. Streak warnings
+are only sent from 20:00, so the overnight streak_risk run is a no-op; open
+clients still send them in the evening, and an extra evening run
+(`--jobs streak_risk`) covers users who are offline.
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import retention
+from config import BATCH_JOBS
+
+DEFAULT_CHUNK_SIZE = BATCH_JOBS.get('chunk_size', 500)
+DEFAULT_WORKERS = BATCH_JOBS.get('workers', 4)
+
+
+class Job:
+    """
+    One maintenance task.
+
+    per_user(db, user_id, run_date) runs for each user (in parallel within a chunk);
+    per_chunk(db, user_ids, run_date) handles a whole chunk in set-based SQL;
+    per_run(db, run_date) covers every user in one go and returns a row count.
+    """
+
+    def __init__(self, name, description, per_user=None, per_chunk=None, per_run=None):
+        self.name = name
+        self.description = description
+        self.per_user = per_user
+        self.per_chunk = per_chunk
+        self.per_run = per_run
+
+
+JOBS = {job.name: job for job in [
+    Job('weekly_reports', "Weekly report for the current week",
+        per_user=lambda db, user_id, day: db.generate_weekly_report(user_id, today=day)),
+    Job('forecasts', "Study forecasts and at-risk subjects",
+        per_chunk=lambda db, user_ids, day: db.refresh_forecasts(user_ids, today=day)),
+    Job('review_reminders', "Queue today's spaced-repetition reviews",
+        per_user=lambda db, user_id, day: db.enqueue_review_reminders(user_id)),
+    Job('streak_risk', "Warn users whose streak ends today (from 20:00)",
+        per_run=lambda db, day: db.generate_streak_warnings()),
+    Job('social', "Leaderboard nudges",
+        per_run=lambda db, day: db.generate_social_nudges()),
+    Job('pet_decay', "Study pet mood decay",
+        per_chunk=lambda db, user_ids, day: db.decay_pets(user_ids, day)),
+    Job('unread_counts', "Reconcile notification badge counters",
+        per_chunk=lambda db, user_ids, day: db.reconcile_unread_counts(user_ids)),
+    Job('retention', "Archive or delete expired notifications, reminders and chats",
+        per_run=lambda db, day: sum(retention.run_retention(db).values())),
+]}
+
+
+def run_job(db, job, run_date, chunk_size=DEFAULT_CHUNK_SIZE, workers=DEFAULT_WORKERS, force=False):
+    """Run one job to completion from its checkpoint. Returns the stats dict."""
+    run = db.get_batch_run(job.name, run_date)
+    # Set-based jobs are deduplicated by unique keys, so they may run several times a day
+    if run and run['status'] == 'done' and not force and not job.per_run:
+        print(f"⏭️  {job.name}: already done for {run_date}")
+        return {'job': job.name, 'skipped': True, 'processed': run['processed'],
+                'failed': run['failed'], 'seconds': run['seconds']}
+
+    run = db.start_batch_run(job.name, run_date, restart=force or bool(job.per_run))
+    last_user_id = run['last_user_id'] if run else 0
+    processed = run['processed'] if run else 0
+    failed = run['failed'] if run else 0
+    previous_seconds = run['seconds'] if run else 0.0
+    if last_user_id:
+        print(f"↩️  {job.name}: resuming after user {last_user_id} ({processed} done)")
+
+    started = time.perf_counter()
+    pool = ThreadPoolExecutor(max_workers=workers) if job.per_user else None
+    try:
+        if job.per_run:
+            processed = job.per_run(db, run_date) or 0
+        else:
+            while True:
+                user_ids = db.get_user_id_batch(last_user_id, chunk_size)
+                if not user_ids:
+                    break
+                if job.per_chunk:
+                    job.per_chunk(db, user_ids, run_date)
+                else:
+                    results = pool.map(lambda uid: _run_for_user(job, db, uid, run_date), user_ids)
+                    failed += sum(1 for ok in results if not ok)
+                processed += len(user_ids)
+                last_user_id = user_ids[-1]
+                elapsed = previous_seconds + time.perf_counter() - started
+                db.checkpoint_batch_run(job.name, run_date, last_user_id, processed, failed, elapsed)
+                print(f"   {job.name}: {processed} users ({processed / elapsed if elapsed else 0:.0f}/s)")
+    except Exception as e:
+        elapsed = previous_seconds + time.perf_counter() - started
+        db.checkpoint_batch_run(job.name, run_date, last_user_id, processed, failed, elapsed, status='failed')
+        print(f"❌ {job.name} stopped after user {last_user_id}: {e}")
+        return {'job': job.name, 'error': str(e), 'processed': processed, 'failed': failed, 'seconds': elapsed}
+    finally:
+        if pool:
+            pool.shutdown()
+
+    elapsed = previous_seconds + time.perf_counter() - started
+    db.checkpoint_batch_run(job.name, run_date, last_user_id, processed, failed, elapsed, status='done')
+    return {'job': job.name, 'processed': processed, 'failed': failed, 'seconds': elapsed}
+
+
+def _run_for_user(job, db, user_id, run_date):
+    try:
+        job.per_user(db, user_id, run_date)
+        return True
+    except Exception as e:
+        print(f"⚠️ {job.name} failed for user {user_id}: {e}")
+        return False
+
+
+def print_report(results):
+    print(f"\n{'job':<18} {'users':>8} {'failed':>7} {'seconds':>9} {'users/s':>9}")
+    for r in results:
+        rate = r['processed'] / r['seconds'] if r['seconds'] else 0
+        note = "  (skipped)" if r.get('skipped') else "  ❌" if r.get('error') else ""
+        print(f"{r['job']:<18} {r['processed']:>8} {r['failed']:>7} {r['seconds']:>9.2f} {rate:>9.0f}{note}")
+
+
+def print_status(db, run_date):
+    runs = db.get_batch_runs(run_date)
+    if not runs:
+        print(f"No batch runs recorded for {run_date}")
+    for run in runs:
+        print(f"{run['job_name']:<18} {run['status']:<8} last user {run['last_user_id']:<8} "
+              f"{run['processed']} users, {run['failed']} failed, {run['seconds']:.1f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run nightly maintenance for all users")
+    parser.add_argument('--jobs', nargs='*', choices=list(JOBS), help="run a subset (default: all, in order)")
+    parser.add_argument('--date', type=date.fromisoformat, default=date.today(),
+                        help="logical run date (YYYY-MM-DD), also the checkpoint key")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--force', action='store_true', help="rerun jobs already done for the date")
+    parser.add_argument('--status', action='store_true', help="print checkpoints and exit")
+    args = parser.parse_args(argv)
+
+    from setup_database import setup_new_database
+    from database import db
+    if not setup_new_database():
+        print("❌ Database setup failed")
+        return 1
+
+    if args.status:
+        print_status(db, args.date)
+        return 0
+
+    print(f"🌙 Nightly batch for {args.date} (chunks of {args.chunk_size}, {args.workers} workers)")
+    results = []
+    for name in args.jobs or JOBS:
+        job = JOBS[name]
+        print(f"\n▶️  {name}: {job.description}")
+        results.append(run_job(db, job, args.date, args.chunk_size, args.workers, args.force))
+    print_report(results)
+    return 1 if any(r.get('error') for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
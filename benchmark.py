@@ -0,0 +1,223 @@
+"""
+Benchmark Suite - Times the DatabaseManager hot paths against seeded data
+
+Usage:
+    python benchmark.py --scale 10k --seed-data          # create + seed bench DB, then run
+    python benchmark.py --scale 10k --save-baseline      # run and store results as the baseline
+    python benchmark.py --scale 10k --compare            # run and diff against the baseline
+
+Always runs against a separate database (default: <configured name>_bench).
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+import config
+from synthetic_data import SCALES, SUBJECTS, SyntheticDataGenerator
+
+DEFAULT_BASELINE = "bench_baseline.json"
+DEFAULT_ITERATIONS = 50
+WARMUP_ITERATIONS = 3
+REGRESSION_THRESHOLD = 0.20  # p95 more than 20% slower than baseline
+
+
+def dashboard_snapshot(db, user_id):
+    """The queries the dashboard and home page run when they open"""
+    return {
+        'subjects': db.get_user_subjects(user_id),
+        'sessions': db.get_user_sessions(user_id, limit=10),
+        'goals': db.get_user_goals(user_id),
+        'total_study_time': db.get_total_study_time(user_id),
+        'streak': db.get_current_streak(user_id),
+        'garden': db.get_streak_garden(user_id),
+        'notifications': db.get_notifications(user_id, limit=5),
+        'unread': db.count_unread_notifications(user_id),
+    }
+
+
+# Words that actually occur in seeded topics, notes and chats
+SEARCH_TERMS = sorted({word.lower() for topics in SUBJECTS.values() for topic in topics
+                       for word in topic.split() if len(word) > 3})
+
+
+# name -> callable(db, user_id, rng)
+BENCHMARKS = {
+    'get_leaderboard': lambda db, user_id, rng: db.get_leaderboard(),
+    'search_everything': lambda db, user_id, rng: db.search_everything(user_id, rng.choice(SEARCH_TERMS)),
+    'get_user_context': lambda db, user_id, rng: db.get_user_context(user_id),
+    'generate_weekly_report': lambda db, user_id, rng: db.generate_weekly_report(user_id),
+    'get_pending_reminders': lambda db, user_id, rng: db.get_pending_reminders(user_id),
+    'update_login_streak': lambda db, user_id, rng: db.update_login_streak(user_id),
+    'dashboard_load': lambda db, user_id, rng: dashboard_snapshot(db, user_id),
+}
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of an unsorted list"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples):
+    """Latency summary in milliseconds"""
+    return {
+        'n': len(samples),
+        'mean': sum(samples) / len(samples) if samples else 0.0,
+        'p50': percentile(samples, 50),
+        'p95': percentile(samples, 95),
+        'p99': percentile(samples, 99),
+        'max': max(samples) if samples else 0.0,
+    }
+
+
+def run_benchmarks(db, user_ids, iterations=DEFAULT_ITERATIONS, names=None, seed=42):
+    """Time each benchmark `iterations` times against random seeded users"""
+    rng = random.Random(seed)
+    results = {}
+    for name, fn in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        for _ in range(WARMUP_ITERATIONS):
+            fn(db, rng.choice(user_ids), rng)
+
+        samples = []
+        for _ in range(iterations):
+            user_id = rng.choice(user_ids)
+            start = time.perf_counter()
+            fn(db, user_id, rng)
+            samples.append((time.perf_counter() - start) * 1000)
+        results[name] = summarize(samples)
+        print(f"  {name:<24} p50 {results[name]['p50']:8.2f} ms   "
+              f"p95 {results[name]['p95']:8.2f} ms   p99 {results[name]['p99']:8.2f} ms")
+    return results
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Print a diff against the baseline; returns names that regressed"""
+    regressions = []
+    print(f"\n{'benchmark':<24} {'base p95':>10} {'now p95':>10} {'change':>8}")
+    for name, stats in results.items():
+        old = baseline.get('results', {}).get(name)
+        if not old:
+            print(f"{name:<24} {'-':>10} {stats['p95']:>10.2f} {'new':>8}")
+            continue
+        change = (stats['p95'] - old['p95']) / old['p95'] if old['p95'] else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  ⚠️ regression"
+        print(f"{name:<24} {old['p95']:>10.2f} {stats['p95']:>10.2f} {change:>+8.0%}{flag}")
+    return regressions
+
+
+def connect_bench_database(name, create=False):
+    """Point every module at the bench database before anything connects"""
+    config.DB_CONFIG['database'] = name
+    if create:
+        from setup_database import setup_new_database
+        setup_new_database()
+    from database import db
+    return db
+
+
+def seeded_users(db, prefix):
+    rows = db.execute_query("SELECT user_id FROM users WHERE username LIKE %s",
+                            (f"{prefix}\\_%",), fetch=True) or []
+    return [r['user_id'] for r in rows]
+
+
+def table_counts(db):
+    counts = {}
+    for table in ('users', 'subjects', 'study_sessions', 'quick_notes', 'chat_history', 'reminders'):
+        rows = db.execute_query(f"SELECT COUNT(*) AS n FROM {table}", fetch=True)
+        counts[table] = rows[0]['n'] if rows else 0
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark DatabaseManager hot paths")
+    parser.add_argument('--scale', choices=sorted(SCALES), default='1k')
+    parser.add_argument('--database', default=f"{config.DB_CONFIG['database']}_bench",
+                        help="database to seed and benchmark (never use the real one)")
+    parser.add_argument('--seed-data', action='store_true', help="create the schema and seed data first")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument('--only', nargs='*', choices=sorted(BENCHMARKS), help="run a subset")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--compare', action='store_true')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.database == config.DB_CONFIG['database']:
+        parser.error("refusing to benchmark the application database; pass a separate --database")
+    db = connect_bench_database(args.database, create=args.seed_data)
+
+    sizes = SCALES[args.scale]
+    prefix = f"bench{args.scale}"
+    user_ids = seeded_users(db, prefix)
+    if args.seed_data and user_ids:
+        print(f"ℹ️ Scale {args.scale} already seeded ({len(user_ids)} users), skipping")
+    elif args.seed_data:
+        print(f"🌱 Seeding scale {args.scale}: {sizes}")
+        start = time.perf_counter()
+        SyntheticDataGenerator(args.seed).seed_database(
+            db, prefix=prefix,
+            progress=lambda table, n: print(f"   {table}: {n:,} rows", end="\r"), **sizes
+        )
+        print(f"\n✅ Seeded in {time.perf_counter() - start:.1f}s")
+        user_ids = seeded_users(db, prefix)
+
+    if not user_ids:
+        print(f"❌ No seeded users for scale {args.scale} in {args.database}; run with --seed-data")
+        return 1
+
+    counts = table_counts(db)
+    print(f"\n⏱️ Benchmarking {args.database} ({len(user_ids)} users, "
+          f"{counts['study_sessions']:,} sessions), {args.iterations} iterations each\n")
+    results = run_benchmarks(db, user_ids, args.iterations, args.only, args.seed)
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'scale': args.scale,
+        'seed': args.seed,
+        'iterations': args.iterations,
+        'row_counts': counts,
+        'results': results,
+    }
+
+    status = 0
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"⚠️ No baseline at {args.baseline}; run with --save-baseline first")
+        else:
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+            if baseline.get('scale') != args.scale:
+                print(f"⚠️ Baseline was recorded at scale {baseline.get('scale')}, not {args.scale}")
+            regressions = compare(results, baseline, args.threshold)
+            if regressions:
+                print(f"\n❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+                status = 1
+            else:
+                print("\n✅ No regressions")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Baseline saved to {args.baseline}")
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
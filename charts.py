@@ -0,0 +1,224 @@
+"""
+Charts - Canvas chart renderers (pie, line, bar, heatmap)
+Layouts are computed in one pass over the data and cached per data
+version; redraws move existing canvas items with coords()/itemconfigure()
+instead of deleting and recreating them.
+"""
+
+import math
+from functools import lru_cache
+from itertools import accumulate
+
+
+# ==================== LAYOUTS ====================
+# Pure functions of (data, size) so they can be cached and tested without Tk
+
+@lru_cache(maxsize=64)
+def pie_layout(values, cx, cy, radius, start=90.0):
+    """(start_angle, extent) per slice, clockwise from `start` degrees"""
+    total = float(sum(values))
+    if total <= 0:
+        return ()
+    extents = [v / total * 360.0 for v in values]
+    starts = [start - s for s in accumulate([0.0] + extents[:-1])]
+    return tuple(zip(starts, [-e for e in extents]))
+
+
+@lru_cache(maxsize=64)
+def line_layout(values, width, height, padding=30, top=None):
+    """Screen (x, y) per value; the y axis starts at 0"""
+    n = len(values)
+    if not n:
+        return ()
+    top = top if top is not None else max(max(values), 1)
+    graph_w = width - 2 * padding
+    graph_h = height - 2 * padding
+    step = graph_w / (n - 1) if n > 1 else 0
+    scale = graph_h / top
+    base = height - padding
+    return tuple((padding + i * step, base - v * scale) for i, v in enumerate(values))
+
+
+@lru_cache(maxsize=64)
+def bar_layout(values, width, height, padding=30, gap=0.25):
+    """(x0, y0, x1, y1) per bar"""
+    n = len(values)
+    if not n:
+        return ()
+    top = max(max(values), 1)
+    slot = (width - 2 * padding) / n
+    bar_w = slot * (1 - gap)
+    scale = (height - 2 * padding) / top
+    base = height - padding
+    return tuple((padding + i * slot + (slot - bar_w) / 2, base - v * scale,
+                  padding + i * slot + (slot + bar_w) / 2, base)
+                 for i, v in enumerate(values))
+
+
+@lru_cache(maxsize=16)
+def heatmap_layout(cells, cell=11, gap=3, left=34, top=18):
+    """cells = ((column, row), ...) -> (x0, y0, x1, y1) per cell"""
+    pitch = cell + gap
+    return tuple((left + c * pitch, top + r * pitch, left + c * pitch + cell, top + r * pitch + cell)
+                 for c, r in cells)
+
+
+def label_stride(count, max_labels=8):
+    """Show every n-th axis label so long series stay readable"""
+    return max(1, math.ceil(count / max_labels))
+
+
+# ==================== RENDERERS ====================
+
+class CanvasChart:
+    """
+    Base renderer: keeps a keyed registry of canvas items.
+
+    Each draw pass calls _item(key, kind, coords, **options). Existing items
+    are moved and reconfigured only when something changed; items not
+    touched in a pass are deleted at the end.
+    """
+
+    def __init__(self, canvas, width, height, bg):
+        self.canvas = canvas
+        self.width = width
+        self.height = height
+        self.bg = bg
+        self._items = {}      # key -> (item_id, coords, options)
+        self._touched = set()
+        self._version = None
+
+    def update(self, *data):
+        """Redraw only if the data changed since the last call"""
+        version = hash(data)
+        if version == self._version:
+            return False
+        self._version = version
+        self._touched = set()
+        self.draw(*data)
+        for key in list(self._items):
+            if key not in self._touched:
+                self.canvas.delete(self._items.pop(key)[0])
+        return True
+
+    def draw(self, *data):
+        raise NotImplementedError
+
+    def clear(self):
+        for item_id, _, _ in self._items.values():
+            self.canvas.delete(item_id)
+        self._items = {}
+        self._version = None
+
+    def _item(self, key, kind, coords, **options):
+        self._touched.add(key)
+        coords = tuple(coords)
+        existing = self._items.get(key)
+        if existing is None:
+            item_id = getattr(self.canvas, f"create_{kind}")(*coords, **options)
+            self._items[key] = (item_id, coords, options)
+            return item_id
+
+        item_id, old_coords, old_options = existing
+        if coords != old_coords:
+            self.canvas.coords(item_id, *coords)
+        if options != old_options:
+            changed = {k: v for k, v in options.items() if old_options.get(k) != v}
+            self.canvas.itemconfigure(item_id, **changed)
+        self._items[key] = (item_id, coords, options)
+        return item_id
+
+
+class PieChart(CanvasChart):
+    """values and colors are tuples of equal length"""
+
+    def __init__(self, canvas, width, height, bg, radius=100):
+        super().__init__(canvas, width, height, bg)
+        self.radius = radius
+
+    def draw(self, values, colors):
+        cx, cy, r = self.width / 2, self.height / 2, self.radius
+        box = (cx - r, cy - r, cx + r, cy + r)
+        for i, (start, extent) in enumerate(pie_layout(tuple(values), cx, cy, r)):
+            if not extent:
+                continue
+            # A single 360 degree arc renders as nothing in Tk
+            extent = max(extent, -359.99)
+            self._item(('slice', i), 'arc', box, start=start, extent=extent,
+                       fill=colors[i], outline=self.bg, width=2)
+
+
+class LineChart(CanvasChart):
+    """labels and values are tuples of equal length"""
+
+    MAX_MARKERS = 31  # Beyond this, points are implied by the line
+
+    def __init__(self, canvas, width, height, bg, color, axis_color, text_color, padding=30):
+        super().__init__(canvas, width, height, bg)
+        self.color = color
+        self.axis_color = axis_color
+        self.text_color = text_color
+        self.padding = padding
+
+    def draw(self, labels, values):
+        w, h, p = self.width, self.height, self.padding
+        self._item('x_axis', 'line', (p, h - p, w - p, h - p), fill=self.axis_color, width=2)
+        self._item('y_axis', 'line', (p, h - p, p, p), fill=self.axis_color, width=2)
+
+        points = line_layout(tuple(values), w, h, p)
+        if len(points) > 1:
+            flat = [c for point in points for c in point]
+            self._item('line', 'line', flat, fill=self.color, width=3 if len(points) <= 60 else 2,
+                       smooth=len(points) <= 60)
+        if len(points) <= self.MAX_MARKERS:
+            for i, (x, y) in enumerate(points):
+                self._item(('point', i), 'oval', (x - 4, y - 4, x + 4, y + 4),
+                           fill=self.color, outline=self.bg, width=2)
+
+        stride = label_stride(len(points))
+        for i in range(0, len(points), stride):
+            self._item(('label', i), 'text', (points[i][0], h - p + 15), text=labels[i],
+                       font=("Segoe UI", 9), fill=self.text_color)
+
+
+class BarChart(CanvasChart):
+    """labels, values and colors are tuples of equal length"""
+
+    def __init__(self, canvas, width, height, bg, axis_color, text_color, padding=30):
+        super().__init__(canvas, width, height, bg)
+        self.axis_color = axis_color
+        self.text_color = text_color
+        self.padding = padding
+
+    def draw(self, labels, values, colors):
+        w, h, p = self.width, self.height, self.padding
+        self._item('x_axis', 'line', (p, h - p, w - p, h - p), fill=self.axis_color, width=2)
+        bars = bar_layout(tuple(values), w, h, p)
+        stride = label_stride(len(bars), 12)
+        for i, rect in enumerate(bars):
+            self._item(('bar', i), 'rectangle', rect, fill=colors[i], outline="")
+            if i % stride == 0:
+                self._item(('label', i), 'text', ((rect[0] + rect[2]) / 2, h - p + 15), text=labels[i],
+                           font=("Segoe UI", 9), fill=self.text_color)
+
+
+class HeatmapChart(CanvasChart):
+    """Grid of cells: positions ((column, row), ...) and a colour per cell"""
+
+    def __init__(self, canvas, width, height, bg, text_color, cell=11, gap=3, left=34, top=18):
+        super().__init__(canvas, width, height, bg)
+        self.text_color = text_color
+        self.cell, self.gap, self.left, self.top = cell, gap, left, top
+
+    def draw(self, positions, colors, column_labels=(), row_labels=()):
+        rects = heatmap_layout(tuple(positions), self.cell, self.gap, self.left, self.top)
+        for i, rect in enumerate(rects):
+            self._item(('cell', i), 'rectangle', rect, fill=colors[i], outline="")
+
+        pitch = self.cell + self.gap
+        for column, text in column_labels:
+            self._item(('col', column), 'text', (self.left + column * pitch, 8), text=text,
+                       anchor="w", font=("Segoe UI", 9), fill=self.text_color)
+        for row, text in row_labels:
+            self._item(('row', row), 'text', (self.left - 6, self.top + row * pitch + self.cell / 2),
+                       text=text, anchor="e", font=("Segoe UI", 8), fill=self.text_color)
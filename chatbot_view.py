@@ -16,6 +16,8 @@ from markdown_utils import MarkdownParser
 class ChatbotView:
     """AI Chatbot with Groq integration"""
     
+    HISTORY_PAGE_SIZE = 20
+    
     def __init__(self, parent, dashboard):
         self.parent = parent
         self.dashboard = dashboard
@@ -23,6 +25,13 @@ class ChatbotView:
         
         self.chat_history = []
         
+        # Keyset pagination state for "load older"
+        self.oldest_chat_id = None
+        self.oldest_message_frame = None
+        self.has_older_history = False
+        self.loading_older = False
+        self.older_scheduled = False
+        
         self.create_ui()
         self.load_chat_history()
     
@@ -146,6 +155,9 @@ class ChatbotView:
         )
         self.chat_display.grid(row=0, column=0, sticky="nsew", padx=25, pady=25)
         
+        # Load older messages when scrolled to the top
+        self.chat_display._parent_canvas.configure(yscrollcommand=self.on_chat_scroll)
+        
         # Input area
         input_container = ctk.CTkFrame(main_frame, fg_color="transparent")
         input_container.grid(row=2, column=0, sticky="ew")
@@ -247,22 +259,72 @@ How can I help you today?"""
         self.message_input.focus()
     
     def load_chat_history(self):
-        """Load chat history"""
-        history = db.get_chat_history(self.user_id, limit=20)
+        """Load the most recent page of chat history"""
+        history = db.get_chat_history(self.user_id, limit=self.HISTORY_PAGE_SIZE)
         
         for chat in history:
-            self.add_message("user", chat['message'], save=False)
+            frame = self.add_message("user", chat['message'], save=False)
+            if self.oldest_message_frame is None:
+                self.oldest_message_frame = frame
             if chat['response']:
                 self.add_message("assistant", chat['response'], save=False)
+        
+        if history:
+            self.oldest_chat_id = history[0]['chat_id']
+        self.has_older_history = len(history) == self.HISTORY_PAGE_SIZE
+    
+    def on_chat_scroll(self, first, last):
+        """
+        Scrollbar callback: keep the scrollbar in sync and lazy-load at the top.
+        It also fires while everything fits without scrolling, so short pages
+        keep pulling older ones until the view overflows or history runs out.
+        """
+        self.chat_display._scrollbar.set(first, last)
+        if float(first) <= 0.0 and self.has_older_history and not self.older_scheduled:
+            self.older_scheduled = True
+            self.chat_display.after_idle(self.load_older_history)
+    
+    def load_older_history(self):
+        """Prepend the previous page of messages above the oldest one shown"""
+        self.older_scheduled = False
+        if not self.chat_display.winfo_exists() or self.chat_display._parent_canvas.yview()[0] > 0.0:
+            return  # Gone, or scrolled away from the top since this was scheduled
+        if self.loading_older or not self.has_older_history or not self.oldest_chat_id:
+            return
+        self.loading_older = True
+        
+        canvas = self.chat_display._parent_canvas
+        old_height = (canvas.bbox("all") or (0, 0, 0, 0))[3]
+        
+        history = db.get_chat_history(self.user_id, limit=self.HISTORY_PAGE_SIZE,
+                                      before_id=self.oldest_chat_id)
+        anchor = self.oldest_message_frame
+        for chat in history:
+            frame = self.add_message("user", chat['message'], save=False, before=anchor, scroll=False)
+            if chat is history[0]:
+                self.oldest_message_frame = frame
+            if chat['response']:
+                self.add_message("assistant", chat['response'], save=False, before=anchor, scroll=False)
+        
+        if history:
+            self.oldest_chat_id = history[0]['chat_id']
+        self.has_older_history = len(history) == self.HISTORY_PAGE_SIZE
+        
+        # Keep the previously top message in view
+        canvas.update_idletasks()
+        new_height = (canvas.bbox("all") or (0, 0, 0, 0))[3]
+        if new_height > old_height:
+            canvas.yview_moveto((new_height - old_height) / new_height)
+        self.loading_older = False
     
-    def add_message(self, role, text, save=True):
-        """Add message to chat"""
+    def add_message(self, role, text, save=True, before=None, scroll=True):
+        """Add message to chat (before=<frame> inserts it above an existing message)"""
         
         message_frame = ctk.CTkFrame(
             self.chat_display,
             fg_color="transparent"
         )
-        message_frame.pack(fill="x", pady=8, padx=10)
+        message_frame.pack(fill="x", pady=8, padx=10, before=before)
         
         if role == "user":
             # User message (right)
@@ -335,11 +397,14 @@ How can I help you today?"""
             message_box.configure(height=min(num_lines * 25, 500))
         
         # Scroll to bottom
-        self.chat_display._parent_canvas.yview_moveto(1.0)
+        if scroll:
+            self.chat_display._parent_canvas.yview_moveto(1.0)
         
         # Save history
         if save and role == "user":
             self.chat_history.append({"role": "user", "content": text})
+        
+        return message_frame
     
     def handle_enter_key(self, event):
         """Handle Enter key"""
@@ -445,6 +510,9 @@ INSTRUCTIONS:
                 widget.destroy()
             
             self.chat_history = []
+            self.oldest_chat_id = None
+            self.oldest_message_frame = None
+            self.has_older_history = False
             
             self.show_welcome_message()
             
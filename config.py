@@ -13,6 +13,15 @@ DB_CONFIG = {
     'autocommit': False
 }
 
+# Read replicas (see db_router.py). Each entry overrides DB_CONFIG, e.g. {'host': 'replica1.local'}
+DB_REPLICAS = {
+    'hosts': [],
+    'sticky_seconds': 30,       # Reads stay on the primary this long after a write (>= max_lag_seconds)
+    'retry_after': 30,          # Seconds an unreachable replica is skipped
+    'max_lag_seconds': 30,      # Replicas further behind than this are skipped
+    'health_interval': 30,      # Seconds between replication lag checks
+}
+
 # ... rest of the file remains the same ...
 
 # Groq API Configuration (RECOMMENDED - Fast & Free)
@@ -34,6 +43,53 @@ EMAIL_CONFIG = {
 APP_NAME = "AI Powered Study Planner"
 APP_VERSION = "2.0.0"
 
+# Query instrumentation (see query_metrics.py)
+QUERY_METRICS = {
+    'enabled': True,
+    'slow_query_ms': 200,       # Log statements slower than this
+    'slow_query_log': None,     # File path, or None to print slow queries
+}
+
+# UI profiler (see ui_profiler.py) - also switched on by STUDY_PLANNER_PROFILE=1
+UI_PROFILER = {
+    'enabled': False,
+    'block_ms': 50,             # Callbacks / lag above this count as a freeze
+    'probe_ms': 100,            # Event-loop lag probe interval
+    'trace_file': 'ui_trace.json',
+}
+
+# Nightly maintenance (see batch_jobs.py)
+BATCH_JOBS = {
+    'enabled': False,           # True once batch_jobs.py is scheduled (cron / Task Scheduler);
+                                # clients then stop running the hourly per-user checks
+    'chunk_size': 500,          # Users per checkpoint
+    'workers': 4,               # Parallel users within a chunk
+}
+
+# Offline-first writes for the desktop app (see offline_queue.py)
+# Sessions, mood, pet, notes and pomodoros are saved locally at once and synced to MySQL in the background
+OFFLINE = {
+    'enabled': False,            # Opt-in: queued writes reach MySQL (and other devices) only once synced
+    'path': 'offline_queue.db',  # Local SQLite write-ahead log + read cache
+    'sync_interval': 5,          # Seconds between sync attempts while idle
+    'batch_size': 100,           # Writes replayed per sync pass
+    'max_attempts': 5,           # Failures (with MySQL up) before a write is set aside
+    'max_backoff': 60,           # Longest wait between retries while MySQL is down
+}
+
+# Retention for ever-growing tables (see retention.py, run by batch_jobs.py)
+# action: 'archive' moves rows to <table>_archive, 'delete' drops them, 'keep' disables the policy
+RETENTION = {
+    'notifications': {'days': 60, 'action': 'archive'},
+    'reminders': {'days': 30, 'action': 'delete'},         # Only reminders already sent
+    'chat_history': {'days': 365, 'action': 'archive'},
+    'batch_size': 1000,         # Rows per transaction
+    'pause_ms': 50,             # Sleep between batches so the app stays responsive
+    'archive_keep_days': 730,   # Archived rows older than this are purged (None = forever)
+    'partition_archives': False,  # Monthly RANGE partitions on the archive tables
+    'partitions_ahead': 3,      # Months of empty partitions kept ready
+}
+
 # UI Theme Colors (Light & Cozy)
 # Premium Aurora Theme (Dark Mode)
 COLORS = {
@@ -7,14 +7,11 @@ import customtkinter as ctk
 from tkinter import messagebox
 from datetime import datetime, timedelta
 from database import db
-from config import COLORS
-from enhanced_home_aesthetic import EnhancedHomeView
-from home_view_modren import ModernHomeView
-from notification_service import NotificationService
-# New Imports for Notification System
-from notification_view import NotificationView
-import pystray
-from PIL import Image
+import event_bus
+from event_bus import bus
+from config import COLORS, OFFLINE
+from live_search import LiveSearch, MIN_QUERY_LENGTH
+from ui_profiler import profiler
 import threading
 import os
 
@@ -57,16 +54,39 @@ class Dashboard(ctk.CTkToplevel):
         # Handle close
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
         
+        # Time page loads when the UI profiler is on
+        profiler.instrument_dashboard(self)
+        
         # Load data
         self.load_user_data()
         
+        # Background search (search-as-you-type)
+        self.live_search = LiveSearch(self, db, self.user['user_id'])
+        self.search_view = None
+        
         # Create UI
         self.create_ui()
         
+        # Hot writes are saved locally first and synced in the background
+        if OFFLINE.get('enabled'):
+            db.enable_offline_queue()
+        
+        # Database writes (from any view or thread) update the sidebar and cached data
+        bus.attach(self)
+        bus.subscribe(event_bus.NOTIFICATION_EVENTS, lambda events: self.update_notification_badge(),
+                      widget=self, user_id=self.user['user_id'])
+        bus.subscribe(event_bus.USER_DATA_EVENTS, lambda events: self.load_user_data(),
+                      widget=self, user_id=self.user['user_id'])
+        bus.subscribe(event_bus.SYNC_FAILED, lambda events: self.show_failed_writes(),
+                      widget=self, user_id=self.user['user_id'])
+        if db.get_failed_writes():
+            self.after(1500, self.show_failed_writes)  # Left over from an earlier run
+        
         # Show home
         self.show_home()
 
         # Start Notification Service
+        from notification_service import NotificationService
         self.notification_service = NotificationService(self)
         self.notification_service.start(self.user['user_id'])
     
@@ -183,6 +203,40 @@ class Dashboard(ctk.CTkToplevel):
             anchor="w"
         ).pack(anchor="w")
         
+        # Global search
+        self.search_frame = ctk.CTkFrame(
+            self.sidebar,
+            fg_color=MODERN_COLORS['background'],
+            corner_radius=10,
+            border_width=1,
+            border_color=MODERN_COLORS['border']
+        )
+        self.search_frame.pack(pady=(0, 10), padx=20, fill="x")
+        
+        ctk.CTkLabel(
+            self.search_frame,
+            text="🔍",
+            font=("Segoe UI", 13)
+        ).pack(side="left", padx=(10, 0))
+        
+        self.search_entry = ctk.CTkEntry(
+            self.search_frame,
+            placeholder_text="Search everything...",
+            font=("Segoe UI", 12),
+            border_width=0,
+            fg_color="transparent"
+        )
+        self.search_entry.pack(side="left", fill="x", expand=True, padx=5, pady=6)
+        self.search_entry.bind("<Return>", self.handle_search)
+        self.search_entry.bind("<KeyRelease>", self.handle_search_typing)
+        
+        # Suggestions dropdown (packed under the search box while typing)
+        self.suggestion_frame = ctk.CTkFrame(
+            self.sidebar,
+            fg_color=MODERN_COLORS['background'],
+            corner_radius=10
+        )
+        
         # Navigation
         nav_items = [
             ("🏠", "Dashboard", "home"),
@@ -244,12 +298,72 @@ class Dashboard(ctk.CTkToplevel):
         """Handle search input"""
         query = self.search_entry.get().strip()
         if query:
+            self.hide_suggestions()
             self.show_search(query)
             self.search_entry.delete(0, 'end')
 
+    def handle_search_typing(self, event=None):
+        """Search-as-you-type: suggestions now, results once typing pauses"""
+        if event is not None and event.keysym in ("Return", "KP_Enter"):
+            return
+        query = self.search_entry.get().strip()
+        
+        if len(query) < MIN_QUERY_LENGTH:
+            self.hide_suggestions()
+            self.live_search.cancel()
+            return
+        
+        self.show_suggestions(self.live_search.suggest(query))
+        self.live_search.schedule(query, self.run_live_search)
+
+    def run_live_search(self, query):
+        """Debounced search: refresh results in place if already on the search page"""
+        if query != self.search_entry.get().strip():
+            return  # Stale (entry changed or was cleared)
+        if self.current_page == "search" and self.search_view:
+            self.search_view.update_term(query)
+        else:
+            self.show_search(query)
+
+    def show_suggestions(self, suggestions):
+        """Show prefix suggestions under the search box"""
+        for widget in self.suggestion_frame.winfo_children():
+            widget.destroy()
+        if not suggestions:
+            self.hide_suggestions()
+            return
+        
+        for text in suggestions:
+            ctk.CTkButton(
+                self.suggestion_frame,
+                text=text,
+                font=("Segoe UI", 12),
+                height=28,
+                fg_color="transparent",
+                hover_color=MODERN_COLORS['hover'],
+                text_color=MODERN_COLORS['text_light'],
+                anchor="w",
+                command=lambda t=text: self.use_suggestion(t)
+            ).pack(fill="x", padx=5, pady=1)
+        
+        if not self.suggestion_frame.winfo_ismapped():
+            self.suggestion_frame.pack(after=self.search_frame, pady=(0, 10), padx=20, fill="x")
+
+    def hide_suggestions(self):
+        self.suggestion_frame.pack_forget()
+
+    def use_suggestion(self, text):
+        """Fill the search box with a suggestion and search immediately"""
+        self.search_entry.delete(0, 'end')
+        self.search_entry.insert(0, text)
+        self.hide_suggestions()
+        self.run_live_search(text)
+
     def navigate_to(self, page):
         """Navigate between pages"""
         self.current_page = page
+        self.live_search.cancel()
+        self.search_view = None
         
         # Update nav button colors - modern style
         for btn_page, btn in self.nav_buttons.items():
@@ -320,6 +434,7 @@ class Dashboard(ctk.CTkToplevel):
 
     def show_notifications(self):
         """Show notifications page"""
+        from notification_view import NotificationView
         NotificationView(self.main_container, self)
 
     def show_search(self, query):
@@ -328,11 +443,8 @@ class Dashboard(ctk.CTkToplevel):
         # Clear container first
         for widget in self.main_container.winfo_children():
             widget.destroy()
-        SearchView(self.main_container, self, query)
-    
-    def refresh_data(self):
-        """Refresh user data"""
-        self.load_user_data()
+        self.current_page = "search"
+        self.search_view = SearchView(self.main_container, self, query, self.live_search)
     
     def show_settings(self):
         """Show account settings page"""
@@ -354,6 +466,8 @@ class Dashboard(ctk.CTkToplevel):
             # Stop notification service
             if hasattr(self, 'notification_service'):
                 self.notification_service.stop()
+            self.live_search.shutdown()
+            bus.detach(self)
 
             self.destroy()
             self.parent.deiconify()
@@ -384,6 +498,10 @@ class Dashboard(ctk.CTkToplevel):
 
     def create_tray(self):
         """Create system tray icon"""
+        # Tray support is only needed once the user minimizes
+        import pystray
+        from PIL import Image
+        
         # Create a simple icon
         try:
             image = Image.open("dashboard.jpg")
@@ -419,11 +537,34 @@ class Dashboard(ctk.CTkToplevel):
         """Exit application completely"""
         if hasattr(self, 'notification_service'):
             self.notification_service.stop()
+        self.live_search.shutdown()
+        bus.detach(self)
+        pending = db.disable_offline_queue()
+        if pending:
+            print(f"💾 {pending} offline writes will sync on next start")
         self.destroy()
         self.parent.destroy()
         sys.exit(0)
 
 
+    def show_failed_writes(self):
+        """Tell the user about offline writes MySQL kept rejecting and offer to retry them"""
+        failed = db.get_failed_writes()
+        if not failed:
+            return
+        lines = [f"• {method.replace('_', ' ')} from {created_at[:16].replace('T', ' ')}: {last_error}"
+                 for _, method, _, _, last_error, created_at in failed[:10]]
+        if len(failed) > 10:
+            lines.append(f"...and {len(failed) - 10} more")
+        retry = messagebox.askyesno(
+            "Changes Not Saved",
+            f"{len(failed)} change(s) made while offline could not be saved:\n\n"
+            + "\n".join(lines) + "\n\nTry saving them again?",
+            icon='warning'
+        )
+        if retry:
+            db.retry_failed_writes()
+
     def update_notification_badge(self):
         """Update notification badge count"""
         try:
@@ -0,0 +1,246 @@
+"""
+Data Export - Streaming export of all of a user's data
+Rows are streamed table by table from the database straight into the
+chosen writer, so memory use does not grow with history size.
+"""
+
+import csv
+import io
+import json
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+
+CHUNK_SIZE = 1000
+
+# (table name, query) - every %s in a query is the user_id
+EXPORT_TABLES = [
+    ('profile', """
+        SELECT user_id, username, email, full_name, student_level,
+               last_login, current_streak, created_at
+        FROM users WHERE user_id = %s
+    """),
+    ('subjects', "SELECT * FROM subjects WHERE user_id = %s ORDER BY subject_id"),
+    ('study_sessions', """
+        SELECT s.*, sub.subject_name
+        FROM study_sessions s
+        JOIN subjects sub ON s.subject_id = sub.subject_id
+        WHERE s.user_id = %s ORDER BY s.session_id
+    """),
+    ('study_goals', """
+        SELECT g.*, s.subject_name
+        FROM study_goals g
+        LEFT JOIN subjects s ON g.subject_id = s.subject_id
+        WHERE g.user_id = %s ORDER BY g.goal_id
+    """),
+    ('quick_notes', """
+        SELECT n.*, s.subject_name
+        FROM quick_notes n
+        LEFT JOIN subjects s ON n.subject_id = s.subject_id
+        WHERE n.user_id = %s ORDER BY n.note_id
+    """),
+    ('mood_tracker', "SELECT * FROM mood_tracker WHERE user_id = %s ORDER BY mood_date"),
+    ('study_streaks', "SELECT * FROM study_streaks WHERE user_id = %s ORDER BY streak_date"),
+    ('pomodoro_sessions', "SELECT * FROM pomodoro_sessions WHERE user_id = %s ORDER BY pomodoro_id"),
+    ('study_pet', "SELECT * FROM study_pet WHERE user_id = %s"),
+    ('topic_reviews', """
+        SELECT r.*, s.subject_name
+        FROM topic_reviews r
+        LEFT JOIN subjects s ON r.subject_id = s.subject_id
+        WHERE r.user_id = %s ORDER BY r.card_id
+    """),
+    ('saved_study_plans', "SELECT * FROM saved_study_plans WHERE user_id = %s ORDER BY plan_id"),
+    ('weekly_reports', "SELECT * FROM weekly_reports WHERE user_id = %s ORDER BY report_id"),
+    ('reminders', "SELECT * FROM reminders WHERE user_id = %s ORDER BY reminder_id"),
+    # Rows moved out by the retention job are exported with the live ones
+    ('notifications', """
+        SELECT notification_id, user_id, notification_type, message, priority,
+               is_read, dedup_date, created_at
+        FROM notifications WHERE user_id = %s
+        UNION ALL
+        SELECT notification_id, user_id, notification_type, message, priority,
+               is_read, dedup_date, created_at
+        FROM notifications_archive WHERE user_id = %s
+        ORDER BY notification_id
+    """),
+    ('chat_history', """
+        SELECT chat_id, user_id, message, response, timestamp
+        FROM chat_history WHERE user_id = %s
+        UNION ALL
+        SELECT chat_id, user_id, message, response, timestamp
+        FROM chat_history_archive WHERE user_id = %s
+        ORDER BY chat_id
+    """),
+]
+
+# format -> (label, file extension)
+EXPORT_FORMATS = {
+    'csv': ("Single CSV file", ".csv"),
+    'zip': ("Zip of CSV files (one per table)", ".zip"),
+    'jsonl': ("JSON Lines", ".jsonl"),
+    'parquet': ("Parquet (zip, one file per table)", ".zip"),
+}
+
+
+def available_formats():
+    """Formats usable in this environment (Parquet needs pyarrow)"""
+    formats = ['csv', 'zip', 'jsonl']
+    try:
+        import pyarrow  # noqa: F401
+        formats.append('parquet')
+    except ImportError:
+        pass
+    return formats
+
+
+def iter_user_tables(db, user_id, chunk_size=CHUNK_SIZE, tables=None):
+    """Yield (table_name, chunks) where chunks is a generator of row lists"""
+    for name, query in EXPORT_TABLES:
+        if tables and name not in tables:
+            continue
+        yield name, db.stream_query(query, (user_id,) * query.count('%s'), chunk_size)
+
+
+def export_user_data(db, user_id, path, fmt='csv', progress=None,
+                     chunk_size=CHUNK_SIZE, tables=None):
+    """
+    Stream every table for a user into `path`.
+
+    Args:
+        db: DatabaseManager
+        user_id: user to export
+        path: output file
+        fmt: 'csv', 'zip', 'jsonl' or 'parquet'
+        progress: optional callback(table_name, table_index, table_count, rows_written)
+        chunk_size: rows fetched per round trip
+        tables: optional subset of table names
+
+    Returns:
+        total number of rows written
+    """
+    writers = {
+        'csv': _write_csv,
+        'zip': _write_csv_zip,
+        'jsonl': _write_jsonl,
+        'parquet': _write_parquet_zip,
+    }
+    if fmt not in writers:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    selected = [name for name, _ in EXPORT_TABLES if not tables or name in tables]
+    state = {'rows': 0}
+
+    def counted(index, name, chunks):
+        for chunk in chunks:
+            state['rows'] += len(chunk)
+            if progress:
+                progress(name, index, len(selected), state['rows'])
+            yield chunk
+
+    def sources():
+        for index, (name, chunks) in enumerate(iter_user_tables(db, user_id, chunk_size, tables)):
+            if progress:
+                progress(name, index, len(selected), state['rows'])
+            yield name, counted(index, name, chunks)
+
+    writers[fmt](path, sources())
+    if progress:
+        progress(None, len(selected), len(selected), state['rows'])
+    return state['rows']
+
+
+# ==================== WRITERS ====================
+
+def _write_csv(path, sources):
+    """One CSV with a '--- TABLE ---' section per table"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        for name, chunks in sources:
+            writer.writerow([f"--- {name.upper()} ---"])
+            _write_csv_rows(writer, chunks)
+            writer.writerow([])
+
+
+def _write_csv_zip(path, sources):
+    """Zip archive with one <table>.csv per table, streamed into the archive"""
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, chunks in sources:
+            with archive.open(f"{name}.csv", 'w', force_zip64=True) as raw:
+                with io.TextIOWrapper(raw, encoding='utf-8', newline='') as f:
+                    _write_csv_rows(csv.writer(f), chunks)
+
+
+def _write_csv_rows(writer, chunks):
+    columns = None
+    for chunk in chunks:
+        if columns is None:
+            columns = list(chunk[0].keys())
+            writer.writerow(columns)
+        writer.writerows([_csv_value(row.get(c)) for c in columns] for row in chunk)
+
+
+def _write_jsonl(path, sources):
+    """One JSON object per line: {"table": ..., "row": {...}}"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for name, chunks in sources:
+            for chunk in chunks:
+                f.writelines(
+                    json.dumps({'table': name, 'row': row}, default=_json_value, ensure_ascii=False) + "\n"
+                    for row in chunk
+                )
+
+
+def _write_parquet_zip(path, sources):
+    """Zip archive with one <table>.parquet per table, one row group per chunk"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for name, chunks in sources:
+            writer = None
+            schema = None
+            with archive.open(f"{name}.parquet", 'w', force_zip64=True) as raw:
+                sink = pa.PythonFile(raw, mode='w')
+                for chunk in chunks:
+                    if schema is None:
+                        schema = _parquet_schema(pa, chunk)
+                        writer = pq.ParquetWriter(sink, schema)
+                    rows = [{k: _parquet_value(v, schema.field(k).type, pa) for k, v in row.items()}
+                            for row in chunk]
+                    writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                if writer:
+                    writer.close()
+
+
+def _parquet_schema(pa, chunk):
+    """Infer column types from the first chunk; all-NULL columns become strings"""
+    inferred = pa.Table.from_pylist(chunk).schema
+    fields = []
+    for field in inferred:
+        if pa.types.is_null(field.type):
+            field = pa.field(field.name, pa.string())
+        fields.append(field)
+    return pa.schema(fields)
+
+
+def _parquet_value(value, arrow_type, pa):
+    if value is not None and pa.types.is_string(arrow_type) and not isinstance(value, str):
+        return str(value)
+    return value
+
+
+def _csv_value(value):
+    return "" if value is None else value
+
+
+def _json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    return str(value)
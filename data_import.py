@@ -0,0 +1,469 @@
+"""
+Data Import - Streaming bulk import of study data
+Reads CSV / JSON Lines / zip files (including our own export formats),
+validates each row and writes them in batched transactions. Progress is
+checkpointed after every batch so a failed import can be resumed.
+"""
+
+import csv
+import io
+import json
+import os
+import zipfile
+from datetime import datetime, date
+
+import spaced_repetition
+import event_bus
+from event_bus import bus
+
+BATCH_SIZE = 1000
+MAX_ERRORS = 100
+
+# Header aliases used by other study tools -> our column names
+COLUMN_ALIASES = {
+    'subject': 'subject_name',
+    'course': 'subject_name',
+    'date': 'session_date',
+    'day': 'session_date',
+    'start': 'start_time',
+    'end': 'end_time',
+    'duration': 'duration_minutes',
+    'duration_(mins)': 'duration_minutes',
+    'minutes': 'duration_minutes',
+    'topics': 'topics_covered',
+    'topic': 'topics_covered',
+    'title': 'note_title',
+    'content': 'note_content',
+    'goal': 'goal_title',
+    'deadline': 'target_date',
+    'mood': 'mood_type',
+}
+
+DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%m/%d/%Y")
+TIME_FORMATS = ("%H:%M", "%H:%M:%S", "%I:%M %p")
+
+# Columns used as names/lookups: JSON numbers become text, anything else is rejected
+TEXT_COLUMNS = ('subject_name', 'subject_code', 'color_code', 'mood_type', 'status', 'priority')
+
+GOAL_STATUSES = ('pending', 'in_progress', 'completed')
+PRIORITIES = ('low', 'medium', 'high')
+
+INSERTS = {
+    'study_sessions': """
+        INSERT INTO study_sessions
+        (user_id, subject_id, session_date, start_time, end_time,
+         duration_minutes, topics_covered, notes)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    """,
+    'study_goals': """
+        INSERT INTO study_goals
+        (user_id, subject_id, goal_title, goal_description, status, priority, target_date, completed_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    """,
+    'quick_notes': """
+        INSERT INTO quick_notes (user_id, subject_id, note_title, note_content, is_pinned)
+        VALUES (%s, %s, %s, %s, %s)
+    """,
+    'mood_tracker': """
+        INSERT INTO mood_tracker (user_id, mood_type, mood_date, notes)
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE mood_type = VALUES(mood_type), notes = VALUES(notes)
+    """,
+    'chat_history': """
+        INSERT INTO chat_history (user_id, message, response, timestamp)
+        VALUES (%s, %s, %s, COALESCE(%s, CURRENT_TIMESTAMP))
+    """,
+    'saved_study_plans': """
+        INSERT INTO saved_study_plans (user_id, plan_content, created_at)
+        VALUES (%s, %s, COALESCE(%s, CURRENT_TIMESTAMP))
+    """,
+    'reminders': """
+        INSERT INTO reminders (user_id, message, reminder_time)
+        VALUES (%s, %s, %s)
+    """,
+    'topic_reviews': """
+        INSERT IGNORE INTO topic_reviews
+        (user_id, subject_id, topic, topic_key, ease_factor, next_due)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """,
+}
+
+# Insert order inside one batch transaction
+FLUSH_ORDER = ('study_sessions', 'topic_reviews', 'reminders', 'study_goals',
+               'quick_notes', 'mood_tracker', 'chat_history', 'saved_study_plans')
+
+
+class ImportErrorRow(ValueError):
+    """A row that failed validation"""
+
+
+# ==================== READERS ====================
+
+def iter_records(path, default_table='study_sessions'):
+    """
+    Stream (table, row) pairs from a file.
+
+    - .jsonl: our export format ({"table": ..., "row": {...}}) or plain
+      objects (treated as default_table)
+    - .zip: one <table>.csv per table (our zip export)
+    - .csv: our sectioned export ('--- TABLE ---' markers) or a plain CSV
+      with a header row (treated as default_table)
+    """
+    lower = path.lower()
+    if lower.endswith('.jsonl') or lower.endswith('.json'):
+        yield from _iter_jsonl(path, default_table)
+    elif lower.endswith('.zip'):
+        yield from _iter_csv_zip(path)
+    else:
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            yield from _iter_csv(f, default_table)
+
+
+def _iter_jsonl(path, default_table):
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if 'table' in record and isinstance(record.get('row'), dict):
+                yield record['table'], record['row']
+            else:
+                yield default_table, record
+
+
+def _iter_csv_zip(path):
+    with zipfile.ZipFile(path) as archive:
+        for name in archive.namelist():
+            if not name.lower().endswith('.csv'):
+                continue
+            table = os.path.splitext(os.path.basename(name))[0]
+            with archive.open(name) as raw:
+                with io.TextIOWrapper(raw, encoding='utf-8-sig', newline='') as f:
+                    yield from _iter_csv(f, table)
+
+
+def _iter_csv(f, table):
+    header = None
+    for values in csv.reader(f):
+        if not values or not any(v.strip() for v in values):
+            continue
+        first = values[0].strip()
+        if len(values) == 1 and first.startswith('---') and first.endswith('---'):
+            # Section marker from our single-file export
+            table = first.strip('- ').lower()
+            header = None
+            continue
+        if header is None:
+            header = values
+            continue
+        yield table, dict(zip(header, values))
+
+
+# ==================== IMPORTER ====================
+
+class StudyDataImporter:
+    """
+    Imports rows for one user.
+
+    Subjects are resolved by name through an in-memory map (missing ones
+    are created once). Rows are buffered and written every `batch_size`
+    records in a single transaction, followed by a checkpoint.
+    """
+
+    def __init__(self, db, user_id, batch_size=BATCH_SIZE, progress=None):
+        self.db = db
+        self.user_id = user_id
+        self.batch_size = batch_size
+        self.progress = progress  # callback(position, report)
+        self.subjects = None
+        self.now = datetime.now()
+        self.reset()
+
+    def reset(self):
+        self.buffers = {table: [] for table in INSERTS}
+        self.buffered = 0
+        self.report = {'imported': {}, 'skipped': {}, 'errors': [], 'position': 0}
+
+    # ---------- Entry point ----------
+
+    def import_file(self, path, default_table='study_sessions', resume=True):
+        """
+        Import a file. With resume=True, records already committed by a
+        previous (failed) run of the same file are skipped.
+        """
+        self.reset()
+        checkpoint_path = self.checkpoint_path(path)
+        start = self.load_checkpoint(checkpoint_path, path) if resume else 0
+        if start:
+            self.report = self._loaded_report
+
+        position = 0
+        for position, (table, row) in enumerate(iter_records(path, default_table), start=1):
+            if position <= start:
+                continue
+            try:
+                self.add_row(table, row)
+            except ImportErrorRow as e:
+                self.record_error(position, table, str(e))
+
+            if self.buffered >= self.batch_size:
+                self.flush(position, checkpoint_path, path)
+
+        self.flush(position, checkpoint_path, path)
+        self.clear_checkpoint(checkpoint_path)
+        # Imported sessions can change past streaks; rebuild from history
+        self.db.recompute_streaks([self.user_id])
+        self.db.rebuild_activity_calendar([self.user_id])
+        bus.publish(event_bus.DATA_IMPORTED, self.user_id, imported=dict(self.report['imported']))
+        return self.report
+
+    # ---------- Rows ----------
+
+    def add_row(self, table, row):
+        row = self.normalize(row)
+        handler = getattr(self, f"_row_{table}", None)
+        if table == 'subjects':
+            self.resolve_subject(self.required(row, 'subject_name'),
+                                 row.get('subject_code'), row.get('color_code'))
+            self.count('imported', table)
+            return
+        if handler is None:
+            self.count('skipped', table)
+            return
+        handler(row)
+
+    def _row_study_sessions(self, row):
+        subject_id = self.resolve_subject(self.required(row, 'subject_name'))
+        session_date = self.parse_date(self.required(row, 'session_date'))
+        start_time = self.parse_time(row.get('start_time'))
+        end_time = self.parse_time(row.get('end_time'))
+        duration = self.parse_int(row.get('duration_minutes'))
+        if duration is None:
+            duration = self.minutes_between(start_time, end_time)
+        if duration is None or duration < 0:
+            raise ImportErrorRow("duration_minutes is missing or invalid")
+        topics = row.get('topics_covered') or ''
+
+        self.buffer('study_sessions', (self.user_id, subject_id, session_date, start_time,
+                                       end_time, duration, topics, row.get('notes') or ''))
+
+        # Spaced-repetition cards, as add_study_session does
+        next_due = spaced_repetition.first_due_date(session_date)
+        for topic in spaced_repetition.split_topics(topics):
+            self.buffers['topic_reviews'].append(
+                (self.user_id, subject_id, topic, spaced_repetition.topic_key(topic),
+                 spaced_repetition.DEFAULT_EASE, next_due))
+
+        # Reminders only make sense for sessions that haven't happened yet
+        if start_time and session_date >= self.now.date():
+            try:
+                reminders = self.db.build_session_reminders(session_date, start_time, duration, topics)
+            except ValueError:
+                reminders = []
+            for rem_time, msg in reminders:
+                if rem_time > self.now:
+                    self.buffers['reminders'].append((self.user_id, msg, rem_time))
+
+    def _row_study_goals(self, row):
+        subject_name = row.get('subject_name')
+        subject_id = self.resolve_subject(subject_name) if subject_name and subject_name != 'General' else None
+        status = (row.get('status') or 'pending').lower()
+        priority = (row.get('priority') or 'medium').lower()
+        if status not in GOAL_STATUSES:
+            raise ImportErrorRow(f"invalid goal status '{status}'")
+        if priority not in PRIORITIES:
+            raise ImportErrorRow(f"invalid priority '{priority}'")
+        self.buffer('study_goals', (self.user_id, subject_id, self.required(row, 'goal_title'),
+                                    row.get('goal_description') or '', status, priority,
+                                    self.parse_date(row.get('target_date')),
+                                    self.parse_datetime(row.get('completed_at'))))
+
+    def _row_quick_notes(self, row):
+        subject_name = row.get('subject_name')
+        subject_id = self.resolve_subject(subject_name) if subject_name else None
+        if not row.get('note_title') and not row.get('note_content'):
+            raise ImportErrorRow("note has no title or content")
+        self.buffer('quick_notes', (self.user_id, subject_id, row.get('note_title'),
+                                    row.get('note_content'), self.parse_bool(row.get('is_pinned'))))
+
+    def _row_mood_tracker(self, row):
+        self.buffer('mood_tracker', (self.user_id, self.required(row, 'mood_type'),
+                                     self.parse_date(self.required(row, 'mood_date')),
+                                     row.get('notes') or ''))
+
+    def _row_chat_history(self, row):
+        self.buffer('chat_history', (self.user_id, self.required(row, 'message'),
+                                     row.get('response'), self.parse_datetime(row.get('timestamp'))))
+
+    def _row_saved_study_plans(self, row):
+        self.buffer('saved_study_plans', (self.user_id, self.required(row, 'plan_content'),
+                                          self.parse_datetime(row.get('created_at'))))
+
+    def buffer(self, table, params):
+        self.buffers[table].append(params)
+        self.buffered += 1
+        self.count('imported', table)
+
+    # ---------- Subjects ----------
+
+    def resolve_subject(self, name, code=None, color=None):
+        """Subject name -> subject_id, creating the subject if needed"""
+        if self.subjects is None:
+            self.subjects = {
+                s['subject_name'].strip().lower(): s['subject_id']
+                for s in (self.db.get_user_subjects(self.user_id) or [])
+            }
+        key = name.strip().lower()
+        if key not in self.subjects:
+            subject_id = self.db.add_subject(self.user_id, name.strip(), code or None, color or '#3498db')
+            if not subject_id:
+                raise ImportErrorRow(f"could not create subject '{name}'")
+            self.subjects[key] = subject_id
+        return self.subjects[key]
+
+    # ---------- Batches & checkpoints ----------
+
+    def flush(self, position, checkpoint_path, path):
+        """Write all buffered rows in one transaction, then checkpoint"""
+        statements = [(INSERTS[t], self.buffers[t]) for t in FLUSH_ORDER if self.buffers[t]]
+        if statements and not self.db.execute_transaction(statements):
+            raise RuntimeError(f"Import failed near record {position}; "
+                               f"run it again to resume from record {self.report['position']}")
+        self.buffers = {table: [] for table in INSERTS}
+        self.buffered = 0
+        self.report['position'] = position
+        self.save_checkpoint(checkpoint_path, path)
+        if self.progress:
+            self.progress(position, self.report)
+
+    @staticmethod
+    def checkpoint_path(path):
+        return path + ".import-checkpoint.json"
+
+    def load_checkpoint(self, checkpoint_path, path):
+        try:
+            with open(checkpoint_path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        if data.get('user_id') != self.user_id or data.get('size') != os.path.getsize(path):
+            return 0  # Different user or the file changed
+        self._loaded_report = data['report']
+        return data['report'].get('position', 0)
+
+    def save_checkpoint(self, checkpoint_path, path):
+        data = {'user_id': self.user_id, 'size': os.path.getsize(path), 'report': self.report}
+        try:
+            with open(checkpoint_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+        except OSError as e:
+            print(f"⚠️ Could not save import checkpoint: {e}")
+
+    @staticmethod
+    def clear_checkpoint(checkpoint_path):
+        try:
+            os.remove(checkpoint_path)
+        except OSError:
+            pass
+
+    # ---------- Report helpers ----------
+
+    def count(self, kind, table):
+        self.report[kind][table] = self.report[kind].get(table, 0) + 1
+
+    def record_error(self, position, table, message):
+        self.count('skipped', table)
+        if len(self.report['errors']) < MAX_ERRORS:
+            self.report['errors'].append([position, table, message])
+
+    # ---------- Parsing ----------
+
+    @staticmethod
+    def normalize(row):
+        """Lowercase/underscore the keys, apply aliases and strip string values"""
+        clean = {}
+        for key, value in row.items():
+            if key is None:
+                continue
+            key = key.strip().lower().replace(' ', '_')
+            key = COLUMN_ALIASES.get(key, key)
+            if key in TEXT_COLUMNS and value is not None and not isinstance(value, str):
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    raise ImportErrorRow(f"{key} must be text, not {type(value).__name__}")
+                value = str(value)
+            if isinstance(value, str):
+                value = value.strip()
+                if value == '':
+                    value = None
+            clean.setdefault(key, value)
+        return clean
+
+    @staticmethod
+    def required(row, key):
+        value = row.get(key)
+        if value is None or (isinstance(value, str) and not value):
+            raise ImportErrorRow(f"missing {key}")
+        return value
+
+    @staticmethod
+    def parse_date(value):
+        if value is None or (isinstance(value, date) and not isinstance(value, datetime)):
+            return value
+        if isinstance(value, datetime):
+            return value.date()
+        text = str(value)[:19]
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.strptime(text[:10], fmt).date()
+            except ValueError:
+                continue
+        raise ImportErrorRow(f"invalid date '{value}'")
+
+    @staticmethod
+    def parse_datetime(value):
+        if value is None or isinstance(value, datetime):
+            return value
+        try:
+            return datetime.fromisoformat(str(value).replace('Z', ''))
+        except ValueError:
+            raise ImportErrorRow(f"invalid date/time '{value}'")
+
+    @staticmethod
+    def parse_time(value):
+        """Normalize to the 'HH:MM' / 'HH:MM AM' strings the planner stores"""
+        if value is None:
+            return None
+        text = str(value).strip()
+        for fmt in TIME_FORMATS:
+            try:
+                datetime.strptime(text, fmt)
+                return text
+            except ValueError:
+                continue
+        raise ImportErrorRow(f"invalid time '{value}'")
+
+    @staticmethod
+    def parse_int(value):
+        if value is None:
+            return None
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            raise ImportErrorRow(f"invalid number '{value}'")
+
+    @staticmethod
+    def parse_bool(value):
+        return str(value).strip().lower() in ('1', 'true', 'yes', 'y')
+
+    @staticmethod
+    def minutes_between(start, end):
+        if not start or not end:
+            return None
+        for fmt in TIME_FORMATS:
+            try:
+                delta = datetime.strptime(end, fmt) - datetime.strptime(start, fmt)
+                return int(delta.total_seconds() // 60) % (24 * 60)
+            except ValueError:
+                continue
+        return None
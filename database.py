@@ -5,13 +5,122 @@ Handles all database operations using MySQL.
 
 import mysql.connector
 from mysql.connector import Error
+import functools
 import hashlib
+import json
+import sys
+import threading
+import time
+import uuid
 from datetime import datetime, date, timedelta
-from config import DB_CONFIG
+from config import OFFLINE
+import spaced_repetition
+import search_index
+import streak_engine
+import activity_calendar
+import study_forecast
+import retention
+import unread_counters
+import offline_queue
+from session_analytics import SessionFrame
+from query_metrics import metrics
+import db_router
+from db_router import router
+from lazy_singleton import LazySingleton
+import event_bus
+from event_bus import bus
+
+def _caller():
+    """Name of the DatabaseManager method (or other function) that issued a query"""
+    # Skip the generic query helpers so the real caller is reported
+    frame = sys._getframe(1)
+    while frame.f_back and frame.f_code.co_name in _HELPERS:
+        frame = frame.f_back
+    return frame.f_code.co_name
+
+_HELPERS = {'execute_query', 'execute_many', 'stream_query', 'execute_transaction', 'execute_locked', '_caller'}
+
+def _user_filter(column, user_ids):
+    """Optional "AND column IN (...)" clause and its params"""
+    if not user_ids:
+        return "", ()
+    return f"AND {column} IN ({', '.join(['%s'] * len(user_ids))})", tuple(user_ids)
+
+# Connection refused/lost, server gone away, lock wait timeout, deadlock
+TRANSIENT_ERRNOS = {2002, 2003, 2006, 2013, 2055, 1205, 1213}
+_last_failure = threading.local()
+
+def _note_failure(error=None):
+    """Remember on this thread whether the last failure was the link (no error = no connection) or the SQL"""
+    _last_failure.transient = error is None or getattr(error, 'errno', None) in TRANSIENT_ERRNOS
+
+STREAK_WARNING_HOUR = 20  # Only nag in the evening, once per day (the dedup key enforces "once")
+
+def _offline_write(stamp=None, keyed=False):
+    """
+    Acknowledge the call from the local write queue when it is enabled; the
+    sync worker replays it later. `stamp` names a date argument filled in at
+    enqueue time, so a replay after midnight still lands on the right day.
+    keyed=True passes a client_id the method uses to apply the write once,
+    however often it is replayed.
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.write_queue is None:
+                return method(self, *args, **kwargs)
+            if stamp and kwargs.get(stamp) is None:
+                kwargs[stamp] = date.today()
+            if keyed and kwargs.get('client_id') is None:
+                kwargs['client_id'] = uuid.uuid4().hex
+            entry_id = self.write_queue.enqueue(method.__name__, args, kwargs)
+            self.sync_worker.wake()
+            return entry_id
+        return wrapper
+    return decorate
+
+def _local_read(method):
+    """Fall back to the last good result kept locally when MySQL is down or the read fails"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        queue = self.write_queue
+        if queue is None:
+            return method(self, *args, **kwargs)
+        key = offline_queue.read_key(method.__name__, args, kwargs)
+        if not self.sync_worker.online:
+            cached = queue.cached(key)
+            if cached is not offline_queue.MISSING:
+                return cached
+        result = method(self, *args, **kwargs)
+        if result is None:
+            self.sync_worker.online = False
+            self.sync_worker.wake()
+            cached = queue.cached(key)
+            return None if cached is offline_queue.MISSING else cached
+        queue.remember(key, result)
+        return result
+    return wrapper
+
+SAVE_STREAK = """
+    INSERT INTO user_streaks
+    (user_id, current_streak, longest_streak, last_active, active_bits, study_bits)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        current_streak = VALUES(current_streak), longest_streak = VALUES(longest_streak),
+        last_active = VALUES(last_active), active_bits = VALUES(active_bits),
+        study_bits = VALUES(study_bits)
+"""
+
+def _streak_row(user_id, state):
+    return (user_id, state['current_streak'], state['longest_streak'], state['last_active'],
+            state['active_bits'], state['study_bits'])
 
 class DatabaseManager:
     """Manages all database operations for the Study Planner using MySQL"""
     
+    write_queue = None   # offline_queue.WriteQueue once enable_offline_queue() ran
+    sync_worker = None
+    
     def __init__(self):
         """Initialize database connection check"""
         self.test_connection()
@@ -22,36 +131,80 @@ class DatabaseManager:
         try:
             # Check last_login
             check = "SHOW COLUMNS FROM users LIKE 'last_login'"
-            if not self.execute_query(check, fetch=True):
+            if not self.execute_query(check, fetch=True, primary=True):
                 print("🔧 Migrating: Adding 'last_login' to users...")
                 self.execute_query("ALTER TABLE users ADD COLUMN last_login DATE")
                 
             # Check current_streak    
             check = "SHOW COLUMNS FROM users LIKE 'current_streak'"
-            if not self.execute_query(check, fetch=True):
+            if not self.execute_query(check, fetch=True, primary=True):
                 print("🔧 Migrating: Adding 'current_streak' to users...")
                 self.execute_query("ALTER TABLE users ADD COLUMN current_streak INT DEFAULT 0")
                 
         except Exception as e:
             print(f"⚠️ Schema Update Check Failed: {e}")
     
-    def get_connection(self):
-        """Get a connection to the MySQL database"""
-        try:
-            return mysql.connector.connect(**DB_CONFIG)
-        except Error as e:
-            print(f"❌ Error connecting to database: {e}")
-            return None
+    def get_connection(self, read=False):
+        """
+        Get a connection to the primary, or with read=True to a healthy
+        read replica (see db_router), failing over to the primary
+        """
+        if read and router.health_due():
+            threading.Thread(target=self.check_replica_health, daemon=True).start()
+        for config in router.candidates(read):
+            start = time.perf_counter()
+            try:
+                connection = mysql.connector.connect(**config)
+                metrics.record_connect(time.perf_counter() - start)
+                return connection
+            except Error as e:
+                metrics.record_connect(time.perf_counter() - start, ok=False)
+                if config is router.primary:
+                    print(f"❌ Error connecting to database: {e}")
+                    _note_failure()
+                    return None
+                router.mark_down(config)
+                print(f"⚠️ Replica {config.get('host')} unavailable, failing over: {e}")
+        return None
     
-    def execute_query(self, query, params=None, fetch=False):
+    def check_replica_health(self):
+        """Skip replicas that stopped replicating or lag more than DB_REPLICAS['max_lag_seconds']"""
+        for config in router.replicas:
+            connection = None
+            try:
+                connection = mysql.connector.connect(**config)
+                cursor = connection.cursor(dictionary=True)
+                try:
+                    cursor.execute("SHOW REPLICA STATUS")
+                except Error:
+                    cursor.execute("SHOW SLAVE STATUS")  # MySQL before 8.0.22
+                lag = db_router.lag_seconds(cursor.fetchone())
+                cursor.close()
+                router.record_lag(config, lag)
+                if lag is None or lag > router.max_lag_seconds:
+                    print(f"⚠️ Replica {config.get('host')} lagging ({lag}s), reading elsewhere")
+            except Error as e:
+                router.mark_down(config)
+                print(f"⚠️ Replica {config.get('host')} health check failed: {e}")
+            finally:
+                if connection:
+                    connection.close()
+    
+    def execute_query(self, query, params=None, fetch=False, primary=False):
         """
-        Execute a SQL query with parameters using MySQL Connector
+        Execute a SQL query with parameters using MySQL Connector.
+        Reads (fetch=True) may be served by a replica unless primary=True.
         """
-        connection = self.get_connection()
+        connect_start = time.perf_counter()
+        connection = self.get_connection(read=fetch and not primary)
         if not connection:
             return None
+        connect_seconds = time.perf_counter() - connect_start
         
         cursor = None
+        rows = 0
+        error = None
+        start = time.perf_counter()
         try:
             # Return results as dictionaries
             cursor = connection.cursor(dictionary=True)
@@ -60,14 +213,187 @@ class DatabaseManager:
             
             if fetch:
                 result = cursor.fetchall()
+                rows = len(result)
                 return result
             else:
                 connection.commit()
+                router.note_write()
+                rows = cursor.rowcount
                 return cursor.lastrowid
                 
         except Error as e:
-            print(f"❌ Database Error: {e}")
-            # print(f"Query: {query}")
+            error = e
+            _note_failure(e)
+            print(f"❌ Database Error in {_caller()}: {e}")
+            return None
+        finally:
+            metrics.record(_caller(), query, time.perf_counter() - start,
+                           connect_seconds, rows, error, params)
+            if cursor:
+                cursor.close()
+            if connection:
+                connection.close()
+    
+    def execute_many(self, query, params_list):
+        """
+        Execute one statement for many parameter sets in a single transaction
+        """
+        params_list = list(params_list)
+        if not params_list:
+            return 0
+        
+        connection = self.get_connection()
+        if not connection:
+            return None
+        
+        cursor = None
+        rows = 0
+        error = None
+        start = time.perf_counter()
+        try:
+            cursor = connection.cursor()
+            cursor.executemany(query, params_list)
+            connection.commit()
+            router.note_write()
+            rows = cursor.rowcount
+            return rows
+        except Error as e:
+            error = e
+            _note_failure(e)
+            print(f"❌ Database Error in {_caller()}: {e}")
+            connection.rollback()
+            return None
+        finally:
+            metrics.record(_caller(), query, time.perf_counter() - start, rows=rows, error=error)
+            if cursor:
+                cursor.close()
+            if connection:
+                connection.close()
+    
+    def stream_query(self, query, params=None, chunk_size=1000):
+        """
+        Yield the result of a SELECT in lists of at most chunk_size rows.
+        
+        Uses an unbuffered cursor, so rows are pulled from the server as
+        they are consumed and memory stays flat regardless of result size.
+        Raises Error if the database is unreachable, so callers cannot
+        mistake a failed read for an empty result.
+        """
+        connection = self.get_connection(read=True)
+        if not connection:
+            raise Error("Could not connect to the database")
+        
+        cursor = None
+        caller = _caller()
+        total = 0
+        error = None
+        elapsed = 0.0
+        try:
+            cursor = connection.cursor(dictionary=True, buffered=False)
+            start = time.perf_counter()
+            cursor.execute(query, params or ())
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                elapsed += time.perf_counter() - start
+                if not rows:
+                    break
+                total += len(rows)
+                yield rows
+                # Time spent in the consumer between chunks is not ours
+                start = time.perf_counter()
+        except Error as e:
+            error = e
+            raise
+        finally:
+            metrics.record(caller, query, elapsed, rows=total, error=error, params=params)
+            if cursor:
+                try:
+                    cursor.close()
+                except Error:
+                    pass  # Unread rows if the consumer stopped early
+            connection.close()
+    
+    def execute_transaction(self, statements, return_id=False):
+        """
+        Run several (query, params_list) batches with executemany in one
+        transaction. Everything is rolled back if any statement fails.
+        return_id=True returns the first statement's lastrowid instead of True.
+        """
+        connection = self.get_connection()
+        if not connection:
+            return False
+        
+        cursor = None
+        caller = _caller()
+        query = None
+        row_id = None
+        try:
+            cursor = connection.cursor()
+            for query, params_list in statements:
+                if params_list:
+                    start = time.perf_counter()
+                    cursor.executemany(query, params_list)
+                    metrics.record(caller, query, time.perf_counter() - start, rows=cursor.rowcount)
+                    if row_id is None:
+                        row_id = cursor.lastrowid
+            connection.commit()
+            router.note_write()
+            return row_id if return_id else True
+        except Error as e:
+            _note_failure(e)
+            print(f"❌ Database Error in {caller}: {e}")
+            if query:
+                metrics.record(caller, query, 0.0, error=e)
+            connection.rollback()
+            return False
+        finally:
+            if cursor:
+                cursor.close()
+            if connection:
+                connection.close()
+    
+    def execute_locked(self, query, params, build, reads=()):
+        """
+        Read-modify-write in one primary transaction. `query` is a SELECT ...
+        FOR UPDATE; build(rows) returns (result, [(query, params_list), ...])
+        and those statements run before the row locks are released. Extra
+        (query, params) `reads` run after the lock and are passed to build
+        as further row lists. Returns build's result, or None if anything
+        failed (rolled back).
+        """
+        connection = self.get_connection()
+        if not connection:
+            return None
+        
+        cursor = None
+        caller = _caller()
+        try:
+            cursor = connection.cursor(dictionary=True)
+            start = time.perf_counter()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            metrics.record(caller, query, time.perf_counter() - start, rows=len(rows), params=params)
+            extra = []
+            for query, read_params in reads:
+                start = time.perf_counter()
+                cursor.execute(query, read_params)
+                extra.append(cursor.fetchall())
+                metrics.record(caller, query, time.perf_counter() - start, rows=len(extra[-1]), params=read_params)
+            result, statements = build(rows, *extra)
+            for query, params_list in statements:
+                if params_list:
+                    start = time.perf_counter()
+                    cursor.executemany(query, params_list)
+                    metrics.record(caller, query, time.perf_counter() - start, rows=cursor.rowcount)
+            connection.commit()
+            if statements:
+                router.note_write()
+            return result
+        except Error as e:
+            _note_failure(e)
+            print(f"❌ Database Error in {caller}: {e}")
+            metrics.record(caller, query, 0.0, error=e)
+            connection.rollback()
             return None
         finally:
             if cursor:
@@ -75,6 +401,12 @@ class DatabaseManager:
             if connection:
                 connection.close()
     
+    def _published(self, result, event_type, user_id=None, **data):
+        """Pass a write's result through, announcing the change on the event bus if it succeeded"""
+        if result is not None and result is not False:
+            bus.publish(event_type, user_id, **data)
+        return result
+    
     # ==================== USER MANAGEMENT ====================
     
     def hash_password(self, password):
@@ -124,8 +456,10 @@ class DatabaseManager:
             INSERT INTO subjects (user_id, subject_name, subject_code, color_code)
             VALUES (%s, %s, %s, %s)
         """
-        return self.execute_query(query, (user_id, subject_name, subject_code, color_code))
+        subject_id = self.execute_query(query, (user_id, subject_name, subject_code, color_code))
+        return self._published(subject_id, event_bus.SUBJECT_CHANGED, user_id, subject_id=subject_id)
     
+    @_local_read
     def get_user_subjects(self, user_id):
         query = """
             SELECT subject_id, subject_name, subject_code, color_code, created_at
@@ -141,57 +475,104 @@ class DatabaseManager:
             SET subject_name = %s, subject_code = %s, color_code = %s
             WHERE subject_id = %s
         """
-        return self.execute_query(query, (subject_name, subject_code, color_code, subject_id))
+        return self._published(self.execute_query(query, (subject_name, subject_code, color_code, subject_id)),
+                               event_bus.SUBJECT_CHANGED, subject_id=subject_id)
     
     def delete_subject(self, subject_id):
+        # The FK cascade deletes the subject's sessions; note which calendars they fed first
+        affected = self.execute_query(
+            "SELECT DISTINCT user_id, YEAR(session_date) AS year FROM study_sessions WHERE subject_id = %s",
+            (subject_id,), fetch=True, primary=True
+        )
         query = "DELETE FROM subjects WHERE subject_id = %s"
-        return self.execute_query(query, (subject_id,))
+        result = self.execute_query(query, (subject_id,))
+        if result is not None and affected:
+            user_ids = sorted({r['user_id'] for r in affected})
+            try:
+                self.rebuild_activity_calendar(user_ids, sorted({r['year'] for r in affected}))
+                self.recompute_streaks(user_ids)
+            except Error as e:
+                print(f"⚠️ Calendar/streak rebuild after deleting subject {subject_id} failed: {e}")
+        return self._published(result, event_bus.SUBJECT_CHANGED, subject_id=subject_id)
     
     # ==================== STUDY SESSIONS ====================
     
+    @_offline_write(keyed=True)
     def add_study_session(self, user_id, subject_id, session_date, start_time, 
-                         end_time, duration_minutes, topics_covered, notes=''):
-        # 1. Add Session
-        query = """
-            INSERT INTO study_sessions 
-            (user_id, subject_id, session_date, start_time, end_time, 
-             duration_minutes, topics_covered, notes)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        result = self.execute_query(query, (user_id, subject_id, session_date, 
-                                     start_time, end_time, duration_minutes, 
-                                     topics_covered, notes))
+                         end_time, duration_minutes, topics_covered, notes='', client_id=None):
+        # Replayed after it was already saved: only the idempotent follow-ups run again
+        result = self._client_row('study_sessions', 'session_id', client_id)
+        replayed = result is not None
         
-        # 2. Add ROBUST Reminders
-        try:
-            dt_str = f"{session_date} {start_time}"
-            # Try parsing with AM/PM first, then fallback to 24-hour
+        if not replayed:
+            # 1. Add Session together with its ROBUST Reminders
             try:
-                start_dt = datetime.strptime(dt_str, "%Y-%m-%d %I:%M %p")
-            except ValueError:
-                start_dt = datetime.strptime(dt_str, "%Y-%m-%d %H:%M")
-                
-            end_dt = start_dt + timedelta(minutes=duration_minutes)
+                reminders = self.build_session_reminders(session_date, start_time,
+                                                         duration_minutes, topics_covered)
+            except Exception as e:
+                print(f"⚠️ Reminder Error: {e}")
+                reminders = []
+            query = """
+                INSERT INTO study_sessions 
+                (user_id, subject_id, session_date, start_time, end_time, 
+                 duration_minutes, topics_covered, notes, client_id)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """
+            result = self.execute_transaction([
+                (query, [(user_id, subject_id, session_date, start_time, end_time,
+                          duration_minutes, topics_covered, notes, client_id)]),
+                ("INSERT INTO reminders (user_id, message, reminder_time) VALUES (%s, %s, %s)",
+                 [(user_id, msg, rem_time) for rem_time, msg in reminders]),
+            ], return_id=True)
+            if not result:
+                return None
+        
+        # 2. Track topics for spaced repetition, the study streak and the calendar
+        saved = self.add_review_topics(user_id, subject_id, topics_covered, session_date) is not None
+        day = streak_engine.as_date(session_date)
+        if day <= date.today():
+            saved = self.record_streak_activity(user_id, day, studied=True) is not None and saved
+            if replayed:
+                self.rebuild_activity_calendar([user_id], [day.year])  # Adding again would double count
+            else:
+                saved = self.add_calendar_minutes(user_id, day, duration_minutes) is not None and saved
+        if not saved and client_id:
+            return None  # Keep the queued write so these are retried
             
-            reminders = [
-                # A. 15 Mins Before (Preparation)
-                (start_dt - timedelta(minutes=15), f"🚀 Get Ready! Study session '{topics_covered}' starts in 15 mins."),
-                
-                # B. At Start Time (Action)
-                (start_dt, f"⏰ It's Time! Start studying '{topics_covered}' now."),
-                
-                # C. After Session (Accountability)
-                (end_dt + timedelta(minutes=5), f"✅ Did you finish '{topics_covered}'? Don't forget to review your notes!")
-            ]
+        bus.publish(event_bus.SESSION_ADDED, user_id, session_id=result, session_date=session_date)
+        return result
+    
+    def _client_row(self, table, key, client_id):
+        """Id of the row a previous replay of the same queued write inserted, if any"""
+        if not client_id:
+            return None
+        rows = self.execute_query(f"SELECT {key} FROM {table} WHERE client_id = %s",
+                                  (client_id,), fetch=True, primary=True)
+        return rows[0][key] if rows else None
+    
+    def build_session_reminders(self, session_date, start_time, duration_minutes, topics_covered):
+        """(reminder_time, message) pairs for a session: before, at start and after"""
+        dt_str = f"{session_date} {start_time}"
+        # Try parsing with AM/PM first, then fallback to 24-hour
+        try:
+            start_dt = datetime.strptime(dt_str, "%Y-%m-%d %I:%M %p")
+        except ValueError:
+            start_dt = datetime.strptime(dt_str, "%Y-%m-%d %H:%M")
             
-            for rem_time, msg in reminders:
-                self.add_reminder(user_id, msg, rem_time)
-                
-        except Exception as e:
-            print(f"⚠️ Reminder Error: {e}")
+        end_dt = start_dt + timedelta(minutes=duration_minutes)
+        
+        return [
+            # A. 15 Mins Before (Preparation)
+            (start_dt - timedelta(minutes=15), f"🚀 Get Ready! Study session '{topics_covered}' starts in 15 mins."),
             
-        return result
+            # B. At Start Time (Action)
+            (start_dt, f"⏰ It's Time! Start studying '{topics_covered}' now."),
+            
+            # C. After Session (Accountability)
+            (end_dt + timedelta(minutes=5), f"✅ Did you finish '{topics_covered}'? Don't forget to review your notes!")
+        ]
     
+    @_local_read
     def get_user_sessions(self, user_id, limit=None):
         query = """
             SELECT s.*, sub.subject_name, sub.color_code
@@ -214,9 +595,74 @@ class DatabaseManager:
         """
         return self.execute_query(query, (user_id, start_date, end_date), fetch=True)
     
+    def get_session_frame(self, user_id, start_date=None, end_date=None):
+        """Columnar view of a user's sessions for aggregate stats (see session_analytics)"""
+        query = """
+            SELECT s.session_date, s.duration_minutes, s.start_time, sub.subject_name, sub.color_code
+            FROM study_sessions s
+            JOIN subjects sub ON s.subject_id = sub.subject_id
+            WHERE s.user_id = %s
+        """
+        params = [user_id]
+        if start_date:
+            query += " AND s.session_date >= %s"
+            params.append(start_date)
+        if end_date:
+            query += " AND s.session_date <= %s"
+            params.append(end_date)
+        try:
+            return SessionFrame.from_chunks(self.stream_query(query, tuple(params), chunk_size=5000))
+        except Error as e:
+            print(f"❌ Could not load sessions for analytics: {e}")
+            return SessionFrame()
+    
     def delete_session(self, session_id):
-        query = "DELETE FROM study_sessions WHERE session_id = %s"
-        return self.execute_query(query, (session_id,))
+        """Delete a session and take it back out of the calendar and the streak row in one transaction"""
+        lock = """
+            SELECT s.user_id, s.session_date, s.duration_minutes, c.day_bits, c.minutes,
+                   u.user_id AS streak_user
+            FROM study_sessions s
+            LEFT JOIN activity_calendar c ON c.user_id = s.user_id AND c.year = YEAR(s.session_date)
+            LEFT JOIN user_streaks u ON u.user_id = s.user_id
+            WHERE s.session_id = %s FOR UPDATE
+        """
+        # The user's remaining activity, to recompute the streak without this session
+        history = """
+            SELECT session_date AS activity_date, 1 AS studied
+            FROM study_sessions
+            WHERE user_id = (SELECT user_id FROM study_sessions WHERE session_id = %s)
+              AND session_id <> %s AND session_date <= CURDATE()
+            UNION ALL
+            SELECT streak_date, studied
+            FROM study_streaks
+            WHERE user_id = (SELECT user_id FROM study_sessions WHERE session_id = %s)
+              AND streak_date <= CURDATE()
+        """
+        
+        def delete(rows, activity):
+            if not rows:
+                return {}, []
+            s = rows[0]
+            day = streak_engine.as_date(s['session_date'])
+            statements = [("DELETE FROM study_sessions WHERE session_id = %s", [(session_id,)])]
+            if day <= date.today():
+                if s['day_bits'] is not None:
+                    day_bits, blob = activity_calendar.add_minutes(s['day_bits'], s['minutes'], day,
+                                                                   -(s['duration_minutes'] or 0))
+                    statements.append((
+                        "UPDATE activity_calendar SET day_bits = %s, minutes = %s WHERE user_id = %s AND year = %s",
+                        [(day_bits, blob, s['user_id'], day.year)]
+                    ))
+                if s['streak_user'] is not None:  # No row yet: it is built from history on first use
+                    state = streak_engine.recompute([r['activity_date'] for r in activity],
+                                                    [r['activity_date'] for r in activity if r['studied']])
+                    statements.append((SAVE_STREAK, [_streak_row(s['user_id'], state)]))
+            return s, statements
+        
+        session = self.execute_locked(lock, (session_id,), delete, reads=[(history, (session_id,) * 3)])
+        if session is None:
+            return None
+        return self._published(0, event_bus.SESSION_DELETED, session.get('user_id'), session_id=session_id)
     
     # ==================== STUDY GOALS ====================
     
@@ -238,8 +684,9 @@ class DatabaseManager:
                 self.add_reminder(user_id, f"Goal Deadline: {goal_title}", reminder_time)
             except Exception as e:
                 print(f"Reminder Error: {e}")
-        return result
+        return self._published(result, event_bus.GOAL_CHANGED, user_id, goal_id=result)
     
+    @_local_read
     def get_user_goals(self, user_id, status=None):
         if status:
             query = """
@@ -267,11 +714,12 @@ class DatabaseManager:
             SET status = %s, completed_at = %s
             WHERE goal_id = %s
         """
-        return self.execute_query(query, (status, completed_at, goal_id))
+        return self._published(self.execute_query(query, (status, completed_at, goal_id)),
+                               event_bus.GOAL_CHANGED, goal_id=goal_id, status=status)
     
     def delete_goal(self, goal_id):
         query = "DELETE FROM study_goals WHERE goal_id = %s"
-        return self.execute_query(query, (goal_id,))
+        return self._published(self.execute_query(query, (goal_id,)), event_bus.GOAL_CHANGED, goal_id=goal_id)
     
     # ==================== ANALYTICS ====================
     
@@ -316,6 +764,112 @@ class DatabaseManager:
         """
         return self.execute_query(query, (user_id, days), fetch=True)
     
+    # ==================== ACTIVITY CALENDAR ====================
+    
+    def add_calendar_minutes(self, user_id, day, minutes):
+        """Add (or with a negative value, remove) study minutes for one day; None if it failed"""
+        day = streak_engine.as_date(day)
+        row = self.execute_query(
+            "SELECT day_bits, minutes FROM activity_calendar WHERE user_id = %s AND year = %s",
+            (user_id, day.year), fetch=True, primary=True
+        )
+        if not row:
+            # First write for this year: build it from history (includes this session)
+            return self.rebuild_activity_calendar([user_id], [day.year])
+        day_bits, blob = activity_calendar.add_minutes(row[0]['day_bits'], row[0]['minutes'], day, minutes or 0)
+        return self.execute_query(
+            "UPDATE activity_calendar SET day_bits = %s, minutes = %s WHERE user_id = %s AND year = %s",
+            (day_bits, blob, user_id, day.year)
+        )
+    
+    def get_activity_calendar(self, user_id, year=None):
+        """One year of per-day minutes from a single packed row"""
+        year = year or date.today().year
+        query = "SELECT minutes FROM activity_calendar WHERE user_id = %s AND year = %s"
+        row = self.execute_query(query, (user_id, year), fetch=True)
+        if row:
+            minutes = activity_calendar.decode_minutes(row[0]['minutes'])
+        else:
+            # No row yet (writes create it): sum the year's sessions without writing on a read
+            days = self.execute_query("""
+                SELECT session_date, SUM(duration_minutes) AS total_minutes
+                FROM study_sessions
+                WHERE user_id = %s AND session_date BETWEEN %s AND LEAST(%s, CURDATE())
+                GROUP BY session_date
+            """, (user_id, date(year, 1, 1), date(year, 12, 31)), fetch=True) or []
+            _, blob = activity_calendar.build({r['session_date']: r['total_minutes'] for r in days})
+            minutes = activity_calendar.decode_minutes(blob)
+        return {
+            'year': year,
+            'minutes': minutes,
+            'total_minutes': sum(minutes),
+            'active_days': sum(1 for m in minutes if m),
+        }
+    
+    def get_activity_years(self, user_id):
+        """Years that have a calendar row, newest first"""
+        rows = self.execute_query(
+            "SELECT year FROM activity_calendar WHERE user_id = %s ORDER BY year DESC",
+            (user_id,), fetch=True
+        ) or []
+        return [r['year'] for r in rows]
+    
+    def rebuild_activity_calendar(self, user_ids=None, years=None, batch_size=500):
+        """
+        Rebuild packed calendar rows from study_sessions.
+        
+        Restrict with user_ids and/or years; requested (user, year) pairs with
+        no sessions still get an empty row so later reads stay single-row.
+        """
+        conditions, params = ["session_date <= CURDATE()"], []
+        if user_ids:
+            conditions.append(f"user_id IN ({', '.join(['%s'] * len(user_ids))})")
+            params += list(user_ids)
+        if years:
+            conditions.append(f"YEAR(session_date) IN ({', '.join(['%s'] * len(years))})")
+            params += list(years)
+        query = f"""
+            SELECT user_id, session_date, SUM(duration_minutes) AS total_minutes
+            FROM study_sessions
+            WHERE {' AND '.join(conditions)}
+            GROUP BY user_id, session_date
+            ORDER BY user_id, session_date
+        """
+        upsert = """
+            INSERT INTO activity_calendar (user_id, year, day_bits, minutes)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE day_bits = VALUES(day_bits), minutes = VALUES(minutes)
+        """
+        pending = []
+        written = set()
+        current, days = None, {}
+        
+        def finish():
+            if current is None:
+                return
+            pending.append(current + activity_calendar.build(days))
+            written.add(current)
+            if len(pending) >= batch_size:
+                self.execute_many(upsert, pending)
+                pending.clear()
+        
+        for chunk in self.stream_query(query, tuple(params)):
+            for row in chunk:
+                key = (row['user_id'], row['session_date'].year)
+                if key != current:
+                    finish()
+                    current, days = key, {}
+                days[row['session_date']] = row['total_minutes']
+        finish()
+        
+        for user_id in user_ids or ():
+            for year in years or ():
+                if (user_id, year) not in written:
+                    pending.append((user_id, year) + activity_calendar.empty())
+        if pending:
+            self.execute_many(upsert, pending)
+        return len(written)
+    
     # ==================== CHAT HISTORY ====================
     
     def save_chat_message(self, user_id, message, response):
@@ -325,15 +879,30 @@ class DatabaseManager:
         """
         return self.execute_query(query, (user_id, message, response))
     
-    def get_chat_history(self, user_id, limit=50):
-        query = """
-            SELECT message, response, timestamp
-            FROM chat_history
-            WHERE user_id = %s
-            ORDER BY timestamp DESC
-            LIMIT %s
+    def get_chat_history(self, user_id, limit=50, before_id=None):
+        """
+        Latest `limit` messages (oldest first). Pass the smallest chat_id you
+        already have as before_id to page further back (keyset pagination;
+        the user_id index carries chat_id, so each page is one range scan).
         """
-        result = self.execute_query(query, (user_id, limit), fetch=True)
+        if before_id:
+            query = """
+                SELECT chat_id, message, response, timestamp
+                FROM chat_history
+                WHERE user_id = %s AND chat_id < %s
+                ORDER BY chat_id DESC
+                LIMIT %s
+            """
+            result = self.execute_query(query, (user_id, before_id, limit), fetch=True)
+        else:
+            query = """
+                SELECT chat_id, message, response, timestamp
+                FROM chat_history
+                WHERE user_id = %s
+                ORDER BY chat_id DESC
+                LIMIT %s
+            """
+            result = self.execute_query(query, (user_id, limit), fetch=True)
         return list(reversed(result)) if result else []
     
     def clear_chat_history(self, user_id):
@@ -342,14 +911,16 @@ class DatabaseManager:
     
     # ==================== MOOD TRACKER ====================
     
-    def add_mood(self, user_id, mood_type, notes=''):
-        today = datetime.now().date()
+    @_offline_write(stamp='mood_date')
+    def add_mood(self, user_id, mood_type, notes='', mood_date=None):
+        today = mood_date or datetime.now().date()
         query = """
             INSERT INTO mood_tracker (user_id, mood_type, mood_date, notes)
             VALUES (%s, %s, %s, %s)
             ON DUPLICATE KEY UPDATE mood_type = %s, notes = %s
         """
-        return self.execute_query(query, (user_id, mood_type, today, notes, mood_type, notes))
+        return self._published(self.execute_query(query, (user_id, mood_type, today, notes, mood_type, notes)),
+                               event_bus.MOOD_ADDED, user_id, mood_type=mood_type)
     
     def get_user_moods(self, user_id, days=30):
         query = """
@@ -376,43 +947,126 @@ class DatabaseManager:
         query = """
             INSERT INTO study_streaks (user_id, streak_date, studied, flower_level)
             VALUES (%s, %s, %s, 1)
-            ON DUPLICATE KEY UPDATE studied = %s, flower_level = flower_level + 1
+            ON DUPLICATE KEY UPDATE studied = studied OR VALUES(studied)
+        """
+        result = self.execute_query(query, (user_id, today, studied))
+        self.record_streak_activity(user_id, today, studied=studied)
+        return result
+    
+    def get_streak_state(self, user_id):
+        """The user's precomputed streak row; built from history on first use"""
+        result = self.execute_query(
+            """SELECT current_streak, longest_streak, last_active, active_bits, study_bits
+               FROM user_streaks WHERE user_id = %s""",
+            (user_id,), fetch=True
+        )
+        if result:
+            return result[0]
+        states = self.recompute_streaks([user_id])
+        return states.get(user_id, streak_engine.empty_state())
+    
+    def save_streak_state(self, user_id, state):
+        return self.execute_query(SAVE_STREAK, _streak_row(user_id, state))
+    
+    def record_streak_activity(self, user_id, day=None, studied=False):
+        """Mark a day active (login) or studied; returns the new state (None if it could not be saved)"""
+        day = day or date.today()
+        
+        def update(rows):
+            if not rows:
+                return False, []
+            state = streak_engine.record_activity(rows[0], day, studied)
+            return state, [(SAVE_STREAK, [_streak_row(user_id, state)])]
+        
+        # Row-locked so concurrent logins/sessions cannot overwrite each other's day
+        query = """
+            SELECT current_streak, longest_streak, last_active, active_bits, study_bits
+            FROM user_streaks WHERE user_id = %s FOR UPDATE
         """
-        return self.execute_query(query, (user_id, today, studied, studied))
+        state = self.execute_locked(query, (user_id,), update)
+        if state is False:
+            # First use: build the row from history, then apply the activity
+            self.recompute_streaks([user_id])
+            state = self.execute_locked(query, (user_id,), update)
+        return state or None
     
     def get_current_streak(self, user_id):
-        """Get current streak from users table"""
-        query = "SELECT current_streak FROM users WHERE user_id = %s"
-        result = self.execute_query(query, (user_id,), fetch=True)
+        """Current streak from the precomputed row (0 once a day has been missed)"""
+        return streak_engine.current_streak(self.get_streak_state(user_id))
+    
+    def get_streak_summary(self, user_id, days=7):
+        """Current/longest streak and a gap-aware garden from a single row read"""
+        state = self.get_streak_state(user_id)
+        return {
+            'current_streak': streak_engine.current_streak(state),
+            'longest_streak': state['longest_streak'],
+            'garden': streak_engine.garden(state, days),
+        }
+    
+    def recompute_streaks(self, user_ids=None, batch_size=500):
+        """
+        Rebuild user_streaks from study_sessions and study_streaks.
+        
+        Pass user_ids to repair specific users, or None for everyone.
+        Returns {user_id: state}.
+        """
+        where, params = "", ()
+        if user_ids:
+            placeholders = ", ".join(["%s"] * len(user_ids))
+            where = f"AND user_id IN ({placeholders})"
+            params = tuple(user_ids) * 2
+        query = f"""
+            SELECT user_id, session_date AS activity_date, 1 AS studied
+            FROM study_sessions WHERE session_date <= CURDATE() {where}
+            UNION
+            SELECT user_id, streak_date AS activity_date, studied
+            FROM study_streaks WHERE streak_date <= CURDATE() {where}
+            ORDER BY user_id, activity_date
+        """
+        states = {}
+        pending = []
+        current_user, active, studied = None, [], []
+        
+        def finish():
+            if current_user is None:
+                return
+            states[current_user] = streak_engine.recompute(active, studied)
+            pending.append(_streak_row(current_user, states[current_user]))
+            if len(pending) >= batch_size:
+                flush()
+        
+        def flush():
+            if pending:
+                self.execute_many(SAVE_STREAK, pending)
+                pending.clear()
         
-        if result and result[0]['current_streak'] is not None:
-            return result[0]['current_streak']
-        return 0 
+        for chunk in self.stream_query(query, params):
+            for row in chunk:
+                if row['user_id'] != current_user:
+                    finish()
+                    current_user, active, studied = row['user_id'], [], []
+                active.append(row['activity_date'])
+                if row['studied']:
+                    studied.append(row['activity_date'])
+        finish()
+        
+        # Users with no history at all still get a row so reads stay O(1)
+        for user_id in user_ids or ():
+            if user_id not in states:
+                states[user_id] = streak_engine.empty_state()
+                pending.append(_streak_row(user_id, states[user_id]))
+        flush()
+        return states
 
     def update_login_streak(self, user_id):
         """Build addictive streak: Called on Login"""
         today = datetime.now().date()
-        yesterday = today - timedelta(days=1)
-        
-        # 1. Get last streak info
-        query = "SELECT last_login, current_streak FROM users WHERE user_id = %s"
-        user = self.execute_query(query, (user_id,), fetch=True)[0]
-        
-        last_login = user['last_login']
-        current_streak = user['current_streak']
+        state = self.record_streak_activity(user_id, today)
+        if state is None:
+            return 0
+        new_streak = state['current_streak']
         
-        # 2. Update logic
-        new_streak = current_streak
-        
-        if last_login == today:
-            pass # Already logged in today, no change
-        elif last_login == yesterday:
-            new_streak += 1 # Continued streak!
-        else:
-            new_streak = 1 # Broken streak (or first login) :(
-            
-        # 3. Save
-        # Also log to study_streaks table for graph
+        # Keep the legacy columns in sync (exports, streak-risk checks)
         self.execute_query(
             "UPDATE users SET last_login = %s, current_streak = %s WHERE user_id = %s",
             (today, new_streak, user_id)
@@ -428,42 +1082,50 @@ class DatabaseManager:
 
     def check_streak_risk(self, user_id):
         """Check if streak is at risk (no login for 20h)"""
-        query = "SELECT last_login, current_streak FROM users WHERE user_id = %s"
-        result = self.execute_query(query, (user_id,), fetch=True)
-        
-        if not result or not result[0]['last_login']:
+        now = datetime.now()
+        if not self.generate_streak_warnings([user_id], now, remind=False):
             return None
-            
-        last_login = result[0]['last_login']
-        # Ensure last_login is date object
-        if isinstance(last_login, datetime):
-            last_login = last_login.date()
-            
-        today = date.today()
-        
-        # If last login was yesterday (streak active but not extended today)
-        if last_login == today - timedelta(days=1):
-            # Check time: If it's past 8 PM (20:00)
-            now = datetime.now()
-            if now.hour >= 20: 
-                # Check if we already warned today
-                check_query = """
-                    SELECT * FROM notifications 
-                    WHERE user_id = %s 
-                    AND notification_type = 'streak_warning' 
-                    AND DATE(created_at) = %s
-                """
-                existing = self.execute_query(check_query, (user_id, today), fetch=True)
-                
-                if not existing:
-                    # Create Warning Notification
-                    message = f"🔥 Streak Risk! You have {24 - now.hour} hours left to login and save your {result[0]['current_streak']} day streak!"
-                    self.add_notification(user_id, message, "high", "streak_warning")
-                    return {'message': message, 'priority': 'high'}
-                    
-        return None
+        result = self.execute_query("""
+            SELECT message, priority FROM notifications
+            WHERE user_id = %s AND notification_type = 'streak_warning' AND dedup_date = %s
+        """, (user_id, now.date()), fetch=True)
+        return result[0] if result else None
+    
+    def generate_streak_warnings(self, user_ids=None, now=None, remind=True, not_before=STREAK_WARNING_HOUR):
+        """
+        Warn every user who logged in yesterday but not yet today.
+        One INSERT ... SELECT for the notifications (plus one for the toast
+        reminders); the (user, type, day) unique key makes reruns no-ops.
+        Does nothing before the not_before hour, so an overnight run cannot
+        use up the day's warning. Returns the number of new warnings.
+        """
+        now = now or datetime.now()
+        if now.hour < not_before:
+            return 0
+        today = now.date()
+        user_filter, user_params = _user_filter("u.user_id", user_ids)
+        created = self.execute_many(f"""
+            INSERT INTO notifications (user_id, notification_type, message, priority, dedup_date)
+            SELECT u.user_id, 'streak_warning',
+                   CONCAT('🔥 Streak Risk! You have ', %s, ' hours left to login and save your ',
+                          u.current_streak, ' day streak!'),
+                   'high', %s
+            FROM users u
+            WHERE u.last_login = %s {user_filter}
+            ON DUPLICATE KEY UPDATE notification_id = notification_id
+        """, [(24 - now.hour, today, today - timedelta(days=1)) + user_params]) or 0
+        if created:
+            self._count_new_notifications('streak_warning', today, user_ids)
+            bus.publish(event_bus.NOTIFICATION_ADDED, user_ids[0] if user_ids and len(user_ids) == 1 else None,
+                        notification_type='streak_warning', count=created)
+        if created and remind:
+            self._remind_from_notifications('streak_warning', today, now, user_ids)
+        return created
     
     def get_streak_garden(self, user_id, days=30):
+        """One entry per day, oldest first; served from the streak bitmap when it covers the range"""
+        if days <= streak_engine.WINDOW_DAYS:
+            return streak_engine.garden(self.get_streak_state(user_id), days)
         query = """
             SELECT streak_date, studied, flower_level
             FROM study_streaks
@@ -474,10 +1136,14 @@ class DatabaseManager:
     
     # ==================== STUDY PET ====================
     
+    @_local_read
     def get_or_create_pet(self, user_id):
+        # Primary: a lagging replica would make us create a second pet
         query = "SELECT * FROM study_pet WHERE user_id = %s"
-        result = self.execute_query(query, (user_id,), fetch=True)
+        result = self.execute_query(query, (user_id,), fetch=True, primary=True)
         
+        if result is None:
+            return None  # Database unreachable
         if result:
             return result[0]
         else:
@@ -488,7 +1154,8 @@ class DatabaseManager:
             self.execute_query(create_query, (user_id,))
             return self.get_or_create_pet(user_id)
     
-    def update_pet_status(self, user_id, happiness_change=0, energy_change=0, claps=0):
+    @_offline_write(keyed=True)
+    def update_pet_status(self, user_id, happiness_change=0, energy_change=0, claps=0, client_id=None):
         query = """
             UPDATE study_pet
             SET happiness_level = GREATEST(0, LEAST(100, happiness_level + %s)),
@@ -503,18 +1170,36 @@ class DatabaseManager:
         # In MySQL, MAX() is aggregate, GREATEST() is scalar.
         # The original code likely came from MySQL and was compatible or I should use GREATEST/LEAST.
         # Let's use GREATEST/LEAST for safety in MySQL.
-        return self.execute_query(query, (happiness_change, energy_change, claps, user_id))
+        params = (happiness_change, energy_change, claps, user_id)
+        if not client_id:
+            return self._published(self.execute_query(query, params), event_bus.PET_CHANGED, user_id)
+        
+        def apply(rows):
+            if rows:
+                return 0, []  # Replay of a change that is already applied
+            return 1, [("INSERT INTO pet_updates (client_id, user_id) VALUES (%s, %s)", [(client_id, user_id)]),
+                       (query, [params])]
+        
+        result = self.execute_locked("SELECT client_id FROM pet_updates WHERE client_id = %s FOR UPDATE",
+                                     (client_id,), apply)
+        return self._published(result, event_bus.PET_CHANGED, user_id)
     
     # ==================== POMODORO ====================
     
-    def add_pomodoro_session(self, user_id, subject_id, completed_cycles, total_minutes):
-        today = datetime.now().date()
+    @_offline_write(stamp='session_date', keyed=True)
+    def add_pomodoro_session(self, user_id, subject_id, completed_cycles, total_minutes, session_date=None,
+                             client_id=None):
+        existing = self._client_row('pomodoro_sessions', 'pomodoro_id', client_id)
+        if existing:
+            return existing
+        today = session_date or datetime.now().date()
         query = """
             INSERT INTO pomodoro_sessions 
-            (user_id, subject_id, session_date, total_cycles, completed_cycles, total_focus_minutes)
-            VALUES (%s, %s, %s, %s, %s, %s)
+            (user_id, subject_id, session_date, total_cycles, completed_cycles, total_focus_minutes, client_id)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
         """
-        return self.execute_query(query, (user_id, subject_id, today, completed_cycles, completed_cycles, total_minutes))
+        return self.execute_query(query, (user_id, subject_id, today, completed_cycles, completed_cycles,
+                                          total_minutes, client_id))
     
     def get_pomodoro_stats(self, user_id, days=7):
         query = """
@@ -530,43 +1215,109 @@ class DatabaseManager:
     # ==================== NOTIFICATIONS ====================
     
     def add_notification(self, user_id, notification_type, message, priority='medium'):
-        query = """
-            INSERT INTO notifications (user_id, notification_type, message, priority)
-            VALUES (%s, %s, %s, %s)
-        """
-        return self.execute_query(query, (user_id, notification_type, message, priority))
-    
-    def get_notifications(self, user_id, limit=50):
+        return self._published(self.execute_transaction([
+            ("""
+                INSERT INTO notifications (user_id, notification_type, message, priority)
+                VALUES (%s, %s, %s, %s)
+            """, [(user_id, notification_type, message, priority)]),
+            ("""
+                INSERT INTO notification_counters (user_id, unread_count) VALUES (%s, 1)
+                ON DUPLICATE KEY UPDATE unread_count = unread_count + 1
+            """, [(user_id,)]),
+        ], return_id=True) or None, event_bus.NOTIFICATION_ADDED, user_id, notification_type=notification_type)
+    
+    def get_notifications(self, user_id, limit=50, before_id=None):
+        """Newest first; pass the last notification_id seen as before_id for the next page"""
+        if before_id:
+            query = """
+                SELECT * FROM notifications
+                WHERE user_id = %s AND notification_id < %s
+                ORDER BY notification_id DESC
+                LIMIT %s
+            """
+            return self.execute_query(query, (user_id, before_id, limit), fetch=True)
         query = """
             SELECT * FROM notifications
             WHERE user_id = %s
-            ORDER BY created_at DESC
+            ORDER BY notification_id DESC
             LIMIT %s
         """
         return self.execute_query(query, (user_id, limit), fetch=True)
 
     def delete_notification(self, notification_id):
-        query = "DELETE FROM notifications WHERE notification_id = %s"
-        return self.execute_query(query, (notification_id,))
+        return self._published(self._with_unread_decrement("notification_id = %s", (notification_id,), [
+            ("DELETE FROM notifications WHERE notification_id = %s", [(notification_id,)]),
+        ]), event_bus.NOTIFICATION_DELETED, notification_id=notification_id)
         
     def count_unread_notifications(self, user_id):
-        query = "SELECT COUNT(*) as count FROM notifications WHERE user_id = %s AND is_read = 0"
+        """Badge count, read from the per-user counter (primary key lookup)"""
+        query = "SELECT unread_count FROM notification_counters WHERE user_id = %s"
         result = self.execute_query(query, (user_id,), fetch=True)
-        return result[0]['count'] if result else 0
+        return result[0]['unread_count'] if result else 0
     
     def mark_notification_read(self, notification_id):
-        query = "UPDATE notifications SET is_read = 1 WHERE notification_id = %s"
-        return self.execute_query(query, (notification_id,))
+        return self._published(self._with_unread_decrement("notification_id = %s", (notification_id,), [
+            ("UPDATE notifications SET is_read = 1 WHERE notification_id = %s", [(notification_id,)]),
+        ]), event_bus.NOTIFICATION_READ, notification_id=notification_id)
+    
+    def mark_all_notifications_read(self, user_id):
+        return self._published(self._with_unread_decrement("user_id = %s AND is_read = 0", (user_id,), [
+            ("UPDATE notifications SET is_read = 1 WHERE user_id = %s AND is_read = 0", [(user_id,)]),
+        ]), event_bus.NOTIFICATION_READ, user_id)
+    
+    def _with_unread_decrement(self, where, params, statements):
+        """
+        Run `statements` (marking read or deleting the notifications matching
+        `where`) together with the counter decrements. The rows are locked
+        first, so concurrent calls cannot both count the same unread one.
+        Returns True, or None on failure.
+        """
+        return self.execute_locked(
+            f"SELECT user_id, is_read FROM notifications WHERE {where} FOR UPDATE", params,
+            lambda rows: (True, [(unread_counters.ADJUST, unread_counters.decrements(rows))] + statements)
+        )
+    
+    def reconcile_unread_counts(self, user_ids=None):
+        """Repair counters that drifted from the notifications table. Returns how many were off."""
+        user_filter, user_params = _user_filter("u.user_id", user_ids)
+        return self._fix_unread_counts(f"1 = 1 {user_filter}", user_params)
+    
+    def _fix_unread_counts(self, user_where, params):
+        drifted = self.execute_query(f"""
+            SELECT * FROM (
+                SELECT u.user_id, COALESCE(c.unread_count, 0) AS counted,
+                       (SELECT COUNT(*) FROM notifications n
+                        WHERE n.user_id = u.user_id AND n.is_read = 0) AS unread
+                FROM users u
+                LEFT JOIN notification_counters c ON c.user_id = u.user_id
+                WHERE {user_where}
+            ) AS counts
+            WHERE unread <> counted
+        """, params, fetch=True) or []
+        if not drifted:
+            return 0
+        # Apply the difference rather than the total, so notifications added meanwhile still count
+        ok = self.execute_transaction([
+            ("INSERT IGNORE INTO notification_counters (user_id, unread_count) VALUES (%s, 0)",
+             [(r['user_id'],) for r in drifted]),
+            (unread_counters.ADJUST, unread_counters.corrections(drifted)),
+        ])
+        return len(drifted) if ok else 0
     
     # ==================== QUICK NOTES ====================
     
-    def add_note(self, user_id, title, content, subject_id=None):
+    @_offline_write(keyed=True)
+    def add_note(self, user_id, title, content, subject_id=None, client_id=None):
+        existing = self._client_row('quick_notes', 'note_id', client_id)
+        if existing:
+            return existing
         query = """
-            INSERT INTO quick_notes (user_id, subject_id, note_title, note_content)
-            VALUES (%s, %s, %s, %s)
+            INSERT INTO quick_notes (user_id, subject_id, note_title, note_content, client_id)
+            VALUES (%s, %s, %s, %s, %s)
         """
-        return self.execute_query(query, (user_id, subject_id, title, content))
+        return self.execute_query(query, (user_id, subject_id, title, content, client_id))
     
+    @_local_read
     def get_user_notes(self, user_id):
         query = """
             SELECT n.*, s.subject_name
@@ -597,14 +1348,22 @@ class DatabaseManager:
         """
         return self.execute_query(query, (user_id, plan_content))
 
-    def get_saved_ai_plans(self, user_id):
+    def get_saved_ai_plans(self, user_id, limit=None, before_id=None):
+        """Newest first; pass the last plan_id seen as before_id for the next page"""
         query = """
             SELECT plan_id, plan_content, created_at
             FROM saved_study_plans
             WHERE user_id = %s
-            ORDER BY created_at DESC
         """
-        return self.execute_query(query, (user_id,), fetch=True)
+        params = [user_id]
+        if before_id:
+            query += " AND plan_id < %s"
+            params.append(before_id)
+        query += " ORDER BY plan_id DESC"
+        if limit:
+            query += " LIMIT %s"
+            params.append(limit)
+        return self.execute_query(query, tuple(params), fetch=True)
 
     def delete_saved_plan(self, plan_id):
         query = "DELETE FROM saved_study_plans WHERE plan_id = %s"
@@ -616,53 +1375,365 @@ class DatabaseManager:
 
     # ==================== WEEKLY REPORTS ====================
     
-    def generate_weekly_report(self, user_id):
-        from datetime import datetime, timedelta
-        
-        today = datetime.now().date()
+    def generate_weekly_report(self, user_id, today=None):
+        """Build (or rebuild) the report for the week containing today"""
+        today = today or datetime.now().date()
         week_start = today - timedelta(days=today.weekday())
         week_end = week_start + timedelta(days=6)
         
-        # Get weekly stats
-        sessions = self.get_sessions_by_date_range(user_id, week_start, week_end) or []
-        total_minutes = sum(s['duration_minutes'] for s in sessions)
+        # Get weekly stats (plus the weeks before, for the user's own baseline)
+        history_start = week_start - timedelta(weeks=study_forecast.BASELINE_WEEKS)
+        frame = self.get_session_frame(user_id, history_start, week_end)
+        total_minutes = frame.total(week_start, week_end)
+        total_sessions = frame.count(week_start, week_end)
         total_hours = total_minutes / 60
         
         # Subject performance
-        subject_stats = {}
-        for session in sessions:
-            subj = session['subject_name']
-            if subj not in subject_stats:
-                subject_stats[subj] = 0
-            subject_stats[subj] += session['duration_minutes']
-        
-        strongest = max(subject_stats, key=subject_stats.get) if subject_stats else 'N/A'
-        weakest = min(subject_stats, key=subject_stats.get) if subject_stats else 'N/A'
+        subject_stats = frame.by_subject(week_start, week_end)
+        strongest, weakest = frame.strongest_weakest(week_start, week_end)
+        strongest = strongest or 'N/A'
+        weakest = weakest or 'N/A'
         
-        # Productivity score (0-100)
-        expected_hours = 7 * 2  # 2 hours per day
-        productivity_score = min(100, int((total_hours / expected_hours) * 100))
+        # Productivity score (0-100) against the user's usual week
+        productivity_score = study_forecast.productivity_score(frame, week_start, week_end, today)
         
         query = """
             INSERT INTO weekly_reports 
             (user_id, week_start_date, week_end_date, total_study_hours, 
              total_sessions, productivity_score, strongest_subject, weakest_subject)
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                total_study_hours = VALUES(total_study_hours), total_sessions = VALUES(total_sessions),
+                productivity_score = VALUES(productivity_score), strongest_subject = VALUES(strongest_subject),
+                weakest_subject = VALUES(weakest_subject)
         """
         self.execute_query(query, (user_id, week_start, week_end, total_hours, 
-                                   len(sessions), productivity_score, strongest, weakest))
+                                   total_sessions, productivity_score, strongest, weakest))
         
         return {
             'week_start': week_start,
             'week_end': week_end,
             'total_hours': total_hours,
-            'total_sessions': len(sessions),
+            'total_sessions': total_sessions,
             'productivity_score': productivity_score,
             'strongest_subject': strongest,
             'weakest_subject': weakest,
             'subject_breakdown': subject_stats
         }
     
+    # ==================== FORECASTS ====================
+    
+    def compute_study_forecast(self, user_id, today=None):
+        """Next-week forecast, productivity and at-risk subjects (see study_forecast)"""
+        today = today or date.today()
+        start = today - timedelta(days=study_forecast.HISTORY_DAYS - 1)
+        frame = self.get_session_frame(user_id, start, today)
+        goals = self.get_user_goals(user_id) or []
+        return study_forecast.forecast(frame, goals, today)
+    
+    def save_study_forecast(self, user_id, report):
+        self.save_study_forecasts([(user_id, report)])
+    
+    def save_study_forecasts(self, reports):
+        """Upsert [(user_id, report), ...] in one batch"""
+        rows = [(user_id, r['forecast_date'], r['next_week_minutes'], r['productivity_score'],
+                 len(r['at_risk']), json.dumps(r, default=str)) for user_id, r in reports]
+        if rows:
+            self.execute_many("""
+                INSERT INTO study_forecasts
+                (user_id, forecast_date, next_week_minutes, productivity_score, at_risk_count, report)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    forecast_date = VALUES(forecast_date), next_week_minutes = VALUES(next_week_minutes),
+                    productivity_score = VALUES(productivity_score), at_risk_count = VALUES(at_risk_count),
+                    report = VALUES(report)
+            """, rows)
+    
+    def get_study_forecast(self, user_id, refresh=False):
+        """Today's forecast report; computed on demand if the nightly run missed this user"""
+        if not refresh:
+            row = self.execute_query(
+                "SELECT forecast_date, report FROM study_forecasts WHERE user_id = %s",
+                (user_id,), fetch=True
+            )
+            if row and row[0]['forecast_date'] == date.today() and row[0]['report']:
+                return json.loads(row[0]['report'])
+        report = self.compute_study_forecast(user_id)
+        self.save_study_forecast(user_id, report)
+        return report
+    
+    def refresh_forecasts(self, user_ids=None, batch_size=500, today=None):
+        """
+        Recompute study_forecasts for many users with one streamed read of
+        recent sessions and one read of open goals. Returns the number of users.
+        """
+        today = today or date.today()
+        start = today - timedelta(days=study_forecast.HISTORY_DAYS - 1)
+        session_filter = goal_filter = ""
+        user_params = ()
+        if user_ids:
+            placeholders = ", ".join(["%s"] * len(user_ids))
+            session_filter = f"AND s.user_id IN ({placeholders})"
+            goal_filter = f"AND g.user_id IN ({placeholders})"
+            user_params = tuple(user_ids)
+        
+        goals = {}
+        goal_rows = self.execute_query(f"""
+            SELECT g.user_id, g.goal_title, g.status, g.target_date, sub.subject_name
+            FROM study_goals g
+            JOIN subjects sub ON g.subject_id = sub.subject_id
+            WHERE g.status != 'completed' AND g.target_date BETWEEN %s AND %s {goal_filter}
+        """, (today, today + timedelta(days=study_forecast.RISK_WINDOW_DAYS)) + user_params, fetch=True) or []
+        for goal in goal_rows:
+            goals.setdefault(goal['user_id'], []).append(goal)
+        
+        query = f"""
+            SELECT s.user_id, s.session_date, s.duration_minutes, s.start_time, sub.subject_name, sub.color_code
+            FROM study_sessions s
+            JOIN subjects sub ON s.subject_id = sub.subject_id
+            WHERE s.session_date BETWEEN %s AND %s {session_filter}
+            ORDER BY s.user_id
+        """
+        pending = []
+        done = set()
+        current_user, rows = None, []
+        
+        def finish():
+            if current_user is None:
+                return
+            frame = SessionFrame.from_chunks([rows])
+            pending.append((current_user, study_forecast.forecast(frame, goals.get(current_user), today)))
+            done.add(current_user)
+            if len(pending) >= batch_size:
+                self.save_study_forecasts(pending)
+                pending.clear()
+        
+        for chunk in self.stream_query(query, (start, today) + user_params, chunk_size=5000):
+            for row in chunk:
+                if row['user_id'] != current_user:
+                    finish()
+                    current_user, rows = row['user_id'], []
+                rows.append(row)
+        finish()
+        
+        # Goals due soon with no recent study at all are the most at risk
+        for user_id in set(goals) - done:
+            pending.append((user_id, study_forecast.forecast(SessionFrame(), goals[user_id], today)))
+        self.save_study_forecasts(pending)
+        return len(done | set(goals))
+    
+    # ==================== BATCH JOBS ====================
+    
+    def get_user_id_batch(self, after_user_id=0, limit=500):
+        """Next page of user ids (keyset pagination, stable under inserts)"""
+        rows = self.execute_query(
+            "SELECT user_id FROM users WHERE user_id > %s ORDER BY user_id LIMIT %s",
+            (after_user_id, limit), fetch=True
+        ) or []
+        return [r['user_id'] for r in rows]
+    
+    def get_batch_run(self, job_name, run_date):
+        result = self.execute_query(
+            "SELECT * FROM batch_runs WHERE job_name = %s AND run_date = %s",
+            (job_name, run_date), fetch=True, primary=True
+        )
+        return result[0] if result else None
+    
+    def get_batch_runs(self, run_date):
+        return self.execute_query(
+            "SELECT * FROM batch_runs WHERE run_date = %s ORDER BY started_at",
+            (run_date,), fetch=True
+        ) or []
+    
+    def start_batch_run(self, job_name, run_date, restart=False):
+        """Create or reopen the checkpoint row; restart=True starts over from the first user"""
+        reset = "last_user_id = 0, processed = 0, failed = 0, seconds = 0," if restart else ""
+        self.execute_query(f"""
+            INSERT INTO batch_runs (job_name, run_date, status) VALUES (%s, %s, 'running')
+            ON DUPLICATE KEY UPDATE {reset} status = 'running', finished_at = NULL
+        """, (job_name, run_date))
+        return self.get_batch_run(job_name, run_date)
+    
+    def checkpoint_batch_run(self, job_name, run_date, last_user_id, processed, failed, seconds, status='running'):
+        finished = "CURRENT_TIMESTAMP" if status != 'running' else "NULL"
+        return self.execute_query(f"""
+            UPDATE batch_runs
+            SET last_user_id = %s, processed = %s, failed = %s, seconds = %s,
+                status = %s, finished_at = {finished}
+            WHERE job_name = %s AND run_date = %s
+        """, (last_user_id, processed, failed, seconds, status, job_name, run_date))
+    
+    def decay_pets(self, user_ids, run_date, happiness=5, energy=3):
+        """
+        Nightly mood drop for pets nobody played with since yesterday.
+        last_decay makes it once per pet per day however often it runs.
+        """
+        if not user_ids:
+            return 0
+        placeholders = ", ".join(["%s"] * len(user_ids))
+        query = f"""
+            UPDATE study_pet
+            SET happiness_level = GREATEST(0, happiness_level - %s),
+                energy_level = GREATEST(0, energy_level - %s),
+                last_decay = %s
+            WHERE user_id IN ({placeholders})
+              AND (last_decay IS NULL OR last_decay < %s)
+              AND last_interaction < %s
+        """
+        return self.execute_query(query, (happiness, energy, run_date, *user_ids, run_date, run_date))
+
+    # ==================== RETENTION ====================
+    # Table and column names come from retention.TABLES, never from user input
+
+    def get_expired_ids(self, table, key, date_column, cutoff, where="", limit=1000):
+        """Oldest ids past the cutoff, one batch at a time"""
+        extra = f"AND {where}" if where else ""
+        rows = self.execute_query(f"""
+            SELECT {key} AS id FROM {table}
+            WHERE {date_column} < %s {extra}
+            ORDER BY {key}
+            LIMIT %s
+        """, (cutoff, limit), fetch=True, primary=True) or []  # A lagging replica would return deleted ids again
+        return [r['id'] for r in rows]
+
+    def count_expired_rows(self, table, date_column, cutoff, where=""):
+        extra = f"AND {where}" if where else ""
+        result = self.execute_query(
+            f"SELECT COUNT(*) AS count FROM {table} WHERE {date_column} < %s {extra}",
+            (cutoff,), fetch=True
+        )
+        return result[0]['count'] if result else 0
+
+    def archive_rows(self, table, key, date_column, ids, archive=None, columns=None):
+        """
+        Summarize, copy to the archive table (if any) and delete the rows in
+        one transaction. Returns the number of rows, or None on failure.
+        """
+        if not ids:
+            return 0
+        placeholders = ", ".join(["%s"] * len(ids))
+        month = f"DATE_SUB(DATE({date_column}), INTERVAL DAYOFMONTH({date_column}) - 1 DAY)"
+        statements = [(f"""
+            INSERT INTO archive_summary (table_name, user_id, period, row_count)
+            SELECT * FROM (
+                SELECT %s AS table_name, user_id, {month} AS period, COUNT(*) AS archived
+                FROM {table} WHERE {key} IN ({placeholders})
+                GROUP BY user_id, period
+            ) AS batch
+            ON DUPLICATE KEY UPDATE row_count = archive_summary.row_count + batch.archived
+        """, [(table, *ids)])]
+        if archive:
+            column_list = ", ".join(columns)
+            statements.append((f"""
+                INSERT IGNORE INTO {archive} ({column_list})
+                SELECT {column_list} FROM {table} WHERE {key} IN ({placeholders})
+            """, [tuple(ids)]))
+        statements.append((f"DELETE FROM {table} WHERE {key} IN ({placeholders})", [tuple(ids)]))
+        if table == 'notifications':
+            ok = self._with_unread_decrement(f"{key} IN ({placeholders})", tuple(ids), statements)
+        else:
+            ok = self.execute_transaction(statements)
+        return len(ids) if ok else None
+
+    def purge_archive_rows(self, archive, date_column, cutoff, limit=1000):
+        return self.execute_many(
+            f"DELETE FROM {archive} WHERE {date_column} < %s ORDER BY {date_column} LIMIT %s",
+            [(cutoff, limit)]
+        ) or 0
+
+    def get_archive_summary(self, user_id):
+        """Archived row counts per table and month, newest first"""
+        return self.execute_query("""
+            SELECT table_name, period, row_count FROM archive_summary
+            WHERE user_id = %s
+            ORDER BY period DESC, table_name
+        """, (user_id,), fetch=True) or []
+
+    def get_partitions(self, table):
+        """[(name, upper bound date or None for MAXVALUE)], empty if the table is not partitioned"""
+        rows = self.execute_query("""
+            SELECT PARTITION_NAME AS name, PARTITION_DESCRIPTION AS bound
+            FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+            ORDER BY PARTITION_ORDINAL_POSITION
+        """, (table,), fetch=True, primary=True) or []
+        return [(r['name'], None if r['bound'] == 'MAXVALUE' else retention.from_days(int(r['bound'])))
+                for r in rows]
+
+    def partition_table(self, table, date_column, partitions):
+        return self.execute_query(
+            f"ALTER TABLE {table} PARTITION BY RANGE (TO_DAYS({date_column})) ({', '.join(partitions)})"
+        )
+
+    def reorganize_partition(self, table, partition, partitions):
+        """Split an (empty) partition, normally pmax, into the given ones"""
+        return self.execute_query(
+            f"ALTER TABLE {table} REORGANIZE PARTITION {partition} INTO ({', '.join(partitions)})"
+        )
+
+    def drop_partitions(self, table, names):
+        return self.execute_query(f"ALTER TABLE {table} DROP PARTITION {', '.join(names)}")
+
+    # ==================== OFFLINE QUEUE ====================
+    
+    def enable_offline_queue(self, path=None):
+        """Start acknowledging hot writes locally and syncing them in the background (desktop app only)"""
+        if self.write_queue is None:
+            self.write_queue = offline_queue.WriteQueue(path or OFFLINE['path'])
+            self.sync_worker = offline_queue.SyncWorker(
+                self, self.write_queue, OFFLINE['sync_interval'], OFFLINE['batch_size'],
+                OFFLINE['max_attempts'], OFFLINE['max_backoff'], on_failed=self._sync_failed)
+            self.sync_worker.start()
+            pending = self.write_queue.count()
+            if pending:
+                print(f"🔄 {pending} offline writes waiting to sync")
+        return self.write_queue
+    
+    def disable_offline_queue(self, timeout=5):
+        """Stop the sync worker; unsynced writes stay in the local file for next time"""
+        if self.write_queue is None:
+            return 0
+        worker, queue = self.sync_worker, self.write_queue
+        self.write_queue = self.sync_worker = None
+        worker.stop(timeout)
+        pending = queue.count()
+        queue.close()
+        return pending
+    
+    def replay_write(self, method, args, kwargs):
+        """
+        Run a queued write against MySQL (bypassing the queue). Raises
+        offline_queue.ConnectionLost when it failed because the link dropped,
+        so the worker backs off instead of counting an attempt.
+        """
+        _last_failure.transient = False
+        result = getattr(DatabaseManager, method).__wrapped__(self, *args, **kwargs)
+        if (result is None or result is False) and _last_failure.transient:
+            raise offline_queue.ConnectionLost(method)
+        return result
+    
+    def _sync_failed(self, entry, error):
+        user_id = entry['args'][0] if entry['args'] else None
+        bus.publish(event_bus.SYNC_FAILED, user_id, method=entry['method'], error=str(error))
+    
+    def get_failed_writes(self):
+        """Offline writes set aside after repeated SQL errors: (id, method, payload, attempts, last_error, created_at)"""
+        return self.write_queue.failed() if self.write_queue else []
+    
+    def retry_failed_writes(self):
+        if self.write_queue is None:
+            return 0
+        count = self.write_queue.retry_failed()
+        self.sync_worker.wake()
+        return count
+    
+    def ping(self):
+        connection = self.get_connection()
+        if not connection:
+            return False
+        connection.close()
+        return True
+    
     # ==================== UTILITY FUNCTIONS ====================
     
     def test_connection(self):
@@ -679,6 +1750,16 @@ class DatabaseManager:
             print(f"❌ Connection test failed: {e}")
             return False
     
+    def export_query_metrics(self, path):
+        """Write query metrics collected so far (.prom for Prometheus text, else JSON)"""
+        try:
+            metrics.export(path)
+            print(f"📊 Query metrics written to {path}")
+            return True
+        except OSError as e:
+            print(f"❌ Could not export query metrics: {e}")
+            return False
+    
     # ==================== REMINDERS ====================
 
     def add_reminder(self, user_id, message, reminder_time):
@@ -700,6 +1781,101 @@ class DatabaseManager:
         query = "UPDATE reminders SET status = 'sent' WHERE reminder_id = %s"
         return self.execute_query(query, (reminder_id,))
 
+    # ==================== SPACED REPETITION ====================
+
+    def add_review_topics(self, user_id, subject_id, topics_covered, studied_on):
+        """Create review cards for every topic in a session (existing cards keep their schedule)"""
+        topics = spaced_repetition.split_topics(topics_covered)
+        if not topics:
+            return 0
+        
+        next_due = spaced_repetition.first_due_date(studied_on)
+        query = """
+            INSERT IGNORE INTO topic_reviews
+            (user_id, subject_id, topic, topic_key, ease_factor, next_due)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """
+        rows = [
+            (user_id, subject_id, topic, spaced_repetition.topic_key(topic),
+             spaced_repetition.DEFAULT_EASE, next_due)
+            for topic in topics
+        ]
+        return self.execute_many(query, rows)
+
+    def get_review_queue(self, user_id, due_date=None, limit=50):
+        """Cards due on or before due_date (one range scan on idx_review_due)"""
+        due_date = due_date or date.today()
+        query = """
+            SELECT r.card_id, r.subject_id, r.topic, r.ease_factor, r.interval_days,
+                   r.repetitions, r.lapses, r.next_due, r.last_reviewed,
+                   sub.subject_name, sub.color_code
+            FROM topic_reviews r
+            LEFT JOIN subjects sub ON r.subject_id = sub.subject_id
+            WHERE r.user_id = %s AND r.next_due <= %s
+            ORDER BY r.next_due, r.card_id
+            LIMIT %s
+        """
+        return self.execute_query(query, (user_id, due_date, limit), fetch=True) or []
+
+    def count_due_reviews(self, user_id, due_date=None):
+        due_date = due_date or date.today()
+        query = """
+            SELECT COUNT(*) as count FROM topic_reviews
+            WHERE user_id = %s AND next_due <= %s
+        """
+        result = self.execute_query(query, (user_id, due_date), fetch=True)
+        return result[0]['count'] if result else 0
+
+    def record_review(self, card_id, grade, reviewed_on=None):
+        """Grade a review card (0-5 or 'again'/'hard'/'good'/'easy') and reschedule it"""
+        query = """
+            SELECT card_id, ease_factor, interval_days, repetitions, lapses
+            FROM topic_reviews WHERE card_id = %s
+        """
+        result = self.execute_query(query, (card_id,), fetch=True, primary=True)
+        if not result:
+            return None
+        
+        state = spaced_repetition.schedule_review(result[0], grade, reviewed_on)
+        update = """
+            UPDATE topic_reviews
+            SET ease_factor = %s, interval_days = %s, repetitions = %s,
+                lapses = %s, last_reviewed = %s, next_due = %s
+            WHERE card_id = %s
+        """
+        self.execute_query(update, (state['ease_factor'], state['interval_days'],
+                                    state['repetitions'], state['lapses'],
+                                    state['last_reviewed'], state['next_due'], card_id))
+        return state
+
+    def delete_review_card(self, card_id):
+        query = "DELETE FROM topic_reviews WHERE card_id = %s"
+        return self.execute_query(query, (card_id,))
+
+    def enqueue_review_reminders(self, user_id, reminder_time=None):
+        """Add today's review queue as a single reminder (once per day, enforced by the dedup key)"""
+        today = date.today()
+        existing = self.execute_query("""
+            SELECT 1 FROM reminders
+            WHERE user_id = %s AND reminder_type = 'review' AND dedup_date = %s
+        """, (user_id, today), fetch=True)
+        if existing:
+            return None
+        
+        cards = self.get_review_queue(user_id, today, limit=3)
+        if not cards:
+            return None
+        
+        message = spaced_repetition.build_review_message(
+            cards, self.count_due_reviews(user_id, today)
+        )
+        # A concurrent caller that got here first wins; this insert is then ignored
+        query = """
+            INSERT IGNORE INTO reminders (user_id, message, reminder_time, reminder_type, dedup_date)
+            VALUES (%s, %s, %s, 'review', %s)
+        """
+        return self.execute_query(query, (user_id, message, reminder_time or datetime.now(), today)) or None
+
     # ==================== SOCIAL / LEADERBOARD ====================
 
     def get_leaderboard(self, limit=10):
@@ -718,57 +1894,132 @@ class DatabaseManager:
 
     def check_and_generate_social_notification(self, user_id):
         """Generate a motivational notification based on leaderboard stats"""
-        # 1. Check if we already sent one recently (e.g., today)
-        query_check = """
-            SELECT COUNT(*) as count FROM notifications 
-            WHERE user_id = %s 
-            AND notification_type = 'social' 
-            AND created_at >= CURDATE()
+        return self.generate_social_nudges([user_id])
+    
+    def generate_social_nudges(self, user_ids=None, now=None):
         """
-        result = self.execute_query(query_check, (user_id,), fetch=True)
-        if result and result[0]['count'] > 0:
-            return # Already sent one today
-
-        # 2. Get Top Student Stats
-        leaders = self.get_leaderboard(limit=1)
-        if not leaders:
-            return
-
-        top_student = leaders[0]
-        if top_student['username'] == self.get_user_by_id(user_id)['username']:
-             return # You are the top student!
-
-        # 3. Create Message
-        top_name = top_student['full_name'].split()[0] # First name
-        top_minutes = int(top_student['total_minutes'])
-        
-        msg = f"🔥 {top_name} has studied for {top_minutes} mins today! Catch up!"
-        
-        # 4. Insert as immediate system notification/reminder
-        # We insert into 'reminders' so it triggers a toast, OR notifications table?
-        # The user requested an "alert", so reminder table is best for immediate toast.
-        
-        self.add_reminder(user_id, msg, datetime.now() + timedelta(seconds=10))
-        
-        # Log it in notifications table too for history
-        self.add_notification(user_id, 'social', msg, 'high')
+        Send every user (except the leader) a "catch up with the top student"
+        nudge, at most once per day. The leaderboard is aggregated once inside
+        the INSERT ... SELECT instead of once per user. Returns the number sent.
+        """
+        now = now or datetime.now()
+        today = now.date()
+        user_filter, user_params = _user_filter("u.user_id", user_ids)
+        created = self.execute_many(f"""
+            INSERT INTO notifications (user_id, notification_type, message, priority, dedup_date)
+            SELECT u.user_id, 'social',
+                   CONCAT('🔥 ', top.first_name, ' has studied for ', top.total_minutes, ' mins today! Catch up!'),
+                   'high', %s
+            FROM users u
+            CROSS JOIN (
+                SELECT s.user_id, SUBSTRING_INDEX(leader.full_name, ' ', 1) AS first_name,
+                       SUM(s.duration_minutes) AS total_minutes
+                FROM study_sessions s
+                JOIN users leader ON leader.user_id = s.user_id
+                GROUP BY s.user_id, leader.full_name
+                ORDER BY total_minutes DESC
+                LIMIT 1
+            ) top
+            WHERE u.user_id <> top.user_id {user_filter}
+            ON DUPLICATE KEY UPDATE notification_id = notification_id
+        """, [(today,) + user_params]) or 0
+        if created:
+            self._count_new_notifications('social', today, user_ids)
+            bus.publish(event_bus.NOTIFICATION_ADDED, user_ids[0] if user_ids and len(user_ids) == 1 else None,
+                        notification_type='social', count=created)
+            # Toast shortly after, like the per-user version did
+            self._remind_from_notifications('social', today, now + timedelta(seconds=10), user_ids)
+        return created
+    
+    def _count_new_notifications(self, notification_type, day, user_ids=None):
+        """Bring the unread counters of today's recipients of a bulk notification up to date"""
+        user_filter, user_params = _user_filter("u.user_id", user_ids)
+        return self._fix_unread_counts(f"""
+            u.user_id IN (SELECT user_id FROM notifications
+                          WHERE notification_type = %s AND dedup_date = %s) {user_filter}
+        """, (notification_type, day) + user_params)
+    
+    def _remind_from_notifications(self, notification_type, day, reminder_time, user_ids=None):
+        """Queue a toast reminder for each of today's notifications of one type"""
+        user_filter, user_params = _user_filter("user_id", user_ids)
+        return self.execute_many(f"""
+            INSERT INTO reminders (user_id, message, reminder_time, reminder_type, dedup_date)
+            SELECT user_id, message, %s, notification_type, dedup_date
+            FROM notifications
+            WHERE dedup_date = %s AND notification_type = %s {user_filter}
+            ON DUPLICATE KEY UPDATE reminder_id = reminder_id
+        """, [(reminder_time, day, notification_type) + user_params])
 
     # ==================== GLOBAL SEARCH ====================
 
-    def search_everything(self, user_id, search_term):
-        results = {}
-        search_term = f"%{search_term}%"
+    def search_everything(self, user_id, search_term, limit=20, offset=0):
+        """Search every source; each category is ranked and paginated independently"""
+        return {
+            category: self.search_category(user_id, category, search_term, limit, offset)
+            for category in search_index.SEARCH_ORDER
+        }
 
-        query_sub = "SELECT * FROM subjects WHERE user_id = %s AND subject_name LIKE %s"
-        results['subjects'] = self.execute_query(query_sub, (user_id, search_term), fetch=True)
+    def search_category(self, user_id, category, search_term, limit=20, offset=0):
+        """
+        Ranked FULLTEXT search over one category ('subjects', 'notes',
+        'sessions', 'plans' or 'chat'). Each row gets 'score', 'snippet'
+        and 'highlights' (match offsets inside the snippet).
+        """
+        if category == 'subjects':
+            # Subjects are a handful of short names per user; a LIKE scan is fine
+            query = """
+                SELECT * FROM subjects
+                WHERE user_id = %s AND subject_name LIKE %s
+                ORDER BY subject_name
+                LIMIT %s OFFSET %s
+            """
+            rows = self.execute_query(query, (user_id, f"%{search_term}%", limit, offset), fetch=True) or []
+            for row in rows:
+                row['snippet'], row['highlights'] = search_index.highlight(row['subject_name'], search_term)
+            return rows
 
-        query_notes = "SELECT * FROM quick_notes WHERE user_id = %s AND (note_title LIKE %s OR note_content LIKE %s)"
-        results['notes'] = self.execute_query(query_notes, (user_id, search_term, search_term), fetch=True)
+        source = search_index.SEARCH_SOURCES[category]
+        alias = source['alias']
+        boolean_query = search_index.build_boolean_query(search_term)
 
-        query_chat = "SELECT * FROM chat_history WHERE user_id = %s AND (message LIKE %s OR response LIKE %s)"
-        results['chat'] = self.execute_query(query_chat, (user_id, search_term, search_term), fetch=True)
+        if boolean_query:
+            match = search_index.fulltext_clause(source)
+            query = (
+                source['select'].format(score=f", {match} AS score")
+                + f" WHERE {alias}.user_id = %s AND {match}"
+                + f" ORDER BY score DESC, {alias}.{source['id_column']} DESC"
+                + " LIMIT %s OFFSET %s"
+            )
+            params = (boolean_query, user_id, boolean_query, limit, offset)
+        else:
+            # Term too short for the FULLTEXT index
+            like = f"%{search_term}%"
+            query = (
+                source['select'].format(score=", 0 AS score")
+                + f" WHERE {alias}.user_id = %s AND {search_index.like_clause(source)}"
+                + f" ORDER BY {alias}.{source['id_column']} DESC"
+                + " LIMIT %s OFFSET %s"
+            )
+            params = (user_id, *([like] * len(source['columns'])), limit, offset)
 
-        return results
+        rows = self.execute_query(query, params, fetch=True) or []
+        for row in rows:
+            text = " ".join(str(row.get(c) or '') for c in source['columns'])
+            row['snippet'], row['highlights'] = search_index.highlight(text, search_term)
+        return rows
+
+    def get_search_vocabulary(self, user_id, limit=20000):
+        """Short texts (subject names, note titles, topics) for search suggestions"""
+        query = """
+            SELECT subject_name AS text FROM subjects WHERE user_id = %s
+            UNION ALL
+            SELECT note_title FROM quick_notes WHERE user_id = %s AND note_title IS NOT NULL
+            UNION ALL
+            SELECT topic FROM topic_reviews WHERE user_id = %s
+            LIMIT %s
+        """
+        rows = self.execute_query(query, (user_id, user_id, user_id, limit), fetch=True) or []
+        return [r['text'] for r in rows]
 
     # ==================== ACCOUNT MANAGEMENT ====================
 
@@ -790,8 +2041,10 @@ class DatabaseManager:
         return self.execute_query(query, (password_hash, user_id))
 
     def delete_user_account(self, user_id):
-        query = "DELETE FROM users WHERE user_id = %s"
-        return self.execute_query(query, (user_id,))
+        # Archive tables have no foreign keys, so they are not cascaded
+        statements = [(f"DELETE FROM {archive} WHERE user_id = %s", [(user_id,)]) for archive in retention.ARCHIVES]
+        statements.append(("DELETE FROM users WHERE user_id = %s", [(user_id,)]))
+        return self.execute_transaction(statements)
 
     # ==================== AI CONTEXT ====================
 
@@ -813,33 +2066,18 @@ class DatabaseManager:
         ]
         
         # 3. Study Stats
-        sessions = self.get_user_sessions(user_id) or []
-        total_mins = sum(s['duration_minutes'] for s in sessions)
-        context['total_hours'] = round(total_mins / 60, 1)
-        context['total_sessions'] = len(sessions)
+        frame = self.get_session_frame(user_id)
+        context['total_hours'] = round(frame.total() / 60, 1)
+        context['total_sessions'] = len(frame)
         
         # Recent activity (Last 7 days)
-        # We can calculate this from sessions list easily in python
-        from datetime import datetime, timedelta
         one_week_ago = datetime.now().date() - timedelta(days=7)
-        recent_mins = sum(
-            s['duration_minutes'] for s in sessions 
-            if isinstance(s['session_date'], str) or s['session_date'] >= one_week_ago
-        )
-        context['recent_hours'] = round(recent_mins / 60, 1)
+        context['recent_hours'] = round(frame.total(one_week_ago) / 60, 1)
         
         # 4. Weak/Strong Areas
-        if sessions:
-            subject_time = {}
-            for s in sessions:
-                name = s['subject_name']
-                subject_time[name] = subject_time.get(name, 0) + s['duration_minutes']
-            
-            context['strongest_subject'] = max(subject_time, key=subject_time.get)
-            context['weakest_subject'] = min(subject_time, key=subject_time.get)
-        else:
-            context['strongest_subject'] = "None yet"
-            context['weakest_subject'] = "None yet"
+        strongest, weakest = frame.strongest_weakest()
+        context['strongest_subject'] = strongest or "None yet"
+        context['weakest_subject'] = weakest or "None yet"
             
         # 5. Goals
         goals = self.get_user_goals(user_id) or []
@@ -852,8 +2090,25 @@ class DatabaseManager:
         return context
 
 
-# Create a global database instance
-db = DatabaseManager()
+# Global database instance - connects and migrates on first use, not on import
+db = LazySingleton(DatabaseManager, "db")
+
+
+def get_db():
+    """The shared DatabaseManager, created on first call (thread-safe)"""
+    return db.get()
+
+def init_db():
+    """Connect and run schema checks now instead of on first query"""
+    return db.init()
+
+def set_db(instance):
+    """Inject an alternative DatabaseManager (tests, tooling, bench databases)"""
+    db.set(instance)
+
+def close_db():
+    """Drop the shared instance; the next use creates a fresh one"""
+    db.close()
 
 
 # ==================== TEST FUNCTIONS ====================
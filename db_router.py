@@ -0,0 +1,110 @@
+"""
+DB Router - Read/write split across the primary and read replicas
+Writes always go to the primary (DB_CONFIG). fetch=True queries go to the
+configured replicas in turn, except for a few seconds after this process
+wrote something: the desktop app serves one user, so sticking to the
+primary then gives that user read-your-writes despite replication lag.
+The sticky window is never shorter than the largest lag a replica may
+have and still take reads.
+A replica that refuses connections, stops replicating or falls too far
+behind is skipped for a while and reads fail over to the next one, with
+the primary as the last resort.
+"""
+
+import threading
+import time
+
+from config import DB_CONFIG, DB_REPLICAS
+
+
+def lag_seconds(status):
+    """Replication lag from a SHOW REPLICA/SLAVE STATUS row; None if replication is not running"""
+    if not status:
+        return None
+    for key in ('Seconds_Behind_Source', 'Seconds_Behind_Master'):
+        if key in status:
+            return status[key]
+    return None
+
+
+class ReplicaRouter:
+    def __init__(self, primary, replicas=(), sticky_seconds=30, retry_after=30,
+                 max_lag_seconds=30, health_interval=30, clock=time.monotonic):
+        self.primary = primary
+        self._overrides = [dict(replica) for replica in replicas]
+        # A replica up to max_lag_seconds behind may not have our write yet
+        self.sticky_seconds = max(sticky_seconds, max_lag_seconds)
+        self.retry_after = retry_after
+        self.max_lag_seconds = max_lag_seconds
+        self.health_interval = health_interval
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._down_until = [0.0] * len(self._overrides)
+        self._next = 0
+        self._last_write = None
+        self._next_health_check = 0.0
+
+    @property
+    def replicas(self):
+        """Connection configs; replicas inherit credentials and database from the primary"""
+        return [{**self.primary, 'connection_timeout': 3, **replica} for replica in self._overrides]
+
+    def note_write(self):
+        self._last_write = self.clock()
+
+    def sticky(self):
+        return self._last_write is not None and self.clock() - self._last_write < self.sticky_seconds
+
+    def candidates(self, read=False):
+        """Connection configs to try in order: healthy replicas round-robin, then the primary"""
+        if not read or not self._overrides or self.sticky():
+            return [self.primary]
+        now = self.clock()
+        replicas = self.replicas
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % len(replicas)
+        order = [(start + k) % len(replicas) for k in range(len(replicas))]
+        return [replicas[i] for i in order if self._down_until[i] <= now] + [self.primary]
+
+    def mark_down(self, config, seconds=None):
+        replicas = self.replicas
+        if config in replicas:
+            self._down_until[replicas.index(config)] = self.clock() + (seconds or self.retry_after)
+
+    def mark_up(self, config):
+        replicas = self.replicas
+        if config in replicas:
+            self._down_until[replicas.index(config)] = 0.0
+
+    def record_lag(self, config, lag):
+        """Skip a replica that is not replicating or too far behind until the next check"""
+        if lag is None or lag > self.max_lag_seconds:
+            self.mark_down(config, self.health_interval)
+        else:
+            self.mark_up(config)
+
+    def health_due(self):
+        """True once per health_interval (claims the check for the caller)"""
+        if not self._overrides:
+            return False
+        now = self.clock()
+        with self._lock:
+            if now < self._next_health_check:
+                return False
+            self._next_health_check = now + self.health_interval
+            return True
+
+    def status(self):
+        now = self.clock()
+        return [{'host': r.get('host'), 'port': r.get('port'), 'healthy': self._down_until[i] <= now}
+                for i, r in enumerate(self.replicas)]
+
+
+router = ReplicaRouter(
+    DB_CONFIG, DB_REPLICAS.get('hosts', ()),
+    sticky_seconds=DB_REPLICAS.get('sticky_seconds', 30),
+    retry_after=DB_REPLICAS.get('retry_after', 30),
+    max_lag_seconds=DB_REPLICAS.get('max_lag_seconds', 30),
+    health_interval=DB_REPLICAS.get('health_interval', 30),
+)
@@ -118,7 +118,7 @@ class EnhancedHomeView:
         ).pack(side="left", padx=(0, 12), pady=10)
         
         # Notification button with badge
-        self.create_icon_with_badge(right, "🔔", 3)
+        self.create_icon_with_badge(right, "🔔", db.count_unread_notifications(self.user_id))
         
         # Settings button
         self.create_hover_button(right, "⚙️")
@@ -0,0 +1,138 @@
+"""
+Event Bus - In-process publish/subscribe for data changes
+DatabaseManager write methods publish typed events (session_added,
+notification_added, ...) and widgets subscribe to the types they display.
+Once attached to the Tk root, events from any thread are queued and
+delivered on the Tk thread in coalesced batches: each subscriber is called
+at most once per flush with every matching event since the last one, so a
+burst of writes causes a single refresh.
+"""
+
+import threading
+
+# Event types
+SESSION_ADDED = 'session_added'
+SESSION_DELETED = 'session_deleted'
+SUBJECT_CHANGED = 'subject_changed'       # Added, renamed/recolored or deleted
+GOAL_CHANGED = 'goal_changed'
+NOTIFICATION_ADDED = 'notification_added'
+NOTIFICATION_READ = 'notification_read'
+NOTIFICATION_DELETED = 'notification_deleted'
+PET_CHANGED = 'pet_changed'
+MOOD_ADDED = 'mood_added'
+DATA_IMPORTED = 'data_imported'
+SYNC_FAILED = 'sync_failed'            # An offline write was set aside
+
+SESSION_EVENTS = (SESSION_ADDED, SESSION_DELETED, DATA_IMPORTED)
+NOTIFICATION_EVENTS = (NOTIFICATION_ADDED, NOTIFICATION_READ, NOTIFICATION_DELETED)
+USER_DATA_EVENTS = SESSION_EVENTS + (SUBJECT_CHANGED, GOAL_CHANGED)
+
+FLUSH_MS = 50
+
+
+class Subscription:
+    def __init__(self, types, callback, widget=None, user_id=None):
+        self.types = frozenset(types)
+        self.callback = callback
+        self.widget = widget
+        self.user_id = user_id
+
+    def matches(self, event):
+        # Events without a user_id (e.g. "notification 12 read") may concern anyone
+        return event['type'] in self.types and (
+            self.user_id is None or event.get('user_id') in (None, self.user_id))
+
+    @property
+    def alive(self):
+        if self.widget is None:
+            return True
+        try:
+            return bool(self.widget.winfo_exists())
+        except Exception:
+            return False
+
+
+class EventBus:
+    """Thread-safe publish; delivery on the Tk thread once attach(root) was called"""
+
+    def __init__(self, flush_ms=FLUSH_MS):
+        self.flush_ms = flush_ms
+        self._subscriptions = []
+        self._pending = []
+        self._lock = threading.Lock()
+        self._root = None
+        self._scheduled = False
+
+    def attach(self, root):
+        """Deliver on root's thread from now on"""
+        with self._lock:
+            self._root = root
+            self._scheduled = False
+
+    def detach(self, root=None):
+        with self._lock:
+            if root is None or root is self._root:
+                self._root = None
+                self._pending = []
+                self._scheduled = False
+
+    def subscribe(self, types, callback, widget=None, user_id=None):
+        """
+        callback(events) receives the batch of matching events. With a widget,
+        the subscription ends when the widget is destroyed.
+        """
+        if isinstance(types, str):
+            types = (types,)
+        subscription = Subscription(types, callback, widget, user_id)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def publish(self, event_type, user_id=None, **data):
+        if not self._subscriptions:
+            return  # Headless runs (batch jobs, scripts) pay nothing
+        event = dict(data, type=event_type, user_id=user_id)
+        with self._lock:
+            root = self._root
+            if root is not None:
+                self._pending.append(event)
+                if self._scheduled:
+                    return
+                self._scheduled = True
+        if root is None:
+            self._deliver([event])
+            return
+        try:
+            root.after(self.flush_ms, self.flush)
+        except Exception:
+            self.detach(root)  # Window closed
+
+    def flush(self):
+        with self._lock:
+            events, self._pending = self._pending, []
+            self._scheduled = False
+        if events:
+            self._deliver(events)
+
+    def _deliver(self, events):
+        with self._lock:
+            dead = [s for s in self._subscriptions if not s.alive]
+            for s in dead:
+                self._subscriptions.remove(s)
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            matching = [e for e in events if subscription.matches(e)]
+            if not matching:
+                continue
+            try:
+                subscription.callback(matching)
+            except Exception as e:
+                print(f"⚠️ Event handler error ({matching[0]['type']}): {e}")
+
+
+bus = EventBus()
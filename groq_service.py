@@ -3,28 +3,47 @@ Groq AI Service - Fast & Powerful AI Assistant
 Handles chatbot, study plan generation, and AI assistance
 """
 
-from groq import Groq
 from config import GROQ_API_KEY, GROQ_MODEL
 import json
+import threading
+from lazy_singleton import LazySingleton
+import study_forecast
 
 
 class GroqAIService:
     """Groq AI service for study assistance"""
     
     def __init__(self):
-        """Initialize Groq client"""
+        """Read settings; the Groq client itself is created on first request"""
         self.api_key = GROQ_API_KEY
         self.model = GROQ_MODEL
-        
-        if self.api_key and self.api_key != 'your_groq_api_key_here':
+        self._client = None
+        self._client_lock = threading.Lock()
+        self.is_available = bool(self.api_key and self.api_key != 'your_groq_api_key_here')
+    
+    @property
+    def client(self):
+        """Import groq and build the client lazily (keeps it out of app startup)"""
+        if self._client is None and self.is_available:
+            with self._client_lock:
+                if self._client is None:
+                    try:
+                        from groq import Groq
+                        self._client = Groq(api_key=self.api_key)
+                    except Exception as e:
+                        print(f"Groq initialization error: {e}")
+                        self.is_available = False
+        return self._client
+    
+    def close(self):
+        """Close the HTTP client if one was created"""
+        with self._client_lock:
+            client, self._client = self._client, None
+        if client is not None and hasattr(client, 'close'):
             try:
-                self.client = Groq(api_key=self.api_key)
-                self.is_available = True
+                client.close()
             except Exception as e:
-                print(f"Groq initialization error: {e}")
-                self.is_available = False
-        else:
-            self.is_available = False
+                print(f"Groq close error: {e}")
     
     def chat(self, messages, temperature=0.7, max_tokens=1024):
         """
@@ -38,7 +57,7 @@ class GroqAIService:
         Returns:
             AI response text or error message
         """
-        if not self.is_available:
+        if not self.is_available or self.client is None:
             return self._get_fallback_response()
         
         try:
@@ -211,19 +230,31 @@ Format clearly with numbering."""
         
         return self.chat(messages, temperature=0.8, max_tokens=2000)
     
-    def analyze_study_progress(self, study_data):
+    def analyze_study_progress(self, study_data, forecast=None):
         """
         Analyze study progress and provide recommendations
         
         Args:
             study_data: Dict with study statistics
+            forecast: Optional report from db.get_study_forecast(); routine
+                weeks are answered locally without an API call
         
         Returns:
             Analysis and recommendations
         """
+        if forecast and (forecast.get('routine') or not self.is_available):
+            return study_forecast.format_analysis(forecast)
         if not self.is_available:
             return self._get_fallback_analysis()
         
+        forecast_lines = ""
+        if forecast:
+            risks = ", ".join(f"{r['subject_name']} (due in {r['days_left']} days)" for r in forecast['at_risk'])
+            forecast_lines = f"""
+- Productivity score (vs. own baseline): {forecast['productivity_score']}/100
+- Forecast next week: {forecast['next_week_minutes'] / 60:.1f} hours
+- At-risk subjects: {risks or 'none'}"""
+        
         prompt = f"""Analyze this student's study progress and provide personalized recommendations:
 
 **Study Statistics:**
@@ -231,7 +262,7 @@ Format clearly with numbering."""
 - Number of sessions: {study_data.get('sessions', 0)}
 - Subjects studied: {', '.join(study_data.get('subjects', []))}
 - Current streak: {study_data.get('streak', 0)} days
-- Average session length: {study_data.get('avg_session', 0)} minutes
+- Average session length: {study_data.get('avg_session', 0)} minutes{forecast_lines}
 
 Provide:
 1. Progress assessment
@@ -418,5 +449,16 @@ Good work! Keep it up!
 Configure Groq API for detailed AI-powered summaries."""
 
 
-# Create global instance
-groq_ai = GroqAIService()
\ No newline at end of file
+# Global instance - built on first use
+groq_ai = LazySingleton(GroqAIService, "groq_ai")
+
+
+def get_groq_ai():
+    return groq_ai.get()
+
+def set_groq_ai(instance):
+    """Inject an alternative AI service (tests, offline mode)"""
+    groq_ai.set(instance)
+
+def close_groq_ai():
+    groq_ai.close()
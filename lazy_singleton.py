@@ -0,0 +1,63 @@
+"""
+Lazy Singleton - Deferred, thread-safe construction of shared services
+Modules keep doing `from database import db`; the real DatabaseManager
+(or GroqAIService) is only built on first attribute access.
+"""
+
+import threading
+
+
+class LazySingleton:
+    """
+    Proxy that builds its instance on first use.
+
+    get()    -> the instance, creating it if needed
+    init()   -> create now (e.g. on a background thread)
+    set(obj) -> inject an alternative instance (tests, tooling)
+    close()  -> close and forget the instance; next use creates a new one
+    """
+
+    def __init__(self, factory, name):
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_instance', None)
+        object.__setattr__(self, '_lock', threading.RLock())
+
+    def get(self):
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                instance = self._instance
+                if instance is None:
+                    instance = self._factory()
+                    object.__setattr__(self, '_instance', instance)
+        return instance
+
+    def init(self):
+        return self.get()
+
+    def set(self, instance):
+        """Replace the instance; every module holding the proxy sees it"""
+        with self._lock:
+            object.__setattr__(self, '_instance', instance)
+
+    def close(self):
+        with self._lock:
+            instance = self._instance
+            object.__setattr__(self, '_instance', None)
+        if instance is not None and hasattr(instance, 'close'):
+            instance.close()
+
+    @property
+    def is_initialized(self):
+        return self._instance is not None
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.get(), name, value)
+
+    def __repr__(self):
+        state = "initialized" if self.is_initialized else "not initialized"
+        return f"<LazySingleton {self._name} ({state})>"
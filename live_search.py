@@ -0,0 +1,196 @@
+"""
+Live Search - Search-as-you-type support
+Debounced queries, cancellation of stale searches, per-category result
+streaming and an in-memory prefix index for suggestions.
+"""
+
+import bisect
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from search_index import SEARCH_ORDER, tokenize
+
+DEBOUNCE_MS = 250
+MIN_QUERY_LENGTH = 2
+INDEX_TTL_SECONDS = 300
+
+_WORD = re.compile(r'\w{3,}', re.UNICODE)
+
+
+class PrefixIndex:
+    """Sorted vocabulary of a user's subject names, note titles and topics"""
+
+    def __init__(self, texts=()):
+        self.built_at = 0
+        self._data = ([], [])
+        if texts:
+            self.rebuild(texts)
+
+    def rebuild(self, texts):
+        """Index whole phrases and the individual words inside them"""
+        weights = {}
+        display = {}
+        for text in texts:
+            text = " ".join(str(text or '').split())
+            if not text:
+                continue
+            for term in [text] + _WORD.findall(text):
+                key = term.lower()
+                weights[key] = weights.get(key, 0) + 1
+                # Keep the first casing we saw for display
+                display.setdefault(key, term)
+
+        keys = sorted(weights)
+        # Swap in one assignment so readers never see a half-built index
+        self._data = (keys, [(display[k], weights[k]) for k in keys])
+        self.built_at = time.time()
+
+    def suggest(self, prefix, limit=5):
+        """Most frequent indexed terms starting with prefix (binary search, no scan)"""
+        prefix = " ".join(prefix.split()).lower()
+        if not prefix:
+            return []
+        keys, entries = self._data
+        lo = bisect.bisect_left(keys, prefix)
+        hi = bisect.bisect_left(keys, prefix + "\uffff")
+        matches = entries[lo:min(hi, lo + 500)]
+        matches.sort(key=lambda e: (-e[1], len(e[0])))
+        return [text for text, _ in matches if text.lower() != prefix][:limit]
+
+    @property
+    def is_stale(self):
+        return time.time() - self.built_at > INDEX_TTL_SECONDS
+
+    def __len__(self):
+        return len(self._data[0])
+
+
+class LiveSearch:
+    """
+    Runs searches off the Tk thread and streams each category back as it completes.
+
+    Every new query bumps a generation counter; results belonging to an older
+    generation are dropped, and category queries that have not started yet
+    are cancelled.
+    """
+
+    def __init__(self, widget, db, user_id, max_workers=3):
+        self.widget = widget
+        self.db = db
+        self.user_id = user_id
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search")
+        self.index = PrefixIndex()
+        self._generation = 0
+        self._futures = []
+        self._debounce_id = None
+        self._index_lock = threading.Lock()
+        self._index_loading = False
+
+    # ---------- Debounce ----------
+
+    def schedule(self, term, callback, delay=DEBOUNCE_MS):
+        """Call callback(term) once typing pauses for `delay` ms"""
+        if self._debounce_id is not None:
+            self.widget.after_cancel(self._debounce_id)
+        self._debounce_id = self.widget.after(delay, lambda: self._fire(term, callback))
+
+    def _fire(self, term, callback):
+        self._debounce_id = None
+        callback(term)
+
+    # ---------- Search ----------
+
+    def search(self, term, on_category, on_done=None, limit=20):
+        """
+        Search every category in parallel.
+
+        on_category(category, rows) and on_done() are called on the Tk thread,
+        only if this search is still the latest one.
+        """
+        self.cancel()
+        generation = self._generation
+        pending = {'count': len(SEARCH_ORDER)}
+
+        def deliver(category, rows):
+            if generation != self._generation:
+                return
+            on_category(category, rows)
+            pending['count'] -= 1
+            if pending['count'] == 0 and on_done:
+                on_done()
+
+        def run(category):
+            if generation != self._generation:
+                return
+            try:
+                rows = self.db.search_category(self.user_id, category, term, limit=limit)
+            except Exception as e:
+                print(f"Search error ({category}): {e}")
+                rows = []
+            if generation == self._generation:
+                self._post(lambda: deliver(category, rows))
+
+        self._futures = [self.executor.submit(run, c) for c in SEARCH_ORDER]
+        return generation
+
+    def cancel(self):
+        """Invalidate the in-flight search and drop queued category queries"""
+        self._generation += 1
+        for future in self._futures:
+            future.cancel()
+        self._futures = []
+
+    def is_current(self, generation):
+        return generation == self._generation
+
+    # ---------- Suggestions ----------
+
+    def suggest(self, term, limit=5):
+        """Prefix suggestions for the last word (or whole phrase) being typed"""
+        self.ensure_index()
+        suggestions = self.index.suggest(term, limit)
+        tokens = tokenize(term)
+        if len(suggestions) < limit and len(tokens) > 1:
+            head = term[:term.lower().rfind(tokens[-1])]
+            for word in self.index.suggest(tokens[-1], limit):
+                candidate = head + word
+                if candidate not in suggestions:
+                    suggestions.append(candidate)
+        return suggestions[:limit]
+
+    def ensure_index(self):
+        """(Re)build the prefix index in the background when missing or stale"""
+        with self._index_lock:
+            if self._index_loading or not self.index.is_stale:
+                return
+            self._index_loading = True
+
+        def load():
+            try:
+                texts = self.db.get_search_vocabulary(self.user_id)
+                self.index.rebuild(texts)
+            except Exception as e:
+                print(f"Search index error: {e}")
+            finally:
+                self._index_loading = False
+
+        self.executor.submit(load)
+
+    # ---------- Lifecycle ----------
+
+    def shutdown(self):
+        self.cancel()
+        if self._debounce_id is not None:
+            try:
+                self.widget.after_cancel(self._debounce_id)
+            except Exception:
+                pass
+        self.executor.shutdown(wait=False)
+
+    def _post(self, fn):
+        """Run fn on the Tk thread"""
+        try:
+            self.widget.after(0, fn)
+        except Exception:
+            pass  # Window was closed
@@ -0,0 +1,296 @@
+"""
+Load Driver - Simulates many concurrent students against MySQL (no Tk)
+
+Each simulated student runs the same DatabaseManager call sequence the app does:
+login -> update_login_streak -> dashboard snapshot -> add session -> chat -> notifications poll
+
+Usage:
+    python benchmark.py --scale 10k --seed-data --iterations 1          # seed once
+    python load_test.py --scale 10k --students 50 --duration 120 --think 2.0
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+from datetime import date, datetime
+
+from benchmark import connect_bench_database, dashboard_snapshot, percentile
+from query_metrics import metrics
+from synthetic_data import PASSWORD, SCALES, SyntheticDataGenerator
+import config
+
+DEFAULT_STUDENTS = 20
+DEFAULT_DURATION = 60
+DEFAULT_THINK = 1.0
+
+
+class LatencyHistogram:
+    """Thread-safe latency recorder with power-of-two millisecond buckets"""
+
+    def __init__(self):
+        self.samples = []
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def record(self, ms, error=False):
+        with self._lock:
+            self.samples.append(ms)
+            if error:
+                self.errors += 1
+
+    def summary(self):
+        with self._lock:
+            samples = list(self.samples)
+            errors = self.errors
+        return {
+            'count': len(samples),
+            'errors': errors,
+            'p50': percentile(samples, 50),
+            'p95': percentile(samples, 95),
+            'p99': percentile(samples, 99),
+            'max': max(samples) if samples else 0.0,
+        }
+
+    def buckets(self):
+        """{upper bound ms: count} using 1, 2, 4, 8 ... ms buckets"""
+        counts = {}
+        with self._lock:
+            for ms in self.samples:
+                bound = 2 ** max(0, math.ceil(math.log2(ms))) if ms > 1 else 1
+                counts[bound] = counts.get(bound, 0) + 1
+        return dict(sorted(counts.items()))
+
+    def render(self, width=40):
+        buckets = self.buckets()
+        if not buckets:
+            return "  (no samples)"
+        peak = max(buckets.values())
+        lines = []
+        for bound, count in buckets.items():
+            bar = "█" * max(1, round(count / peak * width))
+            lines.append(f"  ≤{bound:>6} ms {count:>7}  {bar}")
+        return "\n".join(lines)
+
+
+class TimedDB:
+    """Wraps a DatabaseManager and records the latency of every public call"""
+
+    def __init__(self, db):
+        self._db = db
+        self.calls = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        attr = getattr(self._db, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+        with self._lock:
+            histogram = self.calls.setdefault(name, LatencyHistogram())
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = attr(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                histogram.record((time.perf_counter() - start) * 1000, failed)
+        return timed
+
+
+class StudentSimulator:
+    """One simulated student: logs in and walks through a typical visit"""
+
+    def __init__(self, db, user, generator, think_time, steps):
+        self.db = db
+        self.user = user
+        self.gen = generator
+        self.think_time = think_time
+        self.steps = steps
+        self.user_id = None
+        self.subjects = []
+
+    def think(self, stop):
+        if self.think_time > 0:
+            stop.wait(self.gen.rng.expovariate(1 / self.think_time))
+
+    def run_visit(self, stop):
+        for name, step in (('login', self.login),
+                           ('update_login_streak', self.login_streak),
+                           ('dashboard', self.dashboard),
+                           ('add_session', self.add_session),
+                           ('chat', self.chat),
+                           ('notifications_poll', self.poll_notifications)):
+            if stop.is_set():
+                return False
+            start = time.perf_counter()
+            failed = True
+            try:
+                failed = step() is False
+            except Exception as e:
+                print(f"⚠️ {name} failed for {self.user['username']}: {e}")
+            finally:
+                self.steps[name].record((time.perf_counter() - start) * 1000, failed)
+            if failed and name == 'login':
+                return False
+            self.think(stop)
+        return True
+
+    def login(self):
+        user = self.db.verify_user(self.user['username'], PASSWORD)
+        if not user:
+            return False
+        self.user_id = user['user_id']
+
+    def login_streak(self):
+        self.db.update_login_streak(self.user_id)
+
+    def dashboard(self):
+        snapshot = dashboard_snapshot(self.db, self.user_id)
+        self.subjects = snapshot['subjects'] or []
+
+    def add_session(self):
+        if not self.subjects:
+            return
+        subject = self.gen.rng.choice(self.subjects)
+        s = self.gen.session(subject['subject_name'], day=date.today())
+        self.db.add_study_session(self.user_id, subject['subject_id'], s['session_date'],
+                                  s['start_time'], s['end_time'], s['duration_minutes'],
+                                  s['topics_covered'], s['notes'])
+
+    def chat(self):
+        """Chat view flow: load history, build AI context, save the exchange (no Groq call)"""
+        self.db.get_chat_history(self.user_id, limit=20)
+        self.db.get_user_context(self.user_id)
+        subject = self.gen.rng.choice(self.subjects)['subject_name'] if self.subjects else 'Mathematics'
+        c = self.gen.chat(subject)
+        self.db.save_chat_message(self.user_id, c['message'], c['response'])
+
+    def poll_notifications(self):
+        """Same work as one NotificationService check"""
+        for reminder in self.db.get_pending_reminders(self.user_id) or []:
+            self.db.add_notification(self.user_id, 'reminder', reminder['message'], 'high')
+            self.db.mark_reminder_sent(reminder['reminder_id'])
+        self.db.count_unread_notifications(self.user_id)
+        self.db.get_notifications(self.user_id, limit=5)
+
+
+def run_load(db, users, students=DEFAULT_STUDENTS, duration=DEFAULT_DURATION,
+             think_time=DEFAULT_THINK, seed=42):
+    """
+    Run `students` worker threads for `duration` seconds.
+
+    Returns a report dict with throughput, per-step and per-query latencies.
+    """
+    timed_db = TimedDB(db)
+    steps = {name: LatencyHistogram() for name in
+             ('login', 'update_login_streak', 'dashboard', 'add_session', 'chat', 'notifications_poll')}
+    visits = LatencyHistogram()
+    stop = threading.Event()
+    picker = random.Random(seed)
+    picker_lock = threading.Lock()
+
+    def worker(index):
+        gen = SyntheticDataGenerator(seed + index + 1)
+        while not stop.is_set():
+            with picker_lock:
+                user = picker.choice(users)
+            sim = StudentSimulator(timed_db, user, gen, think_time, steps)
+            start = time.perf_counter()
+            completed = sim.run_visit(stop)
+            if completed:
+                visits.record((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True, name=f"student-{i}")
+               for i in range(students)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    try:
+        stop.wait(duration)
+    except KeyboardInterrupt:
+        print("\n⏹️ Stopping early...")
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    queries = {name: h.summary() for name, h in sorted(timed_db.calls.items())}
+    total_queries = sum(q['count'] for q in queries.values())
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'students': students,
+        'think_time': think_time,
+        'elapsed_seconds': elapsed,
+        'visits': visits.summary(),
+        'visits_per_second': visits.summary()['count'] / elapsed if elapsed else 0.0,
+        'calls_per_second': total_queries / elapsed if elapsed else 0.0,
+        'steps': {name: h.summary() for name, h in steps.items()},
+        'queries': queries,
+        '_histograms': {'visit': visits, **{f"step:{k}": v for k, v in steps.items()}},
+    }
+
+
+def print_report(report):
+    print(f"\n📈 {report['students']} students, think {report['think_time']}s, "
+          f"{report['elapsed_seconds']:.1f}s")
+    print(f"   Visits completed: {report['visits']['count']:,} "
+          f"({report['visits_per_second']:.2f}/s)")
+    print(f"   DatabaseManager calls: {report['calls_per_second']:.1f}/s")
+
+    def table(title, rows):
+        print(f"\n{title:<34} {'count':>7} {'err':>5} {'p50':>9} {'p95':>9} {'p99':>9}")
+        for name, s in rows.items():
+            print(f"{name:<34} {s['count']:>7} {s['errors']:>5} "
+                  f"{s['p50']:>9.2f} {s['p95']:>9.2f} {s['p99']:>9.2f}")
+
+    table("Step (ms)", report['steps'])
+    table("Query (ms)", report['queries'])
+    print("\nVisit latency histogram:")
+    print(report['_histograms']['visit'].render())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent students against the database")
+    parser.add_argument('--scale', choices=sorted(SCALES), default='1k',
+                        help="which seeded user set to log in as (see benchmark.py --seed-data)")
+    parser.add_argument('--database', default=f"{config.DB_CONFIG['database']}_bench")
+    parser.add_argument('--students', type=int, default=DEFAULT_STUDENTS)
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION, help="seconds")
+    parser.add_argument('--think', type=float, default=DEFAULT_THINK,
+                        help="mean think time between steps in seconds (exponential)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    if args.database == config.DB_CONFIG['database']:
+        parser.error("refusing to load-test the application database; pass a separate --database")
+    db = connect_bench_database(args.database)
+
+    users = db.execute_query("SELECT user_id, username FROM users WHERE username LIKE %s",
+                             (f"bench{args.scale}\\_%",), fetch=True) or []
+    if not users:
+        print(f"❌ No seeded users for scale {args.scale}; run benchmark.py --scale {args.scale} --seed-data")
+        return 1
+
+    print(f"🚀 Starting {args.students} students for {args.duration:.0f}s against {args.database}...")
+    report = run_load(db, users, args.students, args.duration, args.think, args.seed)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            data = {k: v for k, v in report.items() if not k.startswith('_')}
+            data['histograms'] = {k: h.buckets() for k, h in report['_histograms'].items()}
+            data['query_metrics'] = metrics.snapshot()
+            json.dump(data, f, indent=2)
+        print(f"\n💾 Report written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,14 @@
 import customtkinter as ctk
 from tkinter import messagebox
-from database import db
-from signup import SignupWindow
-from dashboard import Dashboard
 from config import COLORS
 from email_utils import generate_otp, send_otp_email
 from otp_dialog import OTPVerificationDialog
 import json
 import os
+import threading
+
+# database, dashboard and signup are imported on first use so the login
+# window can paint before MySQL is reached; see connect_database()
 
 CREDENTIALS_FILE = "credentials.json"
 
@@ -34,6 +35,51 @@ class LoginWindow(ctk.CTk):
         
         # Load saved credentials
         self.load_credentials()
+        
+        # Connect to MySQL behind the login screen
+        self.db_ready = False
+        self.connect_database()
+    
+    def connect_database(self):
+        """Set up / connect to the database in the background"""
+        if getattr(self, '_connecting', False):
+            return
+        self._connecting = True
+        self.login_button.configure(state="disabled", text="Connecting...")
+        
+        def worker():
+            error = None
+            try:
+                from setup_database import setup_new_database
+                if not setup_new_database():
+                    error = "Could not reach MySQL"
+                else:
+                    from database import init_db
+                    if not init_db().test_connection():
+                        error = "Could not connect to the database"
+                    else:
+                        # Warm the dashboard import while the user types
+                        import dashboard  # noqa: F401
+            except Exception as e:
+                error = str(e)
+            self.after(0, lambda: self.on_database_ready(error))
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def on_database_ready(self, error):
+        self._connecting = False
+        if error:
+            print(f"❌ Database Error: {error}")
+            self.login_button.configure(state="normal", text="Retry Connection")
+            messagebox.showerror(
+                "Database Error",
+                f"{error}\n\nPlease check if MySQL is running, then press Retry.",
+                parent=self
+            )
+            return
+        self.db_ready = True
+        print("✅ Database System: ONLINE")
+        self.login_button.configure(state="normal", text="Login")
     
     def center_window(self):
         """Dynamically adjust size to 85% width and 85% height of screen"""
@@ -309,6 +355,11 @@ class LoginWindow(ctk.CTk):
             self.password_entry.configure(show="●")
     
     def handle_login(self):
+        if not self.db_ready:
+            self.connect_database()
+            return
+        
+        from database import db
         username = self.username_entry.get().strip()
         password = self.password_entry.get().strip()
         
@@ -389,6 +440,7 @@ class LoginWindow(ctk.CTk):
         
         # 3. Create and show Dashboard
         # We pass 'self' as parent so Dashboard can call self.deiconify() on logout
+        from dashboard import Dashboard
         dashboard = Dashboard(user, self)
         
         # 4. Force focus to new window
@@ -396,6 +448,10 @@ class LoginWindow(ctk.CTk):
         dashboard.lift()
     
     def open_signup(self):
+        if not self.db_ready:
+            messagebox.showinfo("Please wait", "Still connecting to the database...", parent=self)
+            return
+        from signup import SignupWindow
         self.withdraw()
         signup = SignupWindow(self)
 
@@ -1,6 +1,6 @@
 """
 Main Entry Point
-Runs database setup automatically and then launches the app.
+Shows the login window immediately; database setup runs behind it.
 """
 
 import customtkinter as ctk
@@ -16,33 +16,32 @@ except Exception:
     pass
 # ---------------------------------------
 
-# Import modules
-from setup_database import setup_new_database
+# Import modules (heavy ones - MySQL, dashboard, Groq - load lazily)
 from login import LoginWindow
+from ui_profiler import profiler
 
 def main():
     print("------------------------------------------------")
     print("🚀 STARTING AI STUDY PLANNER")
     print("------------------------------------------------")
 
-    # 1. Initialize Database
-    print("🔄 Checking Database System...")
-    try:
-        setup_new_database()
-        print("✅ Database System: ONLINE")
-    except Exception as e:
-        print(f"❌ Database Error: {e}")
-        print("   Please check if MySQL is running!")
-        return
-
-    # 2. Launch Application
+    # Launch Application; the login window sets up and connects to the
+    # database in the background while it is on screen
     print("✨ Launching Interface...")
     try:
         # Optional: Set a slightly higher scaling for better visibility on modern screens
         # ctk.set_widget_scaling(1.1) 
         
         app = LoginWindow()
+        profiler.start(app)  # No-op unless UI_PROFILER is enabled
         app.mainloop()
+        profiler.stop()
+        
+        # Release shared services (no-ops if they were never created)
+        from groq_service import close_groq_ai
+        from database import close_db
+        close_groq_ai()
+        close_db()
     except Exception as e:
         print(f"❌ Application Error: {e}")
 
@@ -4,12 +4,14 @@ Parses basic Markdown syntax and applies tags to CTkTextbox
 """
 
 import re
+from functools import lru_cache
 
 class MarkdownParser:
     """Parses Markdown text and applies formatting to CTkTextbox"""
     
     def __init__(self, textbox):
         self.textbox = textbox
+        self._pending = ""  # Unfinished last line while streaming
         self.setup_tags()
         
     def setup_tags(self):
@@ -33,55 +35,105 @@ class MarkdownParser:
         
     def parse_and_insert(self, text):
         """Parse markdown and insert into textbox"""
-        lines = text.split('\n')
+        self._insert_spans(tokenize(text))
         
-        for line in lines:
-            # Headers
-            if line.startswith('# '):
-                self.textbox.insert("end", line[2:] + "\n", "h1")
-            elif line.startswith('## '):
-                self.textbox.insert("end", line[3:] + "\n", "h2")
-            elif line.startswith('### '):
-                self.textbox.insert("end", line[4:] + "\n", "h3")
-                
-            # Bullet points
-            elif line.strip().startswith('- ') or line.strip().startswith('* '):
-                content = line.strip()[2:]
-                self.insert_formatted_line("• " + content + "\n", "bullet")
-                
-            # Numbered lists
-            elif re.match(r'^\d+\.', line.strip()):
-                self.insert_formatted_line(line + "\n", "bullet")
-                
-            # Normal text
-            else:
-                self.insert_formatted_line(line + "\n")
+    def append(self, chunk):
+        """
+        Incremental rendering for streamed text: only complete lines are
+        parsed and inserted; the unfinished tail waits for the next chunk.
+        """
+        self._pending += chunk
+        cut = self._pending.rfind('\n')
+        if cut == -1:
+            return
+        complete, self._pending = self._pending[:cut], self._pending[cut + 1:]
+        self._insert_spans(tokenize(complete))
+        
+    def flush(self):
+        """Render whatever is left of a streamed response"""
+        if self._pending:
+            tail, self._pending = self._pending, ""
+            self._insert_spans(tokenize(tail))
                 
     def insert_formatted_line(self, text, base_tag=None):
         """Insert line with inline formatting (bold, italic, code)"""
+        self._insert_spans(_inline_spans(text, base_tag))
         
-        # Split by bold markers (**text**)
-        parts = re.split(r'(\*\*.*?\*\*)', text)
+    def _insert_spans(self, spans):
+        """Insert (text, tags) spans with as few Tk calls as possible"""
+        target = self.textbox._textbox if hasattr(self.textbox, '_textbox') else self.textbox
+        for i in range(0, len(spans), INSERT_BATCH):
+            args = []
+            for text, tags in spans[i:i + INSERT_BATCH]:
+                args.extend((text, tags))
+            target.insert("end", *args)
+
+
+# ==================== TOKENIZER ====================
+
+INSERT_BATCH = 500  # (text, tags) pairs per Text.insert call
+
+_HEADERS = (("### ", "h3"), ("## ", "h2"), ("# ", "h1"))
+_NUMBERED = re.compile(r'^\d+\.')
+# One pass over each line; bold is tried before italic at every position
+_INLINE = re.compile(r'\*\*(.*?)\*\*|\*([^*]+?)\*|`(.*?)`')
+_INLINE_TAGS = ("bold", "italic", "code")
+
+
+@lru_cache(maxsize=256)
+def tokenize(text):
+    """
+    Convert Markdown text into a tuple of (text, tags) spans.
+    
+    Cached per text, so re-rendering the same chat bubble or plan
+    (e.g. on every history load) skips parsing entirely.
+    """
+    spans = []
+    for line in text.split('\n'):
+        stripped = line.strip()
         
-        for part in parts:
-            if part.startswith('**') and part.endswith('**'):
-                # Bold text
-                clean_text = part[2:-2]
-                self.textbox.insert("end", clean_text, ("bold", base_tag) if base_tag else "bold")
+        # Headers
+        for prefix, tag in _HEADERS:
+            if line.startswith(prefix):
+                spans.append((line[len(prefix):] + "\n", (tag,)))
+                break
+        else:
+            # Bullet points
+            if stripped.startswith('- ') or stripped.startswith('* '):
+                spans.extend(_inline_spans("• " + stripped[2:] + "\n", "bullet"))
+            # Numbered lists
+            elif _NUMBERED.match(stripped):
+                spans.extend(_inline_spans(line + "\n", "bullet"))
+            # Normal text
             else:
-                # Check for italic (*text*)
-                sub_parts = re.split(r'(\*.*?\*)', part)
-                for sub_part in sub_parts:
-                    if sub_part.startswith('*') and sub_part.endswith('*') and len(sub_part) > 2:
-                        clean_text = sub_part[1:-1]
-                        self.textbox.insert("end", clean_text, ("italic", base_tag) if base_tag else "italic")
-                    else:
-                        # Check for code (`text`)
-                        code_parts = re.split(r'(`.*?`)', sub_part)
-                        for code_part in code_parts:
-                            if code_part.startswith('`') and code_part.endswith('`'):
-                                clean_text = code_part[1:-1]
-                                self.textbox.insert("end", clean_text, ("code", base_tag) if base_tag else "code")
-                            else:
-                                if code_part:
-                                    self.textbox.insert("end", code_part, base_tag if base_tag else None)
+                spans.extend(_inline_spans(line + "\n"))
+    return tuple(_merge(spans))
+
+
+def _inline_spans(text, base_tag=None):
+    """Split one line into spans for bold, italic and code"""
+    base = (base_tag,) if base_tag else ()
+    spans = []
+    pos = 0
+    for match in _INLINE.finditer(text):
+        if match.start() > pos:
+            spans.append((text[pos:match.start()], base))
+        group = match.lastindex
+        spans.append((match.group(group), (_INLINE_TAGS[group - 1],) + base))
+        pos = match.end()
+    if pos < len(text):
+        spans.append((text[pos:], base))
+    return spans
+
+
+def _merge(spans):
+    """Join neighbouring spans that carry the same tags"""
+    merged = []
+    for text, tags in spans:
+        if not text:
+            continue
+        if merged and merged[-1][1] == tags:
+            merged[-1] = (merged[-1][0] + text, tags)
+        else:
+            merged.append((text, tags))
+    return merged
@@ -7,7 +7,7 @@ import time
 from datetime import datetime
 import customtkinter as ctk
 from database import db
-from config import COLORS
+from config import COLORS, BATCH_JOBS
 
 class NotificationService:
     """Background service to check and display reminders"""
@@ -43,15 +43,20 @@ class NotificationService:
                 self._check_reminders()
                 
                 # 2. Check Social Motivation (Every 1 hour)
+                # Skipped when the nightly batch runner does this for every user
                 current_time = time.time()
-                if current_time - last_social_check > 3600: # 3600 seconds = 1 hour
+                if not BATCH_JOBS['enabled'] and current_time - last_social_check > 3600: # 3600 seconds = 1 hour
                     db.check_and_generate_social_notification(self.user_id)
-                    
-                    # Check Streak Risk (Also hourly)
+
+                    # Queue today's spaced-repetition reviews (once per day)
+                    db.enqueue_review_reminders(self.user_id)
+
+                # Check Streak Risk (Also hourly). Kept even with the batch runner:
+                # it is a no-op before the evening and the daily dedup key stops repeats
+                if current_time - last_social_check > 3600:
                     risk_alert = db.check_streak_risk(self.user_id)
                     if risk_alert:
                         self.show_notification(risk_alert)
-                        
                     last_social_check = current_time
                     
             except Exception as e:
@@ -1,9 +1,14 @@
 import customtkinter as ctk
 from config import COLORS
 from database import db
+import event_bus
+from event_bus import bus
 from datetime import datetime
+from review_view import ReviewSession
 
 class NotificationView:
+    PAGE_SIZE = 30
+    
     def __init__(self, parent, dashboard):
         self.parent = parent
         self.dashboard = dashboard
@@ -20,8 +25,10 @@ class NotificationView:
         # Header
         self.create_header()
         
-        # List
+        # List (reloaded once per batch of notification events; the dashboard updates the badge)
         self.load_notifications()
+        bus.subscribe(event_bus.NOTIFICATION_EVENTS, lambda events: self.load_notifications(),
+                      widget=self.container, user_id=self.user_id)
         
     def create_header(self):
         header_frame = ctk.CTkFrame(self.container, fg_color="transparent")
@@ -45,6 +52,30 @@ class NotificationView:
             command=self.load_notifications
         ).pack(side="right")
         
+        # Mark All Read Button
+        ctk.CTkButton(
+            header_frame,
+            text="✓ Mark all read",
+            width=120,
+            fg_color=COLORS['card'],
+            hover_color=COLORS['hover'],
+            text_color=COLORS['text'],
+            command=self.mark_all_read
+        ).pack(side="right", padx=(10, 0))
+        
+        # Spaced-repetition reviews due today
+        self.review_btn = ctk.CTkButton(
+            header_frame,
+            text="",
+            width=120,
+            fg_color=COLORS['success'],
+            hover_color=COLORS['primary'],
+            text_color=COLORS['background'],
+            command=self.start_review
+        )
+        self.review_btn.pack(side="right", padx=(10, 0))
+        self.update_review_button()
+        
         # Test Button (Debug)
         ctk.CTkButton(
             header_frame,
@@ -64,15 +95,38 @@ class NotificationView:
         self.content_frame = ctk.CTkFrame(self.container, fg_color="transparent")
         self.content_frame.pack(fill="x", expand=True)
 
-        # Get data
-        notifications = db.get_notifications(self.user_id, limit=50) # Fetch all recent
+        # Get data (first page only; older ones load on demand)
+        notifications = db.get_notifications(self.user_id, limit=self.PAGE_SIZE)
         
         if not notifications:
             self.show_empty_state()
             return
             
+        self.add_notification_page(notifications)
+        
+    def add_notification_page(self, notifications):
+        """Render a page of notifications plus a 'Load older' button if more may exist"""
         for notif in notifications:
             self.create_notification_card(notif)
+        
+        if len(notifications) == self.PAGE_SIZE:
+            last_id = notifications[-1]['notification_id']
+            more_btn = ctk.CTkButton(
+                self.content_frame,
+                text="Load older notifications",
+                height=32,
+                fg_color="transparent",
+                hover_color=COLORS['hover'],
+                text_color=COLORS['primary']
+            )
+            more_btn.configure(command=lambda: self.load_older(last_id, more_btn))
+            more_btn.pack(pady=10)
+            
+    def load_older(self, before_id, button):
+        button.destroy()
+        older = db.get_notifications(self.user_id, limit=self.PAGE_SIZE, before_id=before_id)
+        if older:
+            self.add_notification_page(older)
             
     def show_empty_state(self):
         frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
@@ -188,19 +242,23 @@ class NotificationView:
             command=lambda: self.delete_notif(notif['notification_id'])
         ).pack(side="left", padx=2)
 
+    def update_review_button(self):
+        if not self.review_btn.winfo_exists():
+            return  # Page changed while the review window was open
+        due = db.count_due_reviews(self.user_id)
+        self.review_btn.configure(text=f"📚 Review ({due})" if due else "📚 Review")
+        
+    def start_review(self):
+        ReviewSession(self.parent, self.user_id, on_close=self.update_review_button)
+
     def mark_read(self, notification_id):
         db.mark_notification_read(notification_id)
-        self.load_notifications()
-        # Optionally update dashboard badge
-        if hasattr(self.dashboard, 'update_notification_badge'):
-            self.dashboard.update_notification_badge()
+        
+    def mark_all_read(self):
+        db.mark_all_notifications_read(self.user_id)
         
     def delete_notif(self, notification_id):
         db.delete_notification(notification_id)
-        self.load_notifications()
-        # Optionally update dashboard badge
-        if hasattr(self.dashboard, 'update_notification_badge'):
-            self.dashboard.update_notification_badge()
 
     def send_test_notification(self):
         """Send a test notification to verify system"""
@@ -210,7 +268,3 @@ class NotificationView:
             f"Test Notification at {datetime.now().strftime('%I:%M %p')} 🔔", 
             'medium'
         )
-        self.load_notifications()
-        # Update badge
-        if hasattr(self.dashboard, 'update_notification_badge'):
-            self.dashboard.update_notification_badge()
@@ -0,0 +1,274 @@
+"""
+Offline Queue - Local write-ahead log and read replica for a flaky MySQL link
+Hot user writes (sessions, mood, pet, notes, pomodoro) are appended to a
+local SQLite file and acknowledged at once; a background worker replays
+them in order through the normal DatabaseManager methods, retrying with
+backoff while MySQL is unreachable. Entries survive restarts and are
+replayed at least once. A replay that fails because the link dropped only
+makes the worker back off; one that keeps failing with an SQL error is set
+aside as 'failed' so it cannot block the rest, and reported to the app.
+
+The same file keeps the last good result of the current user's hot reads,
+served when MySQL is down or a read fails.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+MISSING = object()
+
+
+# ---------- JSON with dates (MySQL rows carry date, datetime, TIME and DECIMAL values) ----------
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, date):
+        return {'__date__': value.isoformat()}
+    if isinstance(value, time):
+        return {'__time__': value.isoformat()}
+    if isinstance(value, timedelta):
+        return {'__timedelta__': value.total_seconds()}
+    if isinstance(value, Decimal):
+        return {'__decimal__': str(value)}
+    if isinstance(value, (bytes, bytearray)):
+        return {'__bytes__': value.hex()}
+    raise TypeError(f"Cannot store {type(value).__name__} offline")
+
+
+def _decode(obj):
+    if len(obj) == 1:
+        (tag, value), = obj.items()
+        if tag == '__datetime__':
+            return datetime.fromisoformat(value)
+        if tag == '__date__':
+            return date.fromisoformat(value)
+        if tag == '__time__':
+            return time.fromisoformat(value)
+        if tag == '__timedelta__':
+            return timedelta(seconds=value)
+        if tag == '__decimal__':
+            return Decimal(value)
+        if tag == '__bytes__':
+            return bytes.fromhex(value)
+    return obj
+
+
+def dumps(value):
+    return json.dumps(value, default=_encode, sort_keys=True)
+
+
+def loads(text):
+    return json.loads(text, object_hook=_decode)
+
+
+class ConnectionLost(Exception):
+    """A replay failed because MySQL went away (or a lock timed out), not because of the write"""
+
+
+def read_key(method, args, kwargs):
+    return f"{method}:{dumps([list(args), kwargs])}"
+
+
+class WriteQueue:
+    """Durable FIFO of DatabaseManager calls plus a key/value read cache"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=FULL")  # An acknowledged write must survive a crash
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pending_writes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                method TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                status TEXT NOT NULL DEFAULT 'pending'
+            );
+            CREATE INDEX IF NOT EXISTS idx_pending_status ON pending_writes (status, id);
+            CREATE TABLE IF NOT EXISTS local_reads (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            );
+        """)
+        self.conn.commit()
+
+    def enqueue(self, method, args=(), kwargs=None):
+        payload = dumps({'args': list(args), 'kwargs': kwargs or {}})
+        with self._lock:
+            cursor = self.conn.execute(
+                "INSERT INTO pending_writes (method, payload, created_at) VALUES (?, ?, ?)",
+                (method, payload, datetime.now().isoformat())
+            )
+            self.conn.commit()
+            return cursor.lastrowid
+
+    def peek(self, limit=100):
+        """Oldest pending entries as dicts with method, args, kwargs, attempts"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT id, method, payload, attempts FROM pending_writes "
+                "WHERE status = 'pending' ORDER BY id LIMIT ?", (limit,)
+            ).fetchall()
+        entries = []
+        for entry_id, method, payload, attempts in rows:
+            data = loads(payload)
+            entries.append({'id': entry_id, 'method': method, 'args': data['args'],
+                            'kwargs': data['kwargs'], 'attempts': attempts})
+        return entries
+
+    def ack(self, ids):
+        if not ids:
+            return
+        with self._lock:
+            self.conn.executemany("DELETE FROM pending_writes WHERE id = ?", [(i,) for i in ids])
+            self.conn.commit()
+
+    def fail(self, entry_id, error, max_attempts):
+        """Count a failed replay; returns True if the entry was set aside"""
+        with self._lock:
+            self.conn.execute("""
+                UPDATE pending_writes
+                SET attempts = attempts + 1, last_error = ?,
+                    status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE status END
+                WHERE id = ?
+            """, (str(error)[:500], max_attempts, entry_id))
+            self.conn.commit()
+            row = self.conn.execute("SELECT status FROM pending_writes WHERE id = ?", (entry_id,)).fetchone()
+        return bool(row and row[0] == 'failed')
+
+    def count(self, status='pending'):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM pending_writes WHERE status = ?",
+                                     (status,)).fetchone()[0]
+
+    def failed(self):
+        with self._lock:
+            return self.conn.execute(
+                "SELECT id, method, payload, attempts, last_error, created_at FROM pending_writes "
+                "WHERE status = 'failed' ORDER BY id"
+            ).fetchall()
+
+    def retry_failed(self):
+        """Put set-aside entries back in line (e.g. after fixing the cause)"""
+        with self._lock:
+            cursor = self.conn.execute(
+                "UPDATE pending_writes SET status = 'pending', attempts = 0 WHERE status = 'failed'")
+            self.conn.commit()
+            return cursor.rowcount
+
+    # ---------- Local read replica ----------
+
+    def remember(self, key, value):
+        try:
+            text = dumps(value)
+        except TypeError:
+            return
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO local_reads (key, value, updated_at) VALUES (?, ?, ?)",
+                (key, text, datetime.now().isoformat())
+            )
+            self.conn.commit()
+
+    def cached(self, key):
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM local_reads WHERE key = ?", (key,)).fetchone()
+        return loads(row[0]) if row else MISSING
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+class SyncWorker(threading.Thread):
+    """Replays the queue to MySQL in batches, backing off while it is unreachable"""
+
+    def __init__(self, db, queue, interval=5, batch_size=100, max_attempts=5, max_backoff=60,
+                 on_failed=None):
+        super().__init__(daemon=True, name="offline-sync")
+        self.db = db
+        self.queue = queue
+        self.on_failed = on_failed  # callback(entry, error) when an entry is set aside
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.max_backoff = max_backoff
+        self.online = True
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+
+    def wake(self):
+        self._wake.set()
+
+    def stop(self, timeout=None):
+        self._stopping.set()
+        self._wake.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def run(self):
+        delay = 0
+        while not self._stopping.is_set():
+            self._wake.wait(delay)
+            self._wake.clear()
+            if self._stopping.is_set():
+                break
+            try:
+                _, healthy, more = self.sync_once()
+            except Exception as e:
+                print(f"⚠️ Offline sync error: {e}")
+                healthy, more = False, False
+            if more:
+                delay = 0
+            elif healthy:
+                delay = self.interval
+            else:
+                delay = min(self.max_backoff, max(self.interval, delay * 2))
+
+    def sync_once(self):
+        """Replay one batch in order. Returns (replayed, healthy, more waiting)"""
+        entries = self.queue.peek(self.batch_size)
+        if not entries:
+            if not self.online:
+                self.online = self.db.ping()
+            return 0, self.online, False
+        if not self.db.ping():
+            self.online = False
+            return 0, False, False
+        self.online = True
+
+        done = 0
+        healthy = True
+        for entry in entries:
+            error = "write returned no result"
+            try:
+                result = self.db.replay_write(entry['method'], entry['args'], entry['kwargs'])
+            except ConnectionLost:
+                # Offline again: back off without counting it against the entry
+                self.online = healthy = False
+                break
+            except Exception as e:
+                result, error = None, e
+            if result is not None and result is not False:
+                self.queue.ack([entry['id']])  # At once, so a crash mid-batch only replays this entry
+                done += 1
+                continue
+            if self.queue.fail(entry['id'], error, self.max_attempts):
+                print(f"❌ Offline write #{entry['id']} ({entry['method']}) set aside: {error}")
+                if self.on_failed:
+                    self.on_failed(entry, error)
+                continue
+            healthy = False
+            break  # Keep the order; retry this entry after a backoff
+        if done:
+            print(f"🔄 Synced {done} offline writes")
+        return done, healthy, healthy and len(entries) == self.batch_size
@@ -0,0 +1,283 @@
+"""
+Query Metrics - Instrumentation for DatabaseManager
+Per-statement timing, rows, connection acquire time and caller method,
+aggregated into histograms by (caller, SQL fingerprint), plus a slow-query
+log and Prometheus / JSON export.
+"""
+
+import json
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+
+try:
+    from config import QUERY_METRICS as SETTINGS
+except ImportError:
+    SETTINGS = {}
+
+# Histogram bucket upper bounds in seconds (Prometheus convention)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_LOG_SIZE = 200
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|%\(\w+\)s")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUES_LIST = re.compile(r"(VALUES\s*\(\?(?:,\s*\?)*\))(?:\s*,\s*\(\?(?:,\s*\?)*\))+", re.IGNORECASE)
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(sql):
+    """Normalize a statement so calls differing only in literals group together"""
+    text = _STRING.sub("?", sql)
+    text = _PLACEHOLDER.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _SPACE.sub(" ", text).strip()
+    text = _VALUES_LIST.sub(r"\1, ...", text)
+    return _IN_LIST.sub("(?, ...)", text)
+
+
+class Histogram:
+    """Cumulative-ready bucket counts plus sum and count"""
+
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # Last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += seconds
+        self.count += 1
+
+    def quantile(self, q):
+        """Approximate quantile: upper bound of the bucket holding it"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts[:-1]):
+            seen += n
+            if seen >= target:
+                return BUCKETS[i]
+        return float('inf')
+
+    def cumulative(self):
+        running = 0
+        for bound, n in zip(BUCKETS + (float('inf'),), self.counts):
+            running += n
+            yield bound, running
+
+
+class QueryStats:
+    """Aggregate for one (caller, fingerprint) pair"""
+
+    __slots__ = ('caller', 'fingerprint', 'duration', 'rows', 'errors', 'max_seconds')
+
+    def __init__(self, caller, fingerprint):
+        self.caller = caller
+        self.fingerprint = fingerprint
+        self.duration = Histogram()
+        self.rows = 0
+        self.errors = 0
+        self.max_seconds = 0.0
+
+    def to_dict(self):
+        return {
+            'caller': self.caller,
+            'fingerprint': self.fingerprint,
+            'count': self.duration.count,
+            'errors': self.errors,
+            'rows': self.rows,
+            'total_ms': self.duration.total * 1000,
+            'mean_ms': self.duration.total * 1000 / self.duration.count if self.duration.count else 0.0,
+            'p95_ms': self.duration.quantile(0.95) * 1000,
+            'max_ms': self.max_seconds * 1000,
+        }
+
+
+class QueryMetrics:
+    """
+    Thread-safe registry every DatabaseManager statement reports to.
+
+    Extra listeners can be attached with add_listener(fn); fn receives the
+    event dict for each statement (caller, sql, seconds, connect_seconds,
+    rows, error).
+    """
+
+    def __init__(self, enabled=True, slow_query_ms=200, slow_query_log=None):
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+        self.slow_query_log = slow_query_log
+        self.slow_queries = deque(maxlen=SLOW_LOG_SIZE)
+        self.listeners = []
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.stats = {}
+            self.connect = Histogram()
+            self.connect_failures = 0
+            self.started_at = time.time()
+
+    # ---------- Recording ----------
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def record_connect(self, seconds, ok=True):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.connect.observe(seconds)
+            if not ok:
+                self.connect_failures += 1
+
+    def record(self, caller, sql, seconds, connect_seconds=0.0, rows=0, error=None, params=None):
+        """Record one executed statement"""
+        if not self.enabled:
+            return
+        key_fp = fingerprint(sql)
+        with self._lock:
+            stats = self.stats.get((caller, key_fp))
+            if stats is None:
+                stats = self.stats[(caller, key_fp)] = QueryStats(caller, key_fp)
+            stats.duration.observe(seconds)
+            stats.rows += rows or 0
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            if error:
+                stats.errors += 1
+
+        if self.slow_query_ms is not None and seconds * 1000 >= self.slow_query_ms:
+            self._log_slow(caller, key_fp, seconds, rows, error)
+
+        if self.listeners:
+            event = {
+                'caller': caller, 'sql': sql, 'fingerprint': key_fp, 'params': params,
+                'seconds': seconds, 'connect_seconds': connect_seconds,
+                'rows': rows, 'error': error,
+            }
+            for listener in list(self.listeners):
+                try:
+                    listener(event)
+                except Exception as e:
+                    print(f"⚠️ Query metrics listener failed: {e}")
+
+    def _log_slow(self, caller, key_fp, seconds, rows, error):
+        entry = {
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'caller': caller,
+            'ms': round(seconds * 1000, 2),
+            'rows': rows,
+            'fingerprint': key_fp,
+            'error': str(error) if error else None,
+        }
+        self.slow_queries.append(entry)
+        if self.slow_query_log:
+            try:
+                with open(self.slow_query_log, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry) + "\n")
+            except OSError as e:
+                print(f"⚠️ Could not write slow query log: {e}")
+        else:
+            print(f"🐢 Slow query ({entry['ms']} ms) in {caller}: {key_fp[:200]}")
+
+    # ---------- Export ----------
+
+    def snapshot(self):
+        """Aggregates as plain dicts, slowest total time first"""
+        with self._lock:
+            queries = [s.to_dict() for s in self.stats.values()]
+            connect = {
+                'count': self.connect.count,
+                'failures': self.connect_failures,
+                'mean_ms': self.connect.total * 1000 / self.connect.count if self.connect.count else 0.0,
+                'p95_ms': self.connect.quantile(0.95) * 1000,
+            }
+        queries.sort(key=lambda q: q['total_ms'], reverse=True)
+        return {
+            'since': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+            'connections': connect,
+            'queries': queries,
+            'slow_queries': list(self.slow_queries),
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self):
+        """Prometheus text exposition format"""
+        lines = [
+            "# HELP study_planner_query_duration_seconds Statement execution time",
+            "# TYPE study_planner_query_duration_seconds histogram",
+        ]
+        with self._lock:
+            stats = list(self.stats.values())
+            connect = self.connect
+            connect_failures = self.connect_failures
+
+            for s in stats:
+                labels = f'caller="{_label(s.caller)}",query="{_label(s.fingerprint[:200])}"'
+                for bound, running in s.duration.cumulative():
+                    le = "+Inf" if bound == float('inf') else repr(bound)
+                    lines.append(f'study_planner_query_duration_seconds_bucket{{{labels},le="{le}"}} {running}')
+                lines.append(f"study_planner_query_duration_seconds_sum{{{labels}}} {s.duration.total:.6f}")
+                lines.append(f"study_planner_query_duration_seconds_count{{{labels}}} {s.duration.count}")
+
+            lines += ["# HELP study_planner_query_rows_total Rows returned or affected",
+                      "# TYPE study_planner_query_rows_total counter"]
+            for s in stats:
+                lines.append(f'study_planner_query_rows_total{{caller="{_label(s.caller)}",'
+                             f'query="{_label(s.fingerprint[:200])}"}} {s.rows}')
+
+            lines += ["# HELP study_planner_query_errors_total Failed statements",
+                      "# TYPE study_planner_query_errors_total counter"]
+            for s in stats:
+                lines.append(f'study_planner_query_errors_total{{caller="{_label(s.caller)}",'
+                             f'query="{_label(s.fingerprint[:200])}"}} {s.errors}')
+
+            lines += ["# HELP study_planner_db_connect_seconds Time to open a connection",
+                      "# TYPE study_planner_db_connect_seconds histogram"]
+            for bound, running in connect.cumulative():
+                le = "+Inf" if bound == float('inf') else repr(bound)
+                lines.append(f'study_planner_db_connect_seconds_bucket{{le="{le}"}} {running}')
+            lines.append(f"study_planner_db_connect_seconds_sum {connect.total:.6f}")
+            lines.append(f"study_planner_db_connect_seconds_count {connect.count}")
+            lines += ["# TYPE study_planner_db_connect_failures_total counter",
+                      f"study_planner_db_connect_failures_total {connect_failures}"]
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """Write metrics to path: .prom / .txt -> Prometheus text, anything else -> JSON"""
+        text = self.to_prometheus() if path.endswith(('.prom', '.txt')) else self.to_json()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+# Global registry used by DatabaseManager
+metrics = QueryMetrics(
+    enabled=SETTINGS.get('enabled', True),
+    slow_query_ms=SETTINGS.get('slow_query_ms', 200),
+    slow_query_log=SETTINGS.get('slow_query_log'),
+)
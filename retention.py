@@ -0,0 +1,204 @@
+"""
+Retention - Keeps the ever-growing tables small
+Old notifications, sent reminders and chat history are either moved to
+<table>_archive or deleted, a few hundred rows per transaction with a short
+pause in between, so the app stays responsive while it runs. Every batch
+first adds its rows to archive_summary (rows per user per month), so counts
+survive after the rows themselves are purged.
+
+The hot tables keep their foreign keys, which InnoDB partitioning does not
+allow, so only the archive tables can be RANGE partitioned by month
+(RETENTION['partition_archives']). Expired months are then dropped as whole
+partitions instead of deleted row by row.
+
+Runs nightly as the 'retention' job in batch_jobs.py.
+"""
+
+import time
+from datetime import date, datetime, timedelta
+
+from config import RETENTION
+
+ACTIONS = ('archive', 'delete', 'keep')
+
+TABLES = {
+    'notifications': {
+        'key': 'notification_id', 'date_column': 'created_at', 'where': "",
+        'archive': 'notifications_archive',
+        'columns': ['notification_id', 'user_id', 'notification_type', 'message',
+                    'priority', 'is_read', 'dedup_date', 'created_at'],
+    },
+    'reminders': {
+        'key': 'reminder_id', 'date_column': 'reminder_time', 'where': "status = 'sent'",
+        'archive': None, 'columns': None,
+    },
+    'chat_history': {
+        'key': 'chat_id', 'date_column': 'timestamp', 'where': "",
+        'archive': 'chat_history_archive',
+        'columns': ['chat_id', 'user_id', 'message', 'response', 'timestamp'],
+    },
+}
+
+ARCHIVES = {spec['archive']: spec['date_column'] for spec in TABLES.values() if spec['archive']}
+
+
+def policies(settings=None):
+    """Per-table policies from config, falling back to 'keep' for tables not listed"""
+    settings = settings or RETENTION
+    result = {}
+    for table, spec in TABLES.items():
+        policy = dict(settings.get(table) or {'action': 'keep'})
+        action = policy.get('action', 'keep')
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown retention action for {table}: {action}")
+        if action == 'archive' and not spec['archive']:
+            action = 'delete'  # Nothing worth keeping row by row
+        if action != 'keep' and not policy.get('days'):
+            action = 'keep'
+        result[table] = {'action': action, 'days': policy.get('days')}
+    return result
+
+
+# ---------- Partition planning (pure, MySQL TO_DAYS values) ----------
+
+def to_days(day):
+    """Python date -> MySQL TO_DAYS()"""
+    return day.toordinal() + 365
+
+
+def from_days(days):
+    return date.fromordinal(days - 365)
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(day, months):
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"p{month:%Y%m}"
+
+
+def partition_clause(month):
+    """One monthly partition: rows before the first of the next month"""
+    return f"PARTITION {partition_name(month)} VALUES LESS THAN ({to_days(add_months(month, 1))})"
+
+
+def initial_partitions(today, ahead):
+    """
+    Definitions for converting an archive table: p_old takes everything
+    before this month, then one partition per month, then pmax.
+    """
+    first = month_start(today)
+    parts = [f"PARTITION p_old VALUES LESS THAN ({to_days(first)})"]
+    parts += [partition_clause(add_months(first, k)) for k in range(ahead + 1)]
+    parts.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+    return parts
+
+
+def plan_partitions(existing, today, ahead, keep_days=None):
+    """
+    existing: [(name, upper bound as a date, or None for MAXVALUE)].
+    Returns (months to split out of pmax, partition names that only hold
+    rows older than keep_days).
+    """
+    bounds = [upper for _, upper in existing if upper]
+    last = max(bounds) if bounds else month_start(today)
+    target = add_months(month_start(today), ahead + 1)
+    to_add = []
+    month = last
+    while month < target:
+        to_add.append(month)
+        month = add_months(month, 1)
+
+    to_drop = []
+    if keep_days:
+        cutoff = today - timedelta(days=keep_days)
+        to_drop = [name for name, upper in existing if upper and upper <= cutoff]
+    return to_add, to_drop
+
+
+# ---------- Runner ----------
+
+def run_retention(db, settings=None, now=None, dry_run=False):
+    """Apply every policy; returns {table: rows archived/deleted/purged}"""
+    settings = settings or RETENTION
+    now = now or datetime.now()
+    batch_size = settings.get('batch_size', 1000)
+    pause = settings.get('pause_ms', 0) / 1000
+    report = {}
+
+    for table, policy in policies(settings).items():
+        if policy['action'] == 'keep':
+            continue
+        spec = TABLES[table]
+        cutoff = now - timedelta(days=policy['days'])
+        archive = spec['archive'] if policy['action'] == 'archive' else None
+        if dry_run:
+            report[table] = db.count_expired_rows(table, spec['date_column'], cutoff, spec['where'])
+            continue
+
+        moved = 0
+        while True:
+            ids = db.get_expired_ids(table, spec['key'], spec['date_column'], cutoff, spec['where'], batch_size)
+            if not ids:
+                break
+            if db.archive_rows(table, spec['key'], spec['date_column'], ids, archive, spec['columns']) is None:
+                print(f"❌ Retention stopped on {table} after {moved} rows")
+                break
+            moved += len(ids)
+            if len(ids) < batch_size:
+                break
+            time.sleep(pause)
+        report[table] = moved
+        if moved:
+            print(f"🧹 {table}: {moved} rows {'archived' if archive else 'deleted'}")
+
+    keep_days = settings.get('archive_keep_days')
+    for archive, date_column in ARCHIVES.items():
+        if settings.get('partition_archives'):
+            maintain_partitions(db, archive, date_column, now.date(),
+                                settings.get('partitions_ahead', 3), keep_days, dry_run)
+        if keep_days and not dry_run:
+            report[archive] = purge_archive(db, archive, date_column, now - timedelta(days=keep_days),
+                                            batch_size, pause)
+    return report
+
+
+def purge_archive(db, archive, date_column, cutoff, batch_size, pause=0):
+    """Batched delete of archived rows older than cutoff (what partition drops did not cover)"""
+    purged = 0
+    while True:
+        rows = db.purge_archive_rows(archive, date_column, cutoff, batch_size)
+        if not rows:
+            break
+        purged += rows
+        if rows < batch_size:
+            break
+        time.sleep(pause)
+    return purged
+
+
+def maintain_partitions(db, archive, date_column, today, ahead, keep_days=None, dry_run=False):
+    """Partition the archive table on first use, add upcoming months and drop expired ones"""
+    existing = db.get_partitions(archive)
+    if not existing:
+        print(f"🗂️  Partitioning {archive} by month...")
+        if not dry_run:
+            db.partition_table(archive, date_column, initial_partitions(today, ahead))
+        return
+
+    to_add, to_drop = plan_partitions(existing, today, ahead, keep_days)
+    if dry_run:
+        print(f"🗂️  {archive}: would add {[partition_name(m) for m in to_add]}, drop {to_drop}")
+        return
+    if to_add:
+        db.reorganize_partition(archive, 'pmax',
+                                [partition_clause(m) for m in to_add] + ["PARTITION pmax VALUES LESS THAN MAXVALUE"])
+    if to_drop:
+        db.drop_partitions(archive, to_drop)
+        print(f"🗑️  {archive}: dropped {', '.join(to_drop)}")
@@ -0,0 +1,111 @@
+"""
+Review View - Work through today's spaced-repetition cards
+Each due topic is shown once and graded Again/Hard/Good/Easy, which
+reschedules it (see spaced_repetition.schedule_review).
+"""
+
+import customtkinter as ctk
+from database import db
+from config import COLORS
+
+# Button text, grade name, colour
+GRADE_BUTTONS = [
+    ("🔁 Again", 'again', '#ef4444'),
+    ("😓 Hard", 'hard', COLORS['warning']),
+    ("🙂 Good", 'good', COLORS['success']),
+    ("🚀 Easy", 'easy', COLORS['primary']),
+]
+
+class ReviewSession(ctk.CTkToplevel):
+    """Modal window grading the due review queue one card at a time"""
+
+    def __init__(self, parent, user_id, on_close=None):
+        super().__init__(parent)
+        self.user_id = user_id
+        self.on_close = on_close
+        self.cards = db.get_review_queue(user_id)
+        self.index = 0
+        self.reviewed = 0
+
+        # Window setup
+        self.title("Topic Review")
+        self.geometry("620x420")
+        self.configure(fg_color=COLORS['background'])
+        self.attributes('-topmost', True)
+        self.grab_set()
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.create_ui()
+        self.show_card()
+
+    def create_ui(self):
+        self.progress_label = ctk.CTkLabel(
+            self, text="", font=("Segoe UI", 13), text_color=COLORS['text_light']
+        )
+        self.progress_label.pack(pady=(25, 5))
+
+        card = ctk.CTkFrame(self, fg_color=COLORS['card'], corner_radius=20,
+                            border_width=1, border_color=COLORS['border'])
+        card.pack(fill="both", expand=True, padx=30, pady=10)
+
+        self.subject_label = ctk.CTkLabel(card, text="", font=("Segoe UI", 14, "bold"))
+        self.subject_label.pack(pady=(30, 5))
+
+        self.topic_label = ctk.CTkLabel(
+            card, text="", font=("Segoe UI Display", 24, "bold"),
+            text_color=COLORS['text'], wraplength=480
+        )
+        self.topic_label.pack(pady=10, padx=20)
+
+        self.detail_label = ctk.CTkLabel(
+            card, text="", font=("Segoe UI", 12), text_color=COLORS['text_light']
+        )
+        self.detail_label.pack(pady=(0, 20))
+
+        self.buttons = ctk.CTkFrame(self, fg_color="transparent")
+        self.buttons.pack(pady=(10, 25))
+        for text, grade, color in GRADE_BUTTONS:
+            ctk.CTkButton(
+                self.buttons, text=text, width=120, height=40, corner_radius=10,
+                fg_color=color, hover_color=COLORS['hover'], text_color=COLORS['background'],
+                font=("Segoe UI Bold", 13),
+                command=lambda g=grade: self.grade(g)
+            ).pack(side="left", padx=6)
+
+    def show_card(self):
+        if self.index >= len(self.cards):
+            self.show_done()
+            return
+        card = self.cards[self.index]
+        self.progress_label.configure(text=f"Card {self.index + 1} of {len(self.cards)} • How well do you remember it?")
+        self.subject_label.configure(text=card.get('subject_name') or "General",
+                                     text_color=card.get('color_code') or COLORS['primary'])
+        self.topic_label.configure(text=card['topic'])
+        if card['last_reviewed']:
+            detail = f"Last reviewed {card['last_reviewed']:%d %b} • {card['repetitions']} reviews, {card['lapses']} lapses"
+        else:
+            detail = "First review"
+        self.detail_label.configure(text=detail)
+
+    def grade(self, grade):
+        card = self.cards[self.index]
+        if db.record_review(card['card_id'], grade) is not None:
+            self.reviewed += 1
+        self.index += 1
+        self.show_card()
+
+    def show_done(self):
+        self.buttons.pack_forget()
+        self.progress_label.configure(text="")
+        self.subject_label.configure(text="")
+        self.topic_label.configure(text="🎉 All caught up!" if self.cards else "Nothing due for review")
+        self.detail_label.configure(text=f"{self.reviewed} topics reviewed" if self.cards else "")
+        ctk.CTkButton(
+            self, text="Close", width=120, fg_color=COLORS['card'], hover_color=COLORS['hover'],
+            text_color=COLORS['text'], command=self.close
+        ).pack(pady=(10, 25))
+
+    def close(self):
+        self.destroy()
+        if self.on_close:
+            self.on_close()
@@ -6,10 +6,13 @@ import customtkinter as ctk
 from tkinter import messagebox
 from database import db
 from config import COLORS
+from markdown_utils import MarkdownParser
 
 class SavedPlansView(ctk.CTkToplevel):
     """Window to view saved study plans"""
     
+    PAGE_SIZE = 10
+    
     def __init__(self, parent, dashboard):
         super().__init__(parent)
         self.dashboard = dashboard
@@ -57,7 +60,7 @@ class SavedPlansView(ctk.CTkToplevel):
         for widget in self.scroll_frame.winfo_children():
             widget.destroy()
             
-        plans = db.get_saved_ai_plans(self.user_id)
+        plans = db.get_saved_ai_plans(self.user_id, limit=self.PAGE_SIZE)
         
         if not plans:
             ctk.CTkLabel(
@@ -68,8 +71,32 @@ class SavedPlansView(ctk.CTkToplevel):
             ).pack(pady=50)
             return
             
+        self.add_plan_page(plans)
+        
+    def add_plan_page(self, plans):
+        """Render a page of plans plus a 'Load older' button if more may exist"""
         for plan in plans:
             self.create_plan_card(plan)
+        
+        if len(plans) == self.PAGE_SIZE:
+            last_id = plans[-1]['plan_id']
+            more_btn = ctk.CTkButton(
+                self.scroll_frame,
+                text="Load older plans",
+                font=("Arial Bold", 13),
+                height=35,
+                fg_color="transparent",
+                hover_color=COLORS['hover'],
+                text_color=COLORS['primary']
+            )
+            more_btn.configure(command=lambda: self.load_older(last_id, more_btn))
+            more_btn.pack(pady=10)
+            
+    def load_older(self, before_id, button):
+        button.destroy()
+        older = db.get_saved_ai_plans(self.user_id, limit=self.PAGE_SIZE, before_id=before_id)
+        if older:
+            self.add_plan_page(older)
             
     def create_plan_card(self, plan):
         card = ctk.CTkFrame(
@@ -238,7 +265,7 @@ class SavedPlansView(ctk.CTkToplevel):
         
         txt = ctk.CTkTextbox(self.viewer, font=("Arial", 14), wrap="word")
         txt.pack(fill="both", expand=True, padx=20, pady=20)
-        txt.insert("1.0", text)
+        MarkdownParser(txt).parse_and_insert(text)
         txt.configure(state="disabled")
         
     def copy_text(self, text):
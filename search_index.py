@@ -0,0 +1,141 @@
+"""
+Search Index Helpers
+FULLTEXT source definitions, boolean-mode query building and result highlighting
+used by DatabaseManager.search_everything.
+"""
+
+import re
+
+# InnoDB ignores tokens shorter than innodb_ft_min_token_size (default 3)
+MIN_TOKEN_LENGTH = 3
+
+# Each searchable source: table, FULLTEXT index and the columns it covers.
+# The MATCH() column list must be identical to the index column list.
+SEARCH_SOURCES = {
+    'notes': {
+        'select': "SELECT n.* {score} FROM quick_notes n",
+        'table': 'quick_notes',
+        'alias': 'n',
+        'id_column': 'note_id',
+        'index': 'ft_quick_notes',
+        'columns': ('note_title', 'note_content')
+    },
+    'chat': {
+        'select': "SELECT c.* {score} FROM chat_history c",
+        'table': 'chat_history',
+        'alias': 'c',
+        'id_column': 'chat_id',
+        'index': 'ft_chat_history',
+        'columns': ('message', 'response')
+    },
+    'sessions': {
+        'select': ("SELECT s.*, sub.subject_name, sub.color_code {score} "
+                   "FROM study_sessions s JOIN subjects sub ON s.subject_id = sub.subject_id"),
+        'table': 'study_sessions',
+        'alias': 's',
+        'id_column': 'session_id',
+        'index': 'ft_study_sessions',
+        'columns': ('topics_covered', 'notes')
+    },
+    'plans': {
+        'select': "SELECT p.plan_id, p.plan_content, p.created_at {score} FROM saved_study_plans p",
+        'table': 'saved_study_plans',
+        'alias': 'p',
+        'id_column': 'plan_id',
+        'index': 'ft_saved_study_plans',
+        'columns': ('plan_content',)
+    }
+}
+
+SEARCH_ORDER = ('subjects', 'notes', 'sessions', 'plans', 'chat')
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(term):
+    """Split a search term into lowercase word tokens"""
+    return [t.lower() for t in _TOKEN.findall(term or '')]
+
+
+def build_boolean_query(term):
+    """
+    Build a MATCH ... AGAINST boolean-mode query: every word required,
+    each matched as a prefix ("chain ru" -> "+chain* +ru*").
+
+    Returns None when no token is long enough for the FULLTEXT index;
+    callers should fall back to a LIKE scan in that case.
+    """
+    tokens = tokenize(term)
+    if not tokens or all(len(t) < MIN_TOKEN_LENGTH for t in tokens):
+        return None
+    # Short tokens are not in the index; requiring them would match nothing
+    return " ".join(f"+{t}*" for t in tokens if len(t) >= MIN_TOKEN_LENGTH)
+
+
+def fulltext_clause(source):
+    """MATCH(...) AGAINST(%s IN BOOLEAN MODE) for a source"""
+    cols = ", ".join(f"{source['alias']}.{c}" for c in source['columns'])
+    return f"MATCH({cols}) AGAINST(%s IN BOOLEAN MODE)"
+
+
+def like_clause(source):
+    """Fallback (col LIKE %s OR col LIKE %s ...) for a source"""
+    return "(" + " OR ".join(f"{source['alias']}.{c} LIKE %s" for c in source['columns']) + ")"
+
+
+def highlight(text, term, width=120):
+    """
+    Build a snippet of `text` around the first match of any search token.
+
+    Args:
+        text: the full field value
+        term: the raw search term
+        width: maximum snippet length (excluding ellipses)
+
+    Returns:
+        (snippet, spans) where spans are the (start, end) offsets of
+        every match inside the returned snippet
+    """
+    text = " ".join(str(text or '').split())
+    tokens = sorted(set(tokenize(term)), key=len, reverse=True)
+    if not text:
+        return "", []
+    if not tokens:
+        return _clip(text, 0, width), []
+
+    pattern = re.compile("|".join(re.escape(t) for t in tokens), re.IGNORECASE)
+    first = pattern.search(text)
+    start = 0
+    if first and first.start() > width // 3:
+        start = max(0, first.start() - width // 3)
+        # Don't cut a word in half
+        space = text.rfind(" ", 0, start + 1)
+        start = space + 1 if space != -1 else start
+    end = min(len(text), start + width)
+
+    snippet = text[start:end]
+    offset = 0
+    if start > 0:
+        snippet = "…" + snippet
+        offset = 1
+    if end < len(text):
+        snippet += "…"
+    spans = [(m.start() - start + offset, m.end() - start + offset)
+             for m in pattern.finditer(text, start, end)]
+    return snippet, spans
+
+
+def mark(snippet, spans, opening="«", closing="»"):
+    """Wrap highlighted spans with marker strings (for plain-text labels)"""
+    out, last = [], 0
+    for s, e in spans:
+        out.append(snippet[last:s])
+        out.append(f"{opening}{snippet[s:e]}{closing}")
+        last = e
+    out.append(snippet[last:])
+    return "".join(out)
+
+
+def _clip(text, start, width):
+    snippet = text[start:start + width]
+    return snippet + "…" if len(text) > start + width else snippet
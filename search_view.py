@@ -5,15 +5,26 @@ Search View - Global Search Results
 import customtkinter as ctk
 from config import COLORS
 from database import db
+from search_index import mark, SEARCH_ORDER
 
 class SearchView:
     """Displays search results from Global Search"""
     
-    def __init__(self, parent, dashboard, search_term):
+    PAGE_SIZE = 20
+    SECTION_TITLES = {
+        'subjects': "📚 Subjects",
+        'notes': "📝 Notes",
+        'sessions': "📅 Study Sessions",
+        'plans': "🧠 Saved Plans",
+        'chat': "💬 Chat History"
+    }
+    
+    def __init__(self, parent, dashboard, search_term, live_search=None):
         self.parent = parent
         self.dashboard = dashboard
         self.search_term = search_term
         self.user_id = dashboard.user['user_id']
+        self.live_search = live_search
         
         self.create_ui()
         self.perform_search()
@@ -29,12 +40,21 @@ class SearchView:
         header = ctk.CTkFrame(self.main_frame, fg_color="transparent")
         header.pack(fill="x", pady=(0, 25))
         
-        ctk.CTkLabel(
+        self.title_label = ctk.CTkLabel(
             header,
             text=f"🔍 Search Results for '{self.search_term}'",
             font=("Arial Black", 24),
             text_color=COLORS['text']
-        ).pack(side="left")
+        )
+        self.title_label.pack(side="left")
+        
+        self.status_label = ctk.CTkLabel(
+            header,
+            text="",
+            font=("Arial", 13),
+            text_color=COLORS['text_light']
+        )
+        self.status_label.pack(side="right")
         
         # Results container (Scrollable)
         self.results_scroll = ctk.CTkScrollableFrame(
@@ -43,63 +63,121 @@ class SearchView:
         )
         self.results_scroll.pack(fill="both", expand=True)
         
+        self.create_sections()
+        
+    def create_sections(self):
+        """One (initially empty) frame per category so streamed results keep their order"""
+        self.sections = {}
+        self.found = {}
+        for category in SEARCH_ORDER:
+            section = ctk.CTkFrame(self.results_scroll, fg_color="transparent", height=0)
+            section.pack(fill="x")
+            self.sections[category] = section
+        self.empty_label = None
+        
+    def update_term(self, search_term):
+        """Re-run the search in place (search-as-you-type)"""
+        self.search_term = search_term
+        self.title_label.configure(text=f"🔍 Search Results for '{search_term}'")
+        for widget in self.results_scroll.winfo_children():
+            widget.destroy()
+        self.create_sections()
+        self.perform_search()
+        
     def perform_search(self):
         """Execute search and display results"""
-        results = db.search_everything(self.user_id, self.search_term)
-        
-        # 1. Subjects
-        if results.get('subjects'):
-            self.create_section_header("📚 Subjects")
-            for sub in results['subjects']:
-                self.create_result_card(
-                    f"{sub['subject_name']} ({sub['subject_code']})",
-                    "Subject",
-                    lambda s=sub: self.dashboard.show_subjects() # Navigate to subjects
-                )
-        
-        # 2. Notes
-        if results.get('notes'):
-            self.create_section_header("📝 Notes")
-            for note in results['notes']:
-                self.create_result_card(
-                    note['note_title'],
-                    f"Note: {note['note_content'][:50]}...",
-                    None # TODO: Open note details
-                )
-                
-        # 3. Chat History
-        if results.get('chat'):
-            self.create_section_header("💬 Chat History")
-            for chat in results['chat']:
-                self.create_result_card(
-                    "AI Conversation",
-                    f"You: {chat['message'][:50]}...\nAI: {chat['response'][:50]}...",
-                    lambda: self.dashboard.show_chatbot()
-                )
-                
+        if self.live_search:
+            # Each category is rendered as soon as its query returns
+            self.status_label.configure(text="Searching...")
+            self.live_search.search(self.search_term, self.show_category,
+                                    self.finish_search, limit=self.PAGE_SIZE)
+            return
+        
+        results = db.search_everything(self.user_id, self.search_term, limit=self.PAGE_SIZE)
+        for category in SEARCH_ORDER:
+            self.show_category(category, results.get(category))
+        self.finish_search()
+        
+    def show_category(self, category, rows):
+        """Render one category's results into its section"""
+        self.found[category] = bool(rows)
+        if not rows:
+            return
+        section = self.sections[category]
+        self.create_section_header(self.SECTION_TITLES[category], parent=section)
+        self.add_results(section, category, rows)
+        
+    def finish_search(self):
+        """Show the empty state once every category has answered"""
+        self.status_label.configure(text="")
+        
         # No results
-        if not any(results.values()):
-            ctk.CTkLabel(
+        if not any(self.found.values()):
+            self.empty_label = ctk.CTkLabel(
                 self.results_scroll,
                 text="No results found.",
                 font=("Arial", 16),
                 text_color=COLORS['text_light']
-            ).pack(pady=50)
+            )
+            self.empty_label.pack(pady=50)
+
+    def add_results(self, section, category, rows, offset=0):
+        """Add result cards for a category, plus a 'Show more' button when the page is full"""
+        for row in rows:
+            self.create_result_card(*self.describe_result(category, row), parent=section)
+        
+        if len(rows) == self.PAGE_SIZE:
+            more_btn = ctk.CTkButton(
+                section,
+                text="Show more",
+                font=("Arial", 13),
+                height=30,
+                fg_color="transparent",
+                hover_color=COLORS['hover'],
+                text_color=COLORS['primary']
+            )
+            more_btn.configure(command=lambda: self.load_more(section, category, offset + self.PAGE_SIZE, more_btn))
+            more_btn.pack(pady=(0, 10))
+
+    def load_more(self, section, category, offset, button):
+        """Fetch the next page of a category and append it to its section"""
+        rows = db.search_category(self.user_id, category, self.search_term,
+                                  limit=self.PAGE_SIZE, offset=offset)
+        button.destroy()
+        self.add_results(section, category, rows, offset)
+
+    def describe_result(self, category, row):
+        """(title, subtitle, command) for a result row"""
+        snippet = mark(row.get('snippet', ''), row.get('highlights', []))
+        
+        if category == 'subjects':
+            return (f"{row['subject_name']} ({row['subject_code']})", "Subject",
+                    lambda: self.dashboard.show_subjects())
+        if category == 'notes':
+            return (row['note_title'], f"Note: {snippet}", None) # TODO: Open note details
+        if category == 'sessions':
+            return (f"{row['subject_name']} • {row['session_date']}", f"Session: {snippet}",
+                    lambda: self.dashboard.show_planner())
+        if category == 'plans':
+            created = row['created_at'].strftime('%b %d, %Y') if row.get('created_at') else ''
+            return (f"Study Plan {created}", snippet, None)
+        return ("AI Conversation", snippet, lambda: self.dashboard.show_chatbot())
 
-    def create_section_header(self, title):
+    def create_section_header(self, title, parent=None):
         """Create section header"""
         ctk.CTkLabel(
-            self.results_scroll,
+            parent or self.results_scroll,
             text=title,
             font=("Arial Bold", 18),
             text_color=COLORS['primary'],
             anchor="w"
         ).pack(fill="x", pady=(20, 10))
         
-    def create_result_card(self, title, subtitle, command):
+    def create_result_card(self, title, subtitle, command, parent=None):
         """Create a result card"""
+        parent = parent or self.results_scroll
         card = ctk.CTkButton(
-            self.results_scroll,
+            parent,
             text="",
             fg_color="white",
             hover_color=COLORS['hover'],
@@ -118,7 +196,7 @@ class SearchView:
         card.destroy() # Re-doing as Frame
         
         card = ctk.CTkFrame(
-            self.results_scroll,
+            parent,
             fg_color="white",
             corner_radius=15,
             height=80
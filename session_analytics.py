@@ -0,0 +1,218 @@
+"""
+Session Analytics - Columnar session statistics
+Sessions are loaded once into parallel array columns sorted by day, plus a
+dense minutes-per-day rollup with prefix sums. Range totals are a
+subtraction, session counts are two bisects, and weekday / rolling / trend
+figures work on slices of the rollup instead of looping over session dicts.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+from itertools import accumulate
+from operator import mul
+import math
+
+from streak_engine import as_date
+
+
+class SessionFrame:
+    """
+    Column store for one user's sessions.
+
+    days     array of date ordinals, ascending
+    minutes  array of durations, aligned with days
+    subject  array of subject codes, aligned with days (index into names)
+    """
+
+    def __init__(self, records=(), rows=None):
+        records = sorted(records, key=lambda r: (r[0], r[4]))
+        self.names = []
+        self.colors = []
+        codes = {}
+        subject = array('l')
+        for _, _, name, color, _ in records:
+            code = codes.get(name)
+            if code is None:
+                code = codes[name] = len(self.names)
+                self.names.append(name)
+                self.colors.append(color)
+            subject.append(code)
+        self.days = array('l', [r[0] for r in records])
+        self.minutes = array('l', [r[1] for r in records])
+        self.subject = subject
+        self.rows = rows
+
+        # Dense rollup: daily[i] = minutes studied on ordinal first + i
+        self.first = self.days[0] if self.days else date.today().toordinal()
+        span = self.days[-1] - self.first + 1 if self.days else 0
+        self.daily = array('l', [0]) * span
+        for day, minutes in zip(self.days, self.minutes):
+            self.daily[day - self.first] += minutes
+        self.prefix = array('q', accumulate(self.daily, initial=0))
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build from session dicts (session_date, duration_minutes, subject_name, ...)"""
+        rows = list(rows or [])
+        records = [_record(r) for r in rows]
+        frame = cls(records)
+        # Keep the dicts in the same order as the columns for rows_between()
+        order = sorted(range(len(rows)), key=lambda i: (records[i][0], records[i][4]))
+        frame.rows = [rows[i] for i in order]
+        return frame
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        """Build from stream_query() chunks without keeping the dicts"""
+        return cls(_record(r) for chunk in chunks for r in chunk)
+
+    def __len__(self):
+        return len(self.days)
+
+    # ---------- Ranges ----------
+
+    def _bounds(self, start=None, end=None):
+        """Index range [lo, hi) of sessions with start <= day <= end"""
+        lo = bisect_left(self.days, as_date(start).toordinal()) if start else 0
+        hi = bisect_right(self.days, as_date(end).toordinal()) if end else len(self.days)
+        return lo, max(lo, hi)
+
+    def _prefix_at(self, ordinal):
+        index = min(max(ordinal - self.first, 0), len(self.daily))
+        return self.prefix[index]
+
+    def total(self, start=None, end=None):
+        """Minutes studied between start and end (inclusive, either optional)"""
+        lo = self._prefix_at(as_date(start).toordinal()) if start else 0
+        hi = self._prefix_at(as_date(end).toordinal() + 1) if end else self.prefix[-1]
+        return hi - lo
+
+    def count(self, start=None, end=None):
+        lo, hi = self._bounds(start, end)
+        return hi - lo
+
+    def rows_between(self, start=None, end=None, newest_first=False):
+        """Session dicts in range (frames built with from_rows only)"""
+        lo, hi = self._bounds(start, end)
+        rows = self.rows[lo:hi]
+        return rows[::-1] if newest_first else rows
+
+    # ---------- Breakdowns ----------
+
+    def by_subject(self, start=None, end=None):
+        """{subject_name: minutes}, largest first"""
+        lo, hi = self._bounds(start, end)
+        totals = [0] * len(self.names)
+        for code, minutes in zip(self.subject[lo:hi], self.minutes[lo:hi]):
+            totals[code] += minutes
+        order = sorted((i for i, t in enumerate(totals) if t), key=totals.__getitem__, reverse=True)
+        return {self.names[i]: totals[i] for i in order}
+
+    def subject_breakdown(self, start=None, end=None):
+        """Rows shaped like get_subject_wise_time()"""
+        lo, hi = self._bounds(start, end)
+        totals = [0] * len(self.names)
+        counts = [0] * len(self.names)
+        for code, minutes in zip(self.subject[lo:hi], self.minutes[lo:hi]):
+            totals[code] += minutes
+            counts[code] += 1
+        order = sorted((i for i, c in enumerate(counts) if c), key=totals.__getitem__, reverse=True)
+        return [{'subject_name': self.names[i], 'color_code': self.colors[i],
+                 'total_minutes': totals[i], 'session_count': counts[i]} for i in order]
+
+    def strongest_weakest(self, start=None, end=None):
+        """(most studied, least studied) subject names, or (None, None)"""
+        totals = self.by_subject(start, end)
+        if not totals:
+            return None, None
+        names = list(totals)
+        return names[0], names[-1]
+
+    def series(self, start, end):
+        """Minutes per day from start to end inclusive, zeros on days without study"""
+        a, b = as_date(start).toordinal(), as_date(end).toordinal()
+        lo, hi = a - self.first, b - self.first + 1
+        inside = self.daily[max(lo, 0):max(min(hi, len(self.daily)), 0)].tolist()
+        before = [0] * min(max(-lo, 0), b - a + 1)
+        after = [0] * (b - a + 1 - len(before) - len(inside))
+        return before + inside + after
+
+    def subject_series(self, start, end):
+        """{subject_name: minutes per day from start to end}, one pass over the range"""
+        a, b = as_date(start).toordinal(), as_date(end).toordinal()
+        lo, hi = self._bounds(start, end)
+        result = {}
+        for code, day, minutes in zip(self.subject[lo:hi], self.days[lo:hi], self.minutes[lo:hi]):
+            values = result.get(code)
+            if values is None:
+                values = result[code] = [0] * (b - a + 1)
+            values[day - a] += minutes
+        return {self.names[code]: values for code, values in result.items()}
+
+    def by_weekday(self, start, end):
+        """Minutes per weekday, Monday first"""
+        values = self.series(start, end)
+        offset = as_date(start).weekday()
+        totals = [0] * 7
+        for k in range(7):
+            totals[(offset + k) % 7] = sum(values[k::7])
+        return totals
+
+    def rolling_average(self, start, end, window=7):
+        """Trailing `window`-day mean for each day from start to end"""
+        first = as_date(start)
+        lead = self.series(first - timedelta(days=window - 1), end)
+        sums = list(accumulate(lead, initial=0))
+        return [(sums[i + window] - sums[i]) / window for i in range(len(lead) - window + 1)]
+
+    # ---------- Scores ----------
+
+    def consistency(self, start, end):
+        """
+        0-100: share of days with any study, discounted by how uneven the
+        active days are (coefficient of variation, capped at 1).
+        """
+        values = self.series(start, end)
+        active = [v for v in values if v]
+        if not active:
+            return 0
+        mean = sum(active) / len(active)
+        spread = math.sqrt(sum((v - mean) ** 2 for v in active) / len(active)) / mean
+        return round(100 * len(active) / len(values) * (1 - min(spread, 1) / 2))
+
+    def trend(self, start, end):
+        """Least-squares slope of minutes per day (positive = studying more)"""
+        values = self.series(start, end)
+        n = len(values)
+        if n < 2:
+            return 0.0
+        sum_x = n * (n - 1) / 2
+        sum_xx = (n - 1) * n * (2 * n - 1) / 6
+        sum_y = sum(values)
+        sum_xy = sum(map(mul, range(n), values))
+        return (n * sum_xy - sum_x * sum_y) / (n * sum_xx - sum_x * sum_x)
+
+
+def _record(row):
+    """(ordinal, minutes, subject, color, start seconds) from a session dict"""
+    return (as_date(row['session_date']).toordinal(), int(row['duration_minutes'] or 0),
+            row.get('subject_name'), row.get('color_code'), _seconds(row.get('start_time')))
+
+
+def _seconds(value):
+    """MySQL TIME arrives as timedelta; start_time is VARCHAR "02:30 PM" (or 24-hour) text"""
+    if value is None:
+        return 0
+    if isinstance(value, timedelta):
+        return int(value.total_seconds())
+    if isinstance(value, (time, datetime)):
+        return value.hour * 3600 + value.minute * 60 + value.second
+    # Same formats as DatabaseManager.build_session_reminders: AM/PM first, then 24-hour
+    for fmt in ("%I:%M %p", "%H:%M", "%H:%M:%S"):
+        try:
+            parsed = datetime.strptime(str(value).strip(), fmt)
+        except ValueError:
+            continue
+        return parsed.hour * 3600 + parsed.minute * 60 + parsed.second
+    return 0
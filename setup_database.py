@@ -1,6 +1,7 @@
 import mysql.connector
 from mysql.connector import Error
 from config import DB_CONFIG
+from search_index import SEARCH_SOURCES
 
 def setup_new_database():
     new_db_name = DB_CONFIG['database']
@@ -54,9 +55,11 @@ def setup_new_database():
                 duration_minutes INT DEFAULT 0,
                 topics_covered TEXT,
                 notes TEXT,
+                client_id VARCHAR(32) NULL,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
-                FOREIGN KEY (subject_id) REFERENCES subjects(subject_id) ON DELETE CASCADE
+                FOREIGN KEY (subject_id) REFERENCES subjects(subject_id) ON DELETE CASCADE,
+                UNIQUE KEY unique_session_client (client_id)
             )""",
             """CREATE TABLE IF NOT EXISTS study_goals (
                 goal_id INT AUTO_INCREMENT PRIMARY KEY,
@@ -99,6 +102,14 @@ def setup_new_database():
                 energy_level INT DEFAULT 50,
                 total_claps INT DEFAULT 0,
                 last_interaction TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_decay DATE,
+                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+            )""",
+            # client_id of every queued pet update already applied, so replays are skipped
+            """CREATE TABLE IF NOT EXISTS pet_updates (
+                client_id VARCHAR(32) PRIMARY KEY,
+                user_id INT NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
             )""",
             """CREATE TABLE IF NOT EXISTS pomodoro_sessions (
@@ -109,8 +120,10 @@ def setup_new_database():
                 total_cycles INT DEFAULT 0,
                 completed_cycles INT DEFAULT 0,
                 total_focus_minutes INT DEFAULT 0,
+                client_id VARCHAR(32) NULL,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+                UNIQUE KEY unique_pomodoro_client (client_id)
             )""",
             """CREATE TABLE IF NOT EXISTS notifications (
                 notification_id INT AUTO_INCREMENT PRIMARY KEY,
@@ -119,8 +132,12 @@ def setup_new_database():
                 message TEXT,
                 priority VARCHAR(20) DEFAULT 'medium',
                 is_read BOOLEAN DEFAULT FALSE,
+                dedup_date DATE NULL,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+                UNIQUE KEY unique_daily_notification (user_id, notification_type, dedup_date),
+                INDEX idx_notification_dedup (dedup_date, notification_type),
+                INDEX idx_notification_created (created_at)
             )""",
             """CREATE TABLE IF NOT EXISTS quick_notes (
                 note_id INT AUTO_INCREMENT PRIMARY KEY,
@@ -129,9 +146,11 @@ def setup_new_database():
                 note_title VARCHAR(255),
                 note_content TEXT,
                 is_pinned BOOLEAN DEFAULT FALSE,
+                client_id VARCHAR(32) NULL,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
-                FOREIGN KEY (subject_id) REFERENCES subjects(subject_id) ON DELETE SET NULL
+                FOREIGN KEY (subject_id) REFERENCES subjects(subject_id) ON DELETE SET NULL,
+                UNIQUE KEY unique_note_client (client_id)
             )""",
             """CREATE TABLE IF NOT EXISTS chat_history (
                 chat_id INT AUTO_INCREMENT PRIMARY KEY,
@@ -139,7 +158,8 @@ def setup_new_database():
                 message TEXT,
                 response TEXT,
                 timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+                INDEX idx_chat_timestamp (timestamp)
             )""",
             """CREATE TABLE IF NOT EXISTS weekly_reports (
                 report_id INT AUTO_INCREMENT PRIMARY KEY,
@@ -152,7 +172,8 @@ def setup_new_database():
                 strongest_subject VARCHAR(100),
                 weakest_subject VARCHAR(100),
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+                UNIQUE KEY unique_weekly_report (user_id, week_start_date)
             )""",
             """CREATE TABLE IF NOT EXISTS motivational_quotes (
                 quote_id INT AUTO_INCREMENT PRIMARY KEY,
@@ -172,7 +193,109 @@ def setup_new_database():
                 message TEXT,
                 reminder_time DATETIME,
                 status ENUM('pending', 'sent') DEFAULT 'pending',
+                reminder_type VARCHAR(50) NULL,
+                dedup_date DATE NULL,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+                UNIQUE KEY unique_daily_reminder (user_id, reminder_type, dedup_date),
+                INDEX idx_reminder_status_time (status, reminder_time)
+            )""",
+            # UNIQUE treats NULLs as distinct, so cards are keyed on subject_key (0 = no subject)
+            """CREATE TABLE IF NOT EXISTS topic_reviews (
+                card_id INT AUTO_INCREMENT PRIMARY KEY,
+                user_id INT NOT NULL,
+                subject_id INT,
+                topic VARCHAR(255) NOT NULL,
+                topic_key CHAR(40) NOT NULL,
+                ease_factor FLOAT DEFAULT 2.5,
+                interval_days INT DEFAULT 0,
+                repetitions INT DEFAULT 0,
+                lapses INT DEFAULT 0,
+                next_due DATE NOT NULL,
+                last_reviewed DATE,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                subject_key INT AS (COALESCE(subject_id, 0)) STORED,
+                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+                FOREIGN KEY (subject_id) REFERENCES subjects(subject_id) ON DELETE CASCADE,
+                UNIQUE KEY unique_topic_card (user_id, subject_key, topic_key),
+                INDEX idx_review_due (user_id, next_due)
+            )""",
+            """CREATE TABLE IF NOT EXISTS user_streaks (
+                user_id INT PRIMARY KEY,
+                current_streak INT DEFAULT 0,
+                longest_streak INT DEFAULT 0,
+                last_active DATE,
+                active_bits BIGINT UNSIGNED DEFAULT 0,
+                study_bits BIGINT UNSIGNED DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+            )""",
+            """CREATE TABLE IF NOT EXISTS activity_calendar (
+                user_id INT NOT NULL,
+                year SMALLINT NOT NULL,
+                day_bits BINARY(46) NOT NULL,
+                minutes BLOB NOT NULL,
+                PRIMARY KEY (user_id, year),
+                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+            )""",
+            """CREATE TABLE IF NOT EXISTS study_forecasts (
+                user_id INT PRIMARY KEY,
+                forecast_date DATE NOT NULL,
+                next_week_minutes INT DEFAULT 0,
+                productivity_score INT DEFAULT 0,
+                at_risk_count INT DEFAULT 0,
+                report TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+            )""",
+            """CREATE TABLE IF NOT EXISTS batch_runs (
+                job_name VARCHAR(50) NOT NULL,
+                run_date DATE NOT NULL,
+                status ENUM('running', 'done', 'failed') DEFAULT 'running',
+                last_user_id INT DEFAULT 0,
+                processed INT DEFAULT 0,
+                failed INT DEFAULT 0,
+                seconds FLOAT DEFAULT 0,
+                started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                finished_at TIMESTAMP NULL,
+                PRIMARY KEY (job_name, run_date)
+            )""",
+            # Archive tables have no foreign keys so they can be RANGE partitioned by month
+            """CREATE TABLE IF NOT EXISTS notifications_archive (
+                notification_id INT NOT NULL,
+                user_id INT NOT NULL,
+                notification_type VARCHAR(50),
+                message TEXT,
+                priority VARCHAR(20),
+                is_read BOOLEAN,
+                dedup_date DATE NULL,
+                created_at DATETIME NOT NULL,
+                archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (notification_id, created_at),
+                INDEX idx_notifications_archive_user (user_id, created_at)
+            )""",
+            """CREATE TABLE IF NOT EXISTS chat_history_archive (
+                chat_id INT NOT NULL,
+                user_id INT NOT NULL,
+                message TEXT,
+                response TEXT,
+                timestamp DATETIME NOT NULL,
+                archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (chat_id, timestamp),
+                INDEX idx_chat_archive_user (user_id, timestamp)
+            )""",
+            """CREATE TABLE IF NOT EXISTS archive_summary (
+                table_name VARCHAR(50) NOT NULL,
+                user_id INT NOT NULL,
+                period DATE NOT NULL,
+                row_count INT DEFAULT 0,
+                PRIMARY KEY (table_name, user_id, period),
+                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+            )""",
+            """CREATE TABLE IF NOT EXISTS notification_counters (
+                user_id INT PRIMARY KEY,
+                unread_count INT NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
                 FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
             )"""
         ]
@@ -188,6 +311,103 @@ def setup_new_database():
         except Error:
             print("🔄 Migrating: Adding student_level column to users table...")
             cursor.execute("ALTER TABLE users ADD COLUMN student_level VARCHAR(50) DEFAULT 'University'")
+        
+        # 6. Full-text search indexes (used by search_everything)
+        for source in SEARCH_SOURCES.values():
+            cursor.execute(f"SHOW INDEX FROM {source['table']} WHERE Key_name = %s", (source['index'],))
+            if not cursor.fetchall():
+                print(f"🔎 Migrating: Adding FULLTEXT index {source['index']}...")
+                cursor.execute(
+                    f"ALTER TABLE {source['table']} ADD FULLTEXT INDEX {source['index']} "
+                    f"({', '.join(source['columns'])})"
+                )
+            
+        # 7. One weekly report per user and week (batch reruns overwrite it)
+        cursor.execute("SHOW INDEX FROM weekly_reports WHERE Key_name = 'unique_weekly_report'")
+        if not cursor.fetchall():
+            print("🔄 Migrating: De-duplicating weekly_reports...")
+            cursor.execute("""
+                DELETE older FROM weekly_reports older
+                JOIN weekly_reports newer
+                  ON older.user_id = newer.user_id AND older.week_start_date = newer.week_start_date
+                 AND older.report_id < newer.report_id
+            """)
+            cursor.execute("ALTER TABLE weekly_reports ADD UNIQUE KEY unique_weekly_report (user_id, week_start_date)")
+        
+        # 8. Pet decay marker (nightly batch)
+        cursor.execute("SHOW COLUMNS FROM study_pet LIKE 'last_decay'")
+        if not cursor.fetchall():
+            print("🔄 Migrating: Adding last_decay column to study_pet table...")
+            cursor.execute("ALTER TABLE study_pet ADD COLUMN last_decay DATE")
+        
+        # 9. Once-per-day notifications/reminders: unique (user, type, day), NULL = not deduplicated
+        cursor.execute("SHOW COLUMNS FROM notifications LIKE 'dedup_date'")
+        if not cursor.fetchall():
+            print("🔄 Migrating: Adding daily dedup key to notifications...")
+            cursor.execute("""
+                ALTER TABLE notifications ADD COLUMN dedup_date DATE NULL,
+                ADD UNIQUE KEY unique_daily_notification (user_id, notification_type, dedup_date),
+                ADD INDEX idx_notification_dedup (dedup_date, notification_type)
+            """)
+        cursor.execute("SHOW COLUMNS FROM reminders LIKE 'dedup_date'")
+        if not cursor.fetchall():
+            print("🔄 Migrating: Adding daily dedup key to reminders...")
+            cursor.execute("""
+                ALTER TABLE reminders ADD COLUMN reminder_type VARCHAR(50) NULL,
+                ADD COLUMN dedup_date DATE NULL,
+                ADD UNIQUE KEY unique_daily_reminder (user_id, reminder_type, dedup_date)
+            """)
+            
+        # 10. Date indexes used by the retention batches
+        for table, index, columns in (("notifications", "idx_notification_created", "created_at"),
+                                      ("reminders", "idx_reminder_status_time", "status, reminder_time"),
+                                      ("chat_history", "idx_chat_timestamp", "timestamp")):
+            cursor.execute(f"SHOW INDEX FROM {table} WHERE Key_name = %s", (index,))
+            if not cursor.fetchall():
+                print(f"🔄 Migrating: Adding index {index}...")
+                cursor.execute(f"ALTER TABLE {table} ADD INDEX {index} ({columns})")
+        
+        # 11. Unread counters start from the current notifications
+        cursor.execute("SELECT 1 FROM notification_counters LIMIT 1")
+        if not cursor.fetchall():
+            cursor.execute("""
+                INSERT IGNORE INTO notification_counters (user_id, unread_count)
+                SELECT user_id, COUNT(*) FROM notifications WHERE is_read = 0 GROUP BY user_id
+            """)
+            if cursor.rowcount:
+                print(f"🔄 Migrating: Seeded unread counters for {cursor.rowcount} users...")
+            
+        # 12. Idempotency keys for writes replayed from the offline queue
+        for table, index in (("study_sessions", "unique_session_client"),
+                             ("pomodoro_sessions", "unique_pomodoro_client"),
+                             ("quick_notes", "unique_note_client")):
+            cursor.execute(f"SHOW COLUMNS FROM {table} LIKE 'client_id'")
+            if not cursor.fetchall():
+                print(f"🔄 Migrating: Adding client_id to {table}...")
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN client_id VARCHAR(32) NULL, "
+                               f"ADD UNIQUE KEY {index} (client_id)")
+        cursor.execute("SHOW COLUMNS FROM study_pet LIKE 'last_client_id'")
+        if cursor.fetchall():
+            print("🔄 Migrating: Replacing study_pet.last_client_id with pet_updates...")
+            cursor.execute("ALTER TABLE study_pet DROP COLUMN last_client_id")
+        
+        # 13. Review cards without a subject are deduplicated too (NULL never matched NULL)
+        cursor.execute("SHOW COLUMNS FROM topic_reviews LIKE 'subject_key'")
+        if not cursor.fetchall():
+            print("🔄 Migrating: De-duplicating review cards without a subject...")
+            cursor.execute("""
+                DELETE newer FROM topic_reviews newer
+                JOIN topic_reviews older
+                  ON older.user_id = newer.user_id AND older.topic_key = newer.topic_key
+                 AND older.subject_id IS NULL AND newer.subject_id IS NULL
+                 AND older.card_id < newer.card_id
+            """)
+            cursor.execute("""
+                ALTER TABLE topic_reviews
+                ADD COLUMN subject_key INT AS (COALESCE(subject_id, 0)) STORED,
+                DROP INDEX unique_topic_card,
+                ADD UNIQUE KEY unique_topic_card (user_id, subject_key, topic_key)
+            """)
             
         # Seed Data (Only if empty)
         cursor.execute("SELECT COUNT(*) FROM motivational_quotes")
@@ -201,9 +421,11 @@ def setup_new_database():
             conn.commit()
         
         print(f"\n✅  SUCCESS! New Database '{new_db_name}' is ready.")
+        return True
         
     except Error as e:
         print(f"\n❌  MySQL Error: {e}")
+        return False
     finally:
         if 'conn' in locals() and conn.is_connected():
             cursor.close()
@@ -0,0 +1,131 @@
+"""
+Spaced Repetition Engine
+SM-2 style scheduling for topics studied in study sessions.
+"""
+
+import re
+import hashlib
+from datetime import date, timedelta
+
+from streak_engine import as_date
+
+# SM-2 defaults
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+FIRST_INTERVAL = 1   # days after first exposure
+SECOND_INTERVAL = 6  # days after first successful review
+
+# Review grades (0-5 as in SM-2). Anything below PASS_GRADE resets the card.
+PASS_GRADE = 3
+GRADES = {
+    'again': 1,
+    'hard': 3,
+    'good': 4,
+    'easy': 5
+}
+
+_TOPIC_SPLIT = re.compile(r'[,;\n\r•|]+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_topic(topic):
+    """Lowercase and collapse whitespace so 'Linear  Algebra' == 'linear algebra'"""
+    return _WHITESPACE.sub(' ', topic).strip().lower()
+
+
+def topic_key(topic):
+    """Fixed-width key for the unique index (topics can be long free text)"""
+    return hashlib.sha1(normalize_topic(topic).encode('utf-8')).hexdigest()
+
+
+def split_topics(topics_covered, max_length=255):
+    """
+    Split the free-text 'topics_covered' field into individual topics.
+
+    "Derivatives, Chain rule; limits" -> ['Derivatives', 'Chain rule', 'limits']
+    Duplicates (case-insensitive) are dropped, original order is kept.
+    """
+    if not topics_covered:
+        return []
+
+    topics = []
+    seen = set()
+    for part in _TOPIC_SPLIT.split(str(topics_covered)):
+        topic = _WHITESPACE.sub(' ', part).strip(" -*.\t")
+        if not topic:
+            continue
+        topic = topic[:max_length]
+        key = normalize_topic(topic)
+        if key in seen:
+            continue
+        seen.add(key)
+        topics.append(topic)
+    return topics
+
+
+def first_due_date(studied_on):
+    """A freshly studied topic is first reviewed the next day"""
+    return as_date(studied_on) + timedelta(days=FIRST_INTERVAL)
+
+
+def schedule_review(card, grade, reviewed_on=None):
+    """
+    Apply one SM-2 review to a card.
+
+    Args:
+        card: dict with 'ease_factor', 'interval_days', 'repetitions', 'lapses'
+        grade: 0-5 quality score (or one of the GRADES names)
+        reviewed_on: review date (defaults to today)
+
+    Returns:
+        dict with the new ease_factor, interval_days, repetitions,
+        lapses, last_reviewed and next_due
+    """
+    if isinstance(grade, str):
+        grade = GRADES[grade]
+    grade = max(0, min(5, int(grade)))
+    reviewed_on = as_date(reviewed_on or date.today())
+
+    ease = float(card.get('ease_factor') or DEFAULT_EASE)
+    interval = int(card.get('interval_days') or 0)
+    repetitions = int(card.get('repetitions') or 0)
+    lapses = int(card.get('lapses') or 0)
+
+    if grade < PASS_GRADE:
+        # Forgotten: start again from the first interval
+        repetitions = 0
+        interval = FIRST_INTERVAL
+        lapses += 1
+    else:
+        if repetitions == 0:
+            interval = FIRST_INTERVAL
+        elif repetitions == 1:
+            interval = SECOND_INTERVAL
+        else:
+            interval = max(1, int(round(interval * ease)))
+        repetitions += 1
+
+    ease += 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02)
+    ease = max(MIN_EASE, round(ease, 3))
+
+    return {
+        'ease_factor': ease,
+        'interval_days': interval,
+        'repetitions': repetitions,
+        'lapses': lapses,
+        'last_reviewed': reviewed_on,
+        'next_due': reviewed_on + timedelta(days=interval)
+    }
+
+
+def build_review_message(cards, total_due=None):
+    """Reminder text for a daily review queue"""
+    if not cards:
+        return None
+    total_due = total_due or len(cards)
+    names = [c['topic'] for c in cards[:3]]
+    preview = ", ".join(f"'{n}'" for n in names)
+    more = total_due - len(names)
+    if more > 0:
+        preview += f" and {more} more"
+    return f"📚 Review time! {total_due} topic{'s' if total_due != 1 else ''} due today: {preview}."
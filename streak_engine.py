@@ -0,0 +1,147 @@
+"""
+Streak Engine - Precomputed study/login streaks
+Each user's streak lives in one compact row: current and longest streak,
+the last active day, and two 64-day bitmaps (any activity / studied)
+anchored at that day. Bit i means "active on last_active - i days".
+"""
+
+from datetime import date, datetime, timedelta
+
+WINDOW_DAYS = 64
+MASK = (1 << WINDOW_DAYS) - 1
+
+
+def empty_state():
+    return {
+        'current_streak': 0,
+        'longest_streak': 0,
+        'last_active': None,
+        'active_bits': 0,
+        'study_bits': 0,
+    }
+
+
+def record_activity(state, day, studied=False):
+    """
+    Return a new state with `day` marked active (and studied, if given).
+
+    Repeat calls for the same day are no-ops, so callers can record every
+    login and every session without inflating the streak. Back-dated days
+    inside the 64-day window are merged in; older ones need recompute().
+    """
+    day = as_date(day)
+    state = dict(state)
+    last = as_date(state['last_active'])
+
+    if last is None or day > last:
+        gap = (day - last).days if last else None
+        shift = min(gap, WINDOW_DAYS) if gap else WINDOW_DAYS
+        state['active_bits'] = ((state['active_bits'] << shift) | 1) & MASK
+        state['study_bits'] = (state['study_bits'] << shift) & MASK
+        if studied:
+            state['study_bits'] |= 1
+        state['current_streak'] = state['current_streak'] + 1 if gap == 1 else 1
+        state['last_active'] = day
+    else:
+        offset = (last - day).days
+        if offset >= WINDOW_DAYS:
+            return state
+        bit = 1 << offset
+        if studied:
+            state['study_bits'] |= bit
+        if not state['active_bits'] & bit:
+            state['active_bits'] |= bit
+            run = _leading_run(state['active_bits'])
+            # A full window means the streak runs past what the bitmap can see
+            state['current_streak'] = run if run < WINDOW_DAYS else max(run, state['current_streak'])
+            # The day may have joined two earlier runs into a longer one
+            state['longest_streak'] = max(state['longest_streak'], _longest_run(state['active_bits']))
+
+    state['longest_streak'] = max(state['longest_streak'], state['current_streak'])
+    return state
+
+
+def recompute(active_days, studied_days=()):
+    """Build a state from scratch (repairs / backfills)"""
+    active = sorted({as_date(d) for d in active_days} | {as_date(d) for d in studied_days})
+    studied = {as_date(d) for d in studied_days}
+    state = empty_state()
+    if not active:
+        return state
+
+    longest = run = 0
+    previous = None
+    for day in active:
+        run = run + 1 if previous and (day - previous).days == 1 else 1
+        longest = max(longest, run)
+        previous = day
+
+    last = active[-1]
+    active_bits = study_bits = 0
+    for day in active:
+        offset = (last - day).days
+        if offset < WINDOW_DAYS:
+            active_bits |= 1 << offset
+            if day in studied:
+                study_bits |= 1 << offset
+
+    state.update({
+        'current_streak': run,
+        'longest_streak': longest,
+        'last_active': last,
+        'active_bits': active_bits,
+        'study_bits': study_bits,
+    })
+    return state
+
+
+def current_streak(state, today=None):
+    """Streak as of today: still alive if the user was active today or yesterday"""
+    last = as_date(state.get('last_active'))
+    if last is None:
+        return 0
+    today = as_date(today) or date.today()
+    return state['current_streak'] if (today - last).days <= 1 else 0
+
+
+def garden(state, days=7, today=None):
+    """One entry per day for the last `days` days, oldest first, gaps included"""
+    today = as_date(today) or date.today()
+    last = as_date(state.get('last_active'))
+    entries = []
+    for i in range(days - 1, -1, -1):
+        day = today - timedelta(days=i)
+        active = studied = False
+        if last is not None:
+            offset = (last - day).days
+            if 0 <= offset < WINDOW_DAYS:
+                active = bool(state['active_bits'] >> offset & 1)
+                studied = bool(state['study_bits'] >> offset & 1)
+        entries.append({'streak_date': day, 'active': active, 'studied': studied,
+                        'flower_level': 2 if studied else 1 if active else 0})
+    return entries
+
+
+def _leading_run(bits):
+    """Number of consecutive set bits starting at bit 0"""
+    return (bits ^ (bits + 1)).bit_length() - 1
+
+
+def _longest_run(bits):
+    """Length of the longest run of consecutive set bits"""
+    longest = 0
+    while bits:
+        bits &= bits << 1
+        longest += 1
+    return longest
+
+
+def as_date(value):
+    """Accept date, datetime, 'YYYY-MM-DD' strings or None"""
+    if value is None or type(value) is date:
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
@@ -0,0 +1,152 @@
+"""
+Study Forecast - Local study-time forecasting and productivity scoring
+Runs over the daily rollups in a SessionFrame: damped-trend exponential
+smoothing with a weekly season predicts next week's minutes per subject,
+productivity is scored against the user's own recent weeks, and subjects
+with a goal due soon but falling study time are flagged as at risk.
+Everything is plain arithmetic over ~12 weeks of days, so it is cheap
+enough to run for every user in the nightly batch.
+"""
+
+from datetime import date, timedelta
+
+from streak_engine import as_date
+
+HISTORY_DAYS = 84        # 12 weeks of daily rollups feed the model
+SEASON = 7               # Weekly rhythm (weekends, lab days, ...)
+BASELINE_WEEKS = 8
+RISK_WINDOW_DAYS = 14    # Goals due within this many days are checked
+RISK_RATIO = 0.6         # Forecast below 60% of the usual pace -> at risk
+MIN_WEEKLY_MINUTES = 30
+DEFAULT_WEEKLY_MINUTES = 14 * 60  # Old fixed 2h/day target, used until a baseline exists
+
+
+def smooth(series, horizon=7, alpha=0.3, beta=0.05, gamma=0.2, phi=0.9, season=SEASON):
+    """
+    Additive Holt-Winters with a damped trend.
+
+    Returns `horizon` non-negative daily predictions following `series`.
+    Histories shorter than two seasons fall back to their mean.
+    """
+    n = len(series)
+    if n < 2 * season:
+        mean = sum(series) / n if n else 0.0
+        return [mean] * horizon
+
+    level = sum(series[:season]) / season
+    trend = (sum(series[season:2 * season]) - sum(series[:season])) / season ** 2
+    seasonal = [v - level for v in series[:season]]
+    for t in range(season, n):
+        y, s = series[t], seasonal[t % season]
+        previous = level
+        level = alpha * (y - s) + (1 - alpha) * (previous + phi * trend)
+        trend = beta * (level - previous) + (1 - beta) * phi * trend
+        seasonal[t % season] = gamma * (y - level) + (1 - gamma) * s
+
+    predictions = []
+    damping = 0.0
+    for h in range(1, horizon + 1):
+        damping += phi ** h
+        predictions.append(max(0.0, level + damping * trend + seasonal[(n + h - 1) % season]))
+    return predictions
+
+
+def weekly_baseline(frame, week_start, weeks=BASELINE_WEEKS):
+    """Average minutes of the user's active weeks before week_start, or None"""
+    totals = [frame.total(week_start - timedelta(weeks=k), week_start - timedelta(weeks=k) + timedelta(days=6))
+              for k in range(1, weeks + 1)]
+    active = [t for t in totals if t]
+    return sum(active) / len(active) if len(active) >= 2 else None
+
+
+def productivity_score(frame, week_start, week_end, today=None):
+    """
+    0-100 for the week: 70% pace against the user's own baseline (pro-rated
+    for a week in progress), 30% consistency of the days so far.
+    """
+    today = today or date.today()
+    last_day = min(week_end, today)
+    if last_day < week_start:
+        return 0
+    elapsed = (last_day - week_start).days + 1
+    expected = (weekly_baseline(frame, week_start) or DEFAULT_WEEKLY_MINUTES) * elapsed / 7
+    pace = frame.total(week_start, last_day) / expected
+    return min(100, round(70 * pace + 0.3 * frame.consistency(week_start, last_day)))
+
+
+def forecast(frame, goals=(), today=None):
+    """Forecast report for the 7 days after today"""
+    today = today or date.today()
+    start = today - timedelta(days=HISTORY_DAYS - 1)
+
+    total = sum(smooth(frame.series(start, today)))
+    by_subject = {name: round(sum(smooth(values)))
+                  for name, values in frame.subject_series(start, today).items()}
+    by_subject = {name: m for name, m in sorted(by_subject.items(), key=lambda x: -x[1])}
+
+    week_start = today - timedelta(days=today.weekday())
+    baseline = weekly_baseline(frame, week_start)
+    usual = frame.by_subject(today - timedelta(days=27), today)
+
+    at_risk = []
+    for goal in goals or ():
+        name, due = goal.get('subject_name'), as_date(goal.get('target_date'))
+        if not name or not due or goal.get('status') == 'completed':
+            continue
+        days_left = (due - today).days
+        if not 0 <= days_left <= RISK_WINDOW_DAYS:
+            continue
+        predicted = by_subject.get(name, 0)
+        usual_weekly = usual.get(name, 0) / 4
+        if predicted < MIN_WEEKLY_MINUTES or predicted < RISK_RATIO * usual_weekly:
+            at_risk.append({'subject_name': name, 'goal_title': goal.get('goal_title'),
+                            'days_left': days_left, 'forecast_minutes': predicted,
+                            'usual_minutes': round(usual_weekly)})
+    at_risk.sort(key=lambda r: r['days_left'])
+
+    return {
+        'forecast_date': today,
+        'next_week_minutes': round(total),
+        'by_subject': by_subject,
+        'baseline_minutes': round(baseline) if baseline else None,
+        'productivity_score': productivity_score(frame, week_start, week_start + timedelta(days=6), today),
+        'consistency': frame.consistency(today - timedelta(days=27), today),
+        'trend': round(frame.trend(today - timedelta(days=27), today) * 7, 1),  # Change in daily minutes per week
+        'at_risk': at_risk,
+        'routine': is_routine(total, baseline, at_risk),
+    }
+
+
+def is_routine(predicted, baseline, at_risk):
+    """Nothing unusual: on pace with the baseline and no deadlines at risk"""
+    if at_risk:
+        return False
+    if not baseline:
+        return True
+    return 0.7 <= predicted / baseline <= 1.3
+
+
+def format_analysis(report):
+    """Readable progress analysis built from a forecast report (no LLM call)"""
+    hours = report['next_week_minutes'] / 60
+    lines = ["📊 Study Progress Analysis", ""]
+    lines.append(f"**Productivity score:** {report['productivity_score']}/100")
+    lines.append(f"**Consistency (last 4 weeks):** {report['consistency']}/100")
+    if report['baseline_minutes']:
+        lines.append(f"**Your usual week:** {report['baseline_minutes'] / 60:.1f} hours")
+    lines.append(f"**Forecast for next week:** {hours:.1f} hours")
+    if report['trend'] > 5:
+        lines.append("📈 Your study time is trending up - great momentum!")
+    elif report['trend'] < -5:
+        lines.append("📉 Your study time is trending down - try to protect a daily slot.")
+
+    if report['by_subject']:
+        lines += ["", "**Expected by subject:**"]
+        lines += [f"- {name}: {minutes / 60:.1f}h" for name, minutes in report['by_subject'].items()]
+
+    if report['at_risk']:
+        lines += ["", "⚠️ **At risk:**"]
+        for risk in report['at_risk']:
+            lines.append(f"- {risk['subject_name']}: \"{risk['goal_title']}\" due in {risk['days_left']} days, "
+                         f"only {risk['forecast_minutes']} min forecast (usually {risk['usual_minutes']} min/week)")
+    return "\n".join(lines)
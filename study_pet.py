@@ -5,6 +5,8 @@ Animated pet that reacts to user's study activity
 
 import customtkinter as ctk
 from database import db
+import event_bus
+from event_bus import bus
 from config import COLORS
 import random
 
@@ -33,6 +35,8 @@ class StudyPet(ctk.CTkFrame):
         
         self.create_ui()
         self.update_pet_mood()
+        # Bars follow the stored values once the write reaches the database
+        bus.subscribe(event_bus.PET_CHANGED, lambda events: self.refresh_pet(), widget=self, user_id=user_id)
     
     def create_ui(self):
         """Create pet widget UI"""
@@ -219,25 +223,21 @@ class StudyPet(ctk.CTkFrame):
     def feed_pet(self):
         """Feed the pet"""
         db.update_pet_status(self.user_id, happiness_change=10, energy_change=5)
-        self.refresh_pet()
         self.change_state('excited', "Yummy! Thanks! 🍪")
     
     def play_with_pet(self):
         """Play with pet"""
         db.update_pet_status(self.user_id, happiness_change=15, energy_change=-10)
-        self.refresh_pet()
         self.change_state('excited', "That was fun! 🎾")
     
     def rest_pet(self):
         """Let pet rest"""
         db.update_pet_status(self.user_id, energy_change=20)
-        self.refresh_pet()
         self.change_state('sleeping', "Zzz... 😴")
     
     def celebrate_task(self):
         """Pet celebrates task completion"""
         db.update_pet_status(self.user_id, happiness_change=20, claps=1)
-        self.refresh_pet()
         self.change_state('clapping', "Well done! 👏")
         
         # Auto return to happy after 3 seconds
@@ -249,7 +249,7 @@ class StudyPet(ctk.CTkFrame):
     
     def refresh_pet(self):
         """Refresh pet data from database"""
-        self.pet_data = db.get_or_create_pet(self.user_id)
+        self.pet_data = db.get_or_create_pet(self.user_id) or self.pet_data
         self.happiness_bar.set(self.pet_data['happiness_level'] / 100)
         self.energy_bar.set(self.pet_data['energy_level'] / 100)
         self.update_pet_mood()
\ No newline at end of file
@@ -7,7 +7,10 @@ import customtkinter as ctk
 from tkinter import messagebox
 from datetime import datetime, date, timedelta
 from database import db
+import event_bus
+from event_bus import bus
 from config import COLORS
+from session_analytics import SessionFrame
 
 # ==================== CUSTOM DIALOGS ====================
 
@@ -174,6 +177,8 @@ class StudyPlanner:
         self.sessions_list = ctk.CTkScrollableFrame(sessions_card, fg_color="transparent")
         self.sessions_list.pack(fill="both", expand=True, padx=25, pady=(0, 25))
         self.load_sessions()
+        bus.subscribe(event_bus.SESSION_EVENTS, lambda events: self.load_sessions(),
+                      widget=self.sessions_list, user_id=self.user_id)
         
         # Right Column (Stats)
         right_column = ctk.CTkFrame(main_frame, fg_color="transparent")
@@ -192,11 +197,11 @@ class StudyPlanner:
         today = date.today()
         week_start = today - timedelta(days=today.weekday())
         week_end = week_start + timedelta(days=6)
-        week_sessions = db.get_sessions_by_date_range(self.user_id, week_start, week_end) or []
-        total_time = sum(s['duration_minutes'] for s in week_sessions)
+        week = db.get_session_frame(self.user_id, week_start, week_end)
+        total_time = week.total()
         
         week_stats = [
-            ("📚", "Sessions", len(week_sessions), COLORS['info']),
+            ("📚", "Sessions", len(week), COLORS['info']),
             ("⏱️", "Total Time", f"{total_time // 60}h {total_time % 60}m", COLORS['success']),
             ("📈", "Avg/Day", f"{total_time // 7}m", COLORS['warning']),
         ]
@@ -251,13 +256,13 @@ class StudyPlanner:
         if all_sessions:
             if self.current_filter == 'all':
                 sessions = all_sessions
-            elif self.current_filter == 'today':
-                sessions = [s for s in all_sessions if s['session_date'] == date.today()]
-            elif self.current_filter == 'week':
+            else:
                 today = date.today()
-                start_week = today - timedelta(days=today.weekday())
-                end_week = start_week + timedelta(days=6)
-                sessions = [s for s in all_sessions if start_week <= s['session_date'] <= end_week]
+                start, end = today, today
+                if self.current_filter == 'week':
+                    start = today - timedelta(days=today.weekday())
+                    end = start + timedelta(days=6)
+                sessions = SessionFrame.from_rows(all_sessions).rows_between(start, end, newest_first=True)
         
         if not sessions:
             empty_frame = ctk.CTkFrame(self.sessions_list, fg_color=COLORS['background'], corner_radius=15, border_width=1, border_color=COLORS['border'])
@@ -292,9 +297,7 @@ class StudyPlanner:
 
     def delete_session(self, session):
         if messagebox.askyesno("Confirm", "Delete this session?", parent=self.parent):
-            if db.delete_session(session['session_id']):
-                self.load_sessions()
-                self.dashboard.refresh_data()
+            db.delete_session(session['session_id'])  # The session_deleted event reloads the list
 
     def show_add_session_dialog(self):
         """Show add session dialog - Fullscreen, Time Picker (No Calendar)"""
@@ -401,8 +404,6 @@ class StudyPlanner:
                 if result:
                     messagebox.showinfo("Success", "Study session added successfully!", parent=dialog)
                     dialog.destroy()
-                    self.load_sessions()
-                    self.dashboard.refresh_data()
                 else:
                     messagebox.showerror("Error", "Failed to add session!", parent=dialog)
             
@@ -6,6 +6,8 @@ Add, Edit, Delete subjects with proper database integration
 import customtkinter as ctk
 from tkinter import messagebox
 from database import db
+import event_bus
+from event_bus import bus
 from config import COLORS
 
 
@@ -26,6 +28,8 @@ class SubjectsManager:
         
         self.create_ui()
         self.load_subjects()
+        bus.subscribe(event_bus.SUBJECT_CHANGED, lambda events: self.load_subjects(),
+                      widget=self.subjects_container, user_id=self.user_id)
     
     def create_ui(self):
         """Create subjects interface"""
@@ -439,8 +443,6 @@ class SubjectsManager:
                         parent=dialog
                     )
                     dialog.destroy()
-                    self.load_subjects()
-                    self.dashboard.refresh_data()
                 else:
                     messagebox.showerror(
                         "Database Error",
@@ -606,11 +608,9 @@ class SubjectsManager:
                 selected_color["value"]
             )
             
-            if result:
+            if result is not None:  # UPDATE/DELETE report lastrowid 0
                 messagebox.showinfo("Success", "Subject updated!", parent=dialog)
                 dialog.destroy()
-                self.load_subjects()
-                self.dashboard.refresh_data()
             else:
                 messagebox.showerror("Error", "Failed to update!", parent=dialog)
         
@@ -636,9 +636,7 @@ class SubjectsManager:
         
         if response:
             result = db.delete_subject(subject['subject_id'])
-            if result:
+            if result is not None:
                 messagebox.showinfo("Success", "Subject deleted successfully!")
-                self.load_subjects()
-                self.dashboard.refresh_data()
             else:
                 messagebox.showerror("Error", "Failed to delete subject!")
\ No newline at end of file
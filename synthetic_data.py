@@ -0,0 +1,221 @@
+"""
+Synthetic Data Generator
+Seeded, realistic-looking study data for benchmarks and load tests.
+Never point this at a production database.
+"""
+
+import random
+from datetime import date, datetime, timedelta
+
+SUBJECTS = {
+    'Mathematics': ['Limits', 'Derivatives', 'Chain rule', 'Integrals', 'Series', 'Matrices', 'Eigenvalues'],
+    'Physics': ['Kinematics', 'Newton laws', 'Energy', 'Momentum', 'Waves', 'Optics', 'Thermodynamics'],
+    'Chemistry': ['Atomic structure', 'Bonding', 'Stoichiometry', 'Equilibrium', 'Kinetics', 'Organic reactions'],
+    'Biology': ['Cell structure', 'Photosynthesis', 'Genetics', 'Evolution', 'Ecology', 'Human anatomy'],
+    'Computer Science': ['Recursion', 'Sorting', 'Graphs', 'Dynamic programming', 'Databases', 'Networking'],
+    'History': ['World War I', 'Cold War', 'Industrial revolution', 'Renaissance', 'Ancient Rome'],
+    'English': ['Essay structure', 'Poetry analysis', 'Grammar', 'Shakespeare', 'Rhetoric'],
+    'Economics': ['Supply and demand', 'Elasticity', 'Market structures', 'Inflation', 'Fiscal policy'],
+}
+COLORS = ['#3498db', '#e74c3c', '#2ecc71', '#9b59b6', '#f39c12', '#1abc9c', '#e67e22', '#34495e']
+LEVELS = ['High School', 'University', 'Graduate']
+FIRST_NAMES = ['Ali', 'Sara', 'John', 'Maria', 'Chen', 'Fatima', 'Lucas', 'Aisha', 'Noah', 'Emma',
+               'Omar', 'Zara', 'Leo', 'Hina', 'Ivan', 'Mei', 'Yusuf', 'Nora', 'Raj', 'Sofia']
+LAST_NAMES = ['Khan', 'Smith', 'Garcia', 'Wang', 'Ahmed', 'Silva', 'Brown', 'Ivanova', 'Patel', 'Kim']
+CHAT_PROMPTS = [
+    "Can you explain {topic} in simple terms?",
+    "Generate 5 practice questions on {topic}",
+    "What are common mistakes when studying {topic}?",
+    "Give me a study plan for {subject} this week",
+    "How do I remember {topic} for my exam?",
+]
+MOODS = ['happy', 'motivated', 'tired', 'stressed', 'focused', 'neutral']
+
+# Named presets: total study_sessions rows (roughly) -> per-user volumes
+SCALES = {
+    '1k': {'users': 10, 'sessions': 100, 'notes': 20, 'chats': 30, 'reminders': 20},
+    '10k': {'users': 50, 'sessions': 200, 'notes': 40, 'chats': 60, 'reminders': 40},
+    '100k': {'users': 200, 'sessions': 500, 'notes': 80, 'chats': 150, 'reminders': 100},
+    '1m': {'users': 1000, 'sessions': 1000, 'notes': 100, 'chats': 300, 'reminders': 200},
+    '10m': {'users': 5000, 'sessions': 2000, 'notes': 200, 'chats': 500, 'reminders': 400},
+}
+
+BATCH_SIZE = 5000
+PASSWORD = "Bench123!"  # every seeded user shares it so load tests can log in
+
+
+class SyntheticDataGenerator:
+    """Deterministic generator: the same seed always yields the same rows"""
+
+    def __init__(self, seed=42, days=365, today=None):
+        self.rng = random.Random(seed)
+        self.days = days
+        self.today = today or date.today()
+
+    # ---------- Single records ----------
+
+    def user(self, index, prefix='bench'):
+        first = self.rng.choice(FIRST_NAMES)
+        last = self.rng.choice(LAST_NAMES)
+        username = f"{prefix}_{index:07d}"
+        return {
+            'username': username,
+            'email': f"{username}@example.com",
+            'full_name': f"{first} {last}",
+            'student_level': self.rng.choice(LEVELS),
+        }
+
+    def subjects(self, count=None):
+        names = self.rng.sample(list(SUBJECTS), count or self.rng.randint(3, 6))
+        return [(name, name[:4].upper() + str(self.rng.randint(100, 499)), self.rng.choice(COLORS))
+                for name in names]
+
+    def session(self, subject_name, day=None):
+        """Evening-heavy start times, 25-150 minute sessions, 1-3 topics"""
+        day = day or self.study_day()
+        hour = min(23, max(6, int(self.rng.gauss(17, 3))))
+        minute = self.rng.choice((0, 15, 30, 45))
+        duration = self.rng.choice((25, 30, 45, 50, 60, 60, 90, 120, 150))
+        start = datetime(day.year, day.month, day.day, hour, minute)
+        end = start + timedelta(minutes=duration)
+        topics = ", ".join(self.rng.sample(SUBJECTS.get(subject_name, ['Review']),
+                                           k=min(len(SUBJECTS.get(subject_name, ['Review'])),
+                                                 self.rng.randint(1, 3))))
+        notes = self.rng.choice(['', '', 'Went well', 'Need to revise', f'Practice more {topics.split(",")[0]}'])
+        return {
+            'session_date': day,
+            'start_time': start.strftime("%H:%M"),
+            'end_time': end.strftime("%H:%M"),
+            'duration_minutes': duration,
+            'topics_covered': topics,
+            'notes': notes,
+        }
+
+    def note(self, subject_name):
+        topic = self.rng.choice(SUBJECTS.get(subject_name, ['General']))
+        words = self.rng.randint(20, 120)
+        body = " ".join(self.rng.choice(('key', 'idea', topic.lower(), 'formula', 'example',
+                                         'remember', 'definition', 'proof', 'step', 'result'))
+                        for _ in range(words))
+        return {'note_title': f"{topic} notes", 'note_content': body}
+
+    def chat(self, subject_name):
+        topic = self.rng.choice(SUBJECTS.get(subject_name, ['studying']))
+        message = self.rng.choice(CHAT_PROMPTS).format(topic=topic, subject=subject_name)
+        response = (f"**{topic}** is an important part of {subject_name}. "
+                    + " ".join(f"{i + 1}. Review {topic.lower()} step {i + 1}." for i in range(self.rng.randint(2, 8))))
+        return {'message': message, 'response': response}
+
+    def reminder_time(self):
+        """Mix of past-due (pending) and upcoming reminders"""
+        return datetime.now() + timedelta(minutes=self.rng.randint(-3 * 24 * 60, 7 * 24 * 60))
+
+    def mood(self):
+        return self.rng.choice(MOODS)
+
+    def study_day(self):
+        """Recent days are more likely than old ones"""
+        offset = min(self.days - 1, int(self.rng.expovariate(1 / (self.days / 4))))
+        return self.today - timedelta(days=offset)
+
+    # ---------- Bulk seeding ----------
+
+    def seed_database(self, db, users=10, sessions=100, notes=20, chats=30, reminders=20,
+                      prefix='bench', progress=None):
+        """
+        Insert users and their data in large executemany batches.
+
+        Returns the list of created user_ids.
+        """
+        password_hash = db.hash_password(PASSWORD)
+        user_rows = []
+        for i in range(users):
+            u = self.user(i, prefix)
+            user_rows.append((u['username'], u['email'], password_hash, u['full_name'], u['student_level']))
+        self._insert_batches(db, """
+            INSERT IGNORE INTO users (username, email, password_hash, full_name, student_level)
+            VALUES (%s, %s, %s, %s, %s)
+        """, user_rows, 'users', progress)
+
+        rows = db.execute_query(
+            "SELECT user_id FROM users WHERE username LIKE %s ORDER BY user_id",
+            (f"{prefix}\\_%",), fetch=True
+        ) or []
+        user_ids = [r['user_id'] for r in rows][:users]
+
+        subject_rows = []
+        for user_id in user_ids:
+            for name, code, color in self.subjects():
+                subject_rows.append((user_id, name, code, color))
+        self._insert_batches(db, """
+            INSERT INTO subjects (user_id, subject_name, subject_code, color_code)
+            VALUES (%s, %s, %s, %s)
+        """, subject_rows, 'subjects', progress)
+
+        subjects = {}
+        for chunk in db.stream_query(
+                "SELECT user_id, subject_id, subject_name FROM subjects WHERE user_id BETWEEN %s AND %s",
+                (min(user_ids), max(user_ids)) if user_ids else (0, -1)):
+            for r in chunk:
+                subjects.setdefault(r['user_id'], []).append((r['subject_id'], r['subject_name']))
+
+        def per_user(count, build):
+            for user_id in user_ids:
+                owned = subjects.get(user_id) or []
+                if not owned:
+                    continue
+                for _ in range(count):
+                    yield build(user_id, self.rng.choice(owned))
+
+        def session_row(user_id, subject):
+            s = self.session(subject[1])
+            return (user_id, subject[0], s['session_date'], s['start_time'], s['end_time'],
+                    s['duration_minutes'], s['topics_covered'], s['notes'])
+
+        def note_row(user_id, subject):
+            n = self.note(subject[1])
+            return (user_id, subject[0], n['note_title'], n['note_content'])
+
+        def chat_row(user_id, subject):
+            c = self.chat(subject[1])
+            return (user_id, c['message'], c['response'])
+
+        def reminder_row(user_id, subject):
+            return (user_id, f"⏰ Study {subject[1]}", self.reminder_time())
+
+        self._insert_batches(db, """
+            INSERT INTO study_sessions
+            (user_id, subject_id, session_date, start_time, end_time,
+             duration_minutes, topics_covered, notes)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """, per_user(sessions, session_row), 'study_sessions', progress)
+        self._insert_batches(db, """
+            INSERT INTO quick_notes (user_id, subject_id, note_title, note_content)
+            VALUES (%s, %s, %s, %s)
+        """, per_user(notes, note_row), 'quick_notes', progress)
+        self._insert_batches(db, """
+            INSERT INTO chat_history (user_id, message, response) VALUES (%s, %s, %s)
+        """, per_user(chats, chat_row), 'chat_history', progress)
+        self._insert_batches(db, """
+            INSERT INTO reminders (user_id, message, reminder_time) VALUES (%s, %s, %s)
+        """, per_user(reminders, reminder_row), 'reminders', progress)
+
+        return user_ids
+
+    @staticmethod
+    def _insert_batches(db, query, rows, table, progress=None):
+        batch, total = [], 0
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                db.execute_many(query, batch)
+                total += len(batch)
+                batch = []
+                if progress:
+                    progress(table, total)
+        if batch:
+            db.execute_many(query, batch)
+            total += len(batch)
+        if progress:
+            progress(table, total)
+        return total
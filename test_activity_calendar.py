@@ -0,0 +1,39 @@
+import unittest
+from datetime import date
+import activity_calendar as cal
+
+class TestActivityCalendar(unittest.TestCase):
+    def test_packing_roundtrip(self):
+        print("\n🗓️ Testing packed calendar...")
+        bits, minutes = cal.build({date(2024, 1, 1): 30, date(2024, 12, 31): 90})
+        self.assertEqual((len(bits), len(minutes)), (cal.BITMAP_BYTES, cal.MINUTES_BYTES))
+        values = cal.decode_minutes(minutes)
+        self.assertEqual((values[0], values[365], sum(values)), (30, 90, 120))
+        flags = cal.decode_bits(bits)
+        self.assertEqual([i for i, f in enumerate(flags) if f], [0, 365])
+        print("✅ 778 bytes per user-year")
+
+    def test_add_and_remove_minutes(self):
+        bits, minutes = cal.empty()
+        day = date(2025, 3, 1)
+        bits, minutes = cal.add_minutes(bits, minutes, day, 45)
+        bits, minutes = cal.add_minutes(bits, minutes, day, 15)
+        self.assertEqual(cal.decode_minutes(minutes)[cal.day_index(day)], 60)
+        self.assertTrue(cal.decode_bits(bits)[cal.day_index(day)])
+        bits, minutes = cal.add_minutes(bits, minutes, day, -60)
+        self.assertFalse(cal.decode_bits(bits)[cal.day_index(day)])
+        self.assertEqual(sum(cal.decode_minutes(minutes)), 0)
+
+    def test_heatmap_layout(self):
+        cells = cal.year_cells(2025, [0] * cal.DAYS)
+        self.assertEqual(len(cells), 365)
+        first, last = cells[0], cells[-1]
+        self.assertEqual((first[0], first[1]), (0, 2))  # 1 Jan 2025 was a Wednesday
+        self.assertEqual(last[0], 52)
+        levels = cal.intensity_levels([0, 10, 20, 30, 40, 500])
+        self.assertEqual(levels[0], 0)
+        self.assertEqual(levels[-1], cal.LEVELS)
+        self.assertEqual(sorted(levels), levels)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from datetime import date
+import batch_jobs
+
+class FakeDB:
+    """Just the batch checkpoint API, kept in memory"""
+    def __init__(self, users):
+        self.users = users
+        self.runs = {}
+
+    def get_user_id_batch(self, after_user_id=0, limit=500):
+        return [u for u in self.users if u > after_user_id][:limit]
+
+    def get_batch_run(self, job_name, run_date):
+        run = self.runs.get((job_name, run_date))
+        return dict(run) if run else None
+
+    def start_batch_run(self, job_name, run_date, restart=False):
+        run = self.runs.setdefault((job_name, run_date), {'last_user_id': 0, 'processed': 0, 'failed': 0, 'seconds': 0.0})
+        if restart:
+            run.update(last_user_id=0, processed=0, failed=0, seconds=0.0)
+        run['status'] = 'running'
+        return dict(run)
+
+    def checkpoint_batch_run(self, job_name, run_date, last_user_id, processed, failed, seconds, status='running'):
+        self.runs[(job_name, run_date)].update(last_user_id=last_user_id, processed=processed,
+                                               failed=failed, seconds=seconds, status=status)
+
+class TestBatchJobs(unittest.TestCase):
+    def setUp(self):
+        self.day = date(2025, 6, 15)
+        self.db = FakeDB(list(range(1, 26)))
+        self.seen = []
+
+    def job(self, crash_at=None):
+        def work(db, user_id, day):
+            if user_id == crash_at:
+                raise RuntimeError("boom")
+            self.seen.append(user_id)
+        return batch_jobs.Job('test', "test job", per_user=work)
+
+    def test_resume_from_checkpoint_after_crash(self):
+        print("\n🌙 Testing batch checkpoints...")
+        chunk_job = batch_jobs.Job('chunked', "chunked", per_chunk=lambda db, ids, day: self.fail_on(ids, 13))
+        result = batch_jobs.run_job(self.db, chunk_job, self.day, chunk_size=10, workers=2)
+        self.assertIn('error', result)
+        self.assertEqual(self.db.runs[('chunked', self.day)]['last_user_id'], 10)
+
+        result = batch_jobs.run_job(self.db, batch_jobs.Job('chunked', "chunked", per_chunk=lambda db, ids, day: self.seen.extend(ids)),
+                                    self.day, chunk_size=10, workers=2)
+        self.assertEqual(self.seen, list(range(11, 26)))
+        self.assertEqual(result['processed'], 25)
+        print("✅ Resumed after user 10")
+
+    def fail_on(self, ids, bad):
+        if bad in ids:
+            raise RuntimeError("connection lost")
+
+    def test_done_job_is_skipped_unless_forced(self):
+        batch_jobs.run_job(self.db, self.job(), self.day, chunk_size=7, workers=3)
+        self.assertEqual(sorted(self.seen), list(range(1, 26)))
+        self.assertTrue(batch_jobs.run_job(self.db, self.job(), self.day)['skipped'])
+        batch_jobs.run_job(self.db, self.job(), self.day, force=True)
+        self.assertEqual(len(self.seen), 50)
+
+    def test_user_failures_are_counted_not_fatal(self):
+        result = batch_jobs.run_job(self.db, self.job(crash_at=5), self.day, chunk_size=10)
+        self.assertEqual((result['processed'], result['failed']), (25, 1))
+        self.assertEqual(self.db.runs[('test', self.day)]['status'], 'done')
+
+    def test_set_based_job_reruns_same_day(self):
+        calls = []
+        job = batch_jobs.Job('nudges', "set-based", per_run=lambda db, day: calls.append(day) or 7)
+        self.assertEqual(batch_jobs.run_job(self.db, job, self.day)['processed'], 7)
+        batch_jobs.run_job(self.db, job, self.day)
+        self.assertEqual(len(calls), 2)  # Dedup keys, not checkpoints, stop repeats
+
+if __name__ == '__main__':
+    unittest.main()
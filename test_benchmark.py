@@ -0,0 +1,38 @@
+import unittest
+from benchmark import compare, percentile, summarize
+from load_test import LatencyHistogram
+from synthetic_data import SyntheticDataGenerator
+
+class TestBenchmark(unittest.TestCase):
+    def test_percentiles(self):
+        print("\n📊 Testing percentiles...")
+        samples = list(range(100, 0, -1))
+        self.assertEqual(percentile(samples, 50), 50)
+        self.assertEqual(percentile(samples, 95), 95)
+        self.assertEqual(percentile(samples, 99), 99)
+        self.assertEqual(summarize([4.0])['p99'], 4.0)
+        print("✅ Nearest-rank percentiles correct")
+
+    def test_regression_detection(self):
+        baseline = {'results': {'a': {'p95': 10.0}, 'b': {'p95': 10.0}}}
+        results = {'a': {'p95': 11.0}, 'b': {'p95': 15.0}, 'c': {'p95': 1.0}}
+        self.assertEqual(compare(results, baseline, threshold=0.2), ['b'])
+
+    def test_generator_is_deterministic(self):
+        print("\n🌱 Testing seeded generator...")
+        a, b = SyntheticDataGenerator(7), SyntheticDataGenerator(7)
+        self.assertEqual([a.session('Physics') for _ in range(20)],
+                         [b.session('Physics') for _ in range(20)])
+        self.assertEqual(a.chat('Biology'), b.chat('Biology'))
+        print("✅ Same seed, same data")
+
+    def test_load_histogram_buckets(self):
+        h = LatencyHistogram()
+        for ms in (0.4, 1.5, 3, 3.9, 100):
+            h.record(ms)
+        h.record(7, error=True)
+        self.assertEqual(h.buckets(), {1: 1, 2: 1, 4: 2, 8: 1, 128: 1})
+        self.assertEqual(h.summary()['errors'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
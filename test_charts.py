@@ -0,0 +1,63 @@
+import unittest
+import charts
+
+class FakeCanvas:
+    """Records canvas calls without Tk"""
+    def __init__(self):
+        self.items = {}
+        self.created = 0
+        self.moved = 0
+        self.deleted = 0
+
+    def _create(self, *coords, **options):
+        self.created += 1
+        self.items[self.created] = (coords, options)
+        return self.created
+
+    create_line = create_oval = create_arc = create_rectangle = create_text = _create
+
+    def coords(self, item_id, *coords):
+        self.moved += 1
+        self.items[item_id] = (coords, self.items[item_id][1])
+
+    def itemconfigure(self, item_id, **options):
+        self.items[item_id][1].update(options)
+
+    def delete(self, item_id):
+        self.deleted += 1
+        del self.items[item_id]
+
+class TestCharts(unittest.TestCase):
+    def test_pie_layout(self):
+        print("\n📈 Testing chart layouts...")
+        slices = charts.pie_layout((1, 1, 2), 150, 150, 100)
+        self.assertEqual([round(e) for _, e in slices], [-90, -90, -180])
+        self.assertEqual([round(s) for s, _ in slices], [90, 0, -90])
+        self.assertEqual(charts.pie_layout((0, 0), 150, 150, 100), ())
+        points = charts.line_layout((0, 5, 10), 400, 250)
+        self.assertEqual(points[0], (30, 220))
+        self.assertEqual(points[-1], (370, 30))
+
+    def test_items_reused_between_updates(self):
+        canvas = FakeCanvas()
+        chart = charts.LineChart(canvas, 400, 250, "#000", "#fff", "#111", "#222")
+        labels = tuple(str(i) for i in range(365))
+        chart.update(labels, tuple(range(365)))
+        created = canvas.created
+        self.assertLess(created, 20)  # One polyline, no per-day markers
+        self.assertFalse(chart.update(labels, tuple(range(365))))
+        chart.update(labels, tuple(reversed(range(365))))
+        self.assertEqual(canvas.created, created)
+        self.assertGreater(canvas.moved, 0)
+        print(f"✅ 365-day redraw reused {created} canvas items")
+
+    def test_stale_items_deleted(self):
+        canvas = FakeCanvas()
+        chart = charts.PieChart(canvas, 300, 300, "#000")
+        chart.update((1, 2, 3), ("#a", "#b", "#c"))
+        chart.update((1, 2), ("#a", "#d"))
+        self.assertEqual(len(canvas.items), 2)
+        self.assertEqual(canvas.items[2][1]['fill'], "#d")
+
+if __name__ == '__main__':
+    unittest.main()
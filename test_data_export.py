@@ -0,0 +1,92 @@
+import json
+import os
+import re
+import tempfile
+import unittest
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+import data_export
+import data_import
+
+class FakeDB:
+    """stream_query over in-memory tables (a UNION reads each FROM table); `down` fails like an unreachable server"""
+    def __init__(self, tables):
+        self.tables = tables
+        self.down = False
+        self.params = []
+
+    def stream_query(self, query, params=None, chunk_size=1000):
+        if self.down:
+            raise ConnectionError("Could not connect to the database")
+        self.params.append(params)
+        rows = [row for table in re.findall(r"FROM (\w+)", query) for row in self.tables.get(table, [])]
+        for start in range(0, len(rows), chunk_size):
+            yield rows[start:start + chunk_size]
+
+class TestDataExport(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        sessions = [{'session_id': i, 'session_date': date(2025, 6, i), 'duration_minutes': 30 + i,
+                     'notes': None, 'subject_name': "Math"} for i in range(1, 6)]
+        moods = [{'mood_type': "happy", 'mood_date': date(2025, 6, 1), 'score': Decimal("1.5"),
+                  'created_at': datetime(2025, 6, 1, 8, 30)}]
+        self.db = FakeDB({'study_sessions': sessions, 'mood_tracker': moods})
+        self.progress = []
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def export(self, fmt, name):
+        path = os.path.join(self.dir.name, name)
+        rows = data_export.export_user_data(self.db, 1, path, fmt, chunk_size=2,
+                                            progress=lambda *args: self.progress.append(args))
+        return path, rows
+
+    def test_csv_sections_read_back_by_importer(self):
+        print("\n📤 Testing streaming CSV export...")
+        path, rows = self.export('csv', "export.csv")
+        self.assertEqual(rows, 6)
+        records = list(data_import.iter_records(path))
+        self.assertEqual([table for table, _ in records], ['study_sessions'] * 5 + ['mood_tracker'])
+        self.assertEqual(records[0][1], {'session_id': "1", 'session_date': "2025-06-01",
+                                         'duration_minutes': "31", 'notes': "", 'subject_name': "Math"})
+        self.assertEqual(self.progress[-1], (None, len(data_export.EXPORT_TABLES),
+                                             len(data_export.EXPORT_TABLES), 6))
+        print("✅ 6 rows in 2 sections, read back by the importer")
+
+    def test_zip_has_one_csv_per_table(self):
+        path, _ = self.export('zip', "export.zip")
+        with zipfile.ZipFile(path) as archive:
+            self.assertEqual(len(archive.namelist()), len(data_export.EXPORT_TABLES))
+            self.assertEqual(archive.read("subjects.csv"), b"")
+        self.assertEqual(sum(1 for table, _ in data_import.iter_records(path) if table == 'study_sessions'), 5)
+
+    def test_jsonl_encodes_mysql_types(self):
+        path, rows = self.export('jsonl', "export.jsonl")
+        with open(path, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), rows)
+        self.assertEqual(lines[-1], {'table': 'mood_tracker', 'row': {
+            'mood_type': "happy", 'mood_date': "2025-06-01", 'score': 1.5,
+            'created_at': "2025-06-01T08:30:00"}})
+
+    def test_archived_rows_are_exported(self):
+        self.db.tables['chat_history'] = [{'chat_id': 9, 'message': "new"}]
+        self.db.tables['chat_history_archive'] = [{'chat_id': 2, 'message': "old"}]
+        path, _ = self.export('jsonl', "export.jsonl")
+        with open(path, encoding='utf-8') as f:
+            chats = [line['row'] for line in map(json.loads, f) if line['table'] == 'chat_history']
+        self.assertIn({'chat_id': 2, 'message': "old"}, chats)
+        self.assertEqual(len(chats), 2)
+        self.assertIn((1, 1), self.db.params)  # user_id bound on both sides of the UNION
+
+    def test_failed_read_fails_the_export(self):
+        self.db.down = True
+        with self.assertRaises(ConnectionError):
+            self.export('csv', "export.csv")
+        with self.assertRaises(ValueError):
+            self.export('xml', "export.xml")
+
+if __name__ == '__main__':
+    unittest.main()
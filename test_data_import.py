@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+import data_import
+from data_import import StudyDataImporter, ImportErrorRow
+
+class FakeDB:
+    """Subjects and batch transactions kept in memory; fail_on makes that flush fail once"""
+    def __init__(self, subjects=()):
+        self.subjects = [{'subject_id': i, 'subject_name': name} for i, name in enumerate(subjects, start=1)]
+        self.sessions = []
+        self.transactions = 0
+        self.fail_on = None
+
+    def get_user_subjects(self, user_id):
+        return list(self.subjects)
+
+    def add_subject(self, user_id, subject_name, subject_code=None, color_code='#3498db'):
+        subject_id = len(self.subjects) + 1
+        self.subjects.append({'subject_id': subject_id, 'subject_name': subject_name})
+        return subject_id
+
+    def build_session_reminders(self, session_date, start_time, duration_minutes, topics_covered):
+        return []
+
+    def execute_transaction(self, statements):
+        self.transactions += 1
+        if self.transactions == self.fail_on:
+            return False
+        for query, params_list in statements:
+            if query == data_import.INSERTS['study_sessions']:
+                self.sessions.extend(params_list)
+        return True
+
+    def recompute_streaks(self, user_ids=None):
+        pass
+
+    def rebuild_activity_calendar(self, user_ids=None):
+        pass
+
+class TestDataImport(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.db = FakeDB(["Math"])
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def write_csv(self, rows):
+        path = os.path.join(self.dir.name, "sessions.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("Subject,Date,Start,End,Topics\n")
+            f.writelines(f"{row}\n" for row in rows)
+        return path
+
+    def test_normalize_and_parse(self):
+        print("\n📥 Testing import row parsing...")
+        row = StudyDataImporter.normalize({' Course ': ' Math ', 'Duration (mins)': '45', 'notes': '  '})
+        self.assertEqual(row, {'subject_name': 'Math', 'duration_minutes': '45', 'notes': None})
+        self.assertEqual(StudyDataImporter.normalize({'subject_name': 101})['subject_name'], "101")
+        for bad in (["Math"], {'name': "Math"}, True):
+            with self.assertRaises(ImportErrorRow):
+                StudyDataImporter.normalize({'subject': bad})
+
+        self.assertEqual(StudyDataImporter.parse_date("06/15/2025"), date(2025, 6, 15))
+        self.assertEqual(StudyDataImporter.parse_date("2025-06-15T09:00:00"), date(2025, 6, 15))
+        self.assertEqual(StudyDataImporter.parse_time("9:30 AM"), "9:30 AM")
+        self.assertEqual(StudyDataImporter.minutes_between("23:30", "00:15"), 45)
+        for parse, value in ((StudyDataImporter.parse_date, "15.06.2025"),
+                             (StudyDataImporter.parse_time, "half past nine"),
+                             (StudyDataImporter.parse_int, "lots")):
+            with self.assertRaises(ImportErrorRow):
+                parse(value)
+        print("✅ Aliases, coercion and date/time parsing OK")
+
+    def test_bad_subject_is_reported_not_raised(self):
+        path = os.path.join(self.dir.name, "sessions.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"subject": ["Math"], "date": "2024-01-02", "duration": 30}\n')
+            f.write('{"subject": "Math", "date": "2024-01-03", "duration": 30}\n')
+        report = StudyDataImporter(self.db, 1).import_file(path)
+        self.assertEqual(report['imported'], {'study_sessions': 1})
+        self.assertEqual(report['errors'], [[1, 'study_sessions', "subject_name must be text, not list"]])
+
+    def test_subjects_resolved_case_insensitively_and_created_once(self):
+        importer = StudyDataImporter(self.db, 1)
+        self.assertEqual(importer.resolve_subject(" math "), 1)
+        self.assertEqual(importer.resolve_subject("Physics"), 2)
+        self.assertEqual(importer.resolve_subject("PHYSICS"), 2)
+        self.assertEqual([s['subject_name'] for s in self.db.subjects], ["Math", "Physics"])
+
+    def test_batches_and_resume_from_checkpoint(self):
+        print("\n📥 Testing batched import with resume...")
+        path = self.write_csv([f"Math,2024-01-{day:02d},09:00,10:00,Topic {day}" for day in range(1, 6)])
+        self.db.fail_on = 2  # Second batch (records 3-4) fails
+        with self.assertRaises(RuntimeError):
+            StudyDataImporter(self.db, 1, batch_size=2).import_file(path)
+        self.assertEqual(len(self.db.sessions), 2)
+        self.assertTrue(os.path.exists(StudyDataImporter.checkpoint_path(path)))
+
+        report = StudyDataImporter(self.db, 1, batch_size=2).import_file(path)
+        self.assertEqual([s[2] for s in self.db.sessions], [date(2024, 1, day) for day in range(1, 6)])
+        self.assertEqual(self.db.sessions[0][5], 60)  # Duration from start/end
+        self.assertEqual((report['imported'], report['position']), ({'study_sessions': 5}, 5))
+        self.assertFalse(os.path.exists(StudyDataImporter.checkpoint_path(path)))
+        print("✅ Resumed after record 2 without duplicates")
+
+if __name__ == '__main__':
+    unittest.main()
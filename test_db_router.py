@@ -0,0 +1,57 @@
+import unittest
+from db_router import ReplicaRouter, lag_seconds
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+class TestReplicaRouter(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.primary = {'host': 'primary', 'user': 'app', 'database': 'planner'}
+        self.router = ReplicaRouter(self.primary, [{'host': 'r1'}, {'host': 'r2'}],
+                                    sticky_seconds=5, retry_after=30, max_lag_seconds=10, clock=self.clock)
+
+    def hosts(self, read=True):
+        return [c['host'] for c in self.router.candidates(read)]
+
+    def test_reads_rotate_writes_and_recent_writers_use_primary(self):
+        print("\n🔀 Testing replica routing...")
+        self.assertEqual(self.hosts(read=False), ['primary'])
+        self.assertEqual(self.hosts(), ['r1', 'r2', 'primary'])
+        self.assertEqual(self.hosts(), ['r2', 'r1', 'primary'])
+        self.assertEqual(self.router.candidates()[0]['database'], 'planner')  # Inherited
+
+        self.router.note_write()
+        self.assertEqual(self.router.sticky_seconds, 10)  # Never shorter than the allowed lag
+        self.clock.now += 9
+        self.assertEqual(self.hosts(), ['primary'])  # Read-your-writes
+        self.clock.now += 2
+        self.assertEqual(len(self.hosts()), 3)
+        print("✅ Reads split across replicas, sticky after writes")
+
+    def test_failover_and_recovery(self):
+        r1, r2 = self.router.replicas
+        self.router.mark_down(r1)
+        self.assertEqual(self.hosts(), ['r2', 'primary'])
+        self.router.record_lag(r2, 45)
+        self.assertEqual(self.hosts(), ['primary'])
+        self.clock.now += 31
+        self.router.record_lag(r2, 2)
+        self.assertEqual(sorted(self.hosts()), ['primary', 'r1', 'r2'])
+        self.assertEqual(lag_seconds({'Seconds_Behind_Master': 3}), 3)
+        self.assertIsNone(lag_seconds({'Seconds_Behind_Source': None}))
+        self.assertIsNone(lag_seconds(None))
+
+    def test_health_check_claimed_once_per_interval(self):
+        self.assertTrue(self.router.health_due())
+        self.assertFalse(self.router.health_due())
+        self.clock.now += 31
+        self.assertTrue(self.router.health_due())
+        self.assertFalse(ReplicaRouter(self.primary, clock=self.clock).health_due())
+
+if __name__ == '__main__':
+    unittest.main()
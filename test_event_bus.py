@@ -0,0 +1,66 @@
+import threading
+import unittest
+import event_bus
+from event_bus import EventBus
+
+class FakeRoot:
+    """Collects after() callbacks; run() plays the Tk event loop"""
+    def __init__(self):
+        self.callbacks = []
+        self.alive = True
+
+    def after(self, ms, fn):
+        self.callbacks.append(fn)
+
+    def winfo_exists(self):
+        return self.alive
+
+    def run(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for fn in callbacks:
+            fn()
+
+class TestEventBus(unittest.TestCase):
+    def setUp(self):
+        self.bus = EventBus()
+        self.root = FakeRoot()
+        self.batches = []
+
+    def test_burst_is_coalesced_on_tk_thread(self):
+        print("\n📣 Testing event bus...")
+        self.bus.attach(self.root)
+        self.bus.subscribe(event_bus.NOTIFICATION_EVENTS, self.batches.append, user_id=1)
+        threads = [threading.Thread(target=self.bus.publish, args=(event_bus.NOTIFICATION_ADDED, 1))
+                   for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(self.batches, [])  # Nothing runs off the Tk thread
+        self.assertEqual(len(self.root.callbacks), 1)
+        self.root.run()
+        self.assertEqual([len(b) for b in self.batches], [20])
+        print("✅ 20 events -> 1 refresh")
+
+    def test_filters_and_widget_lifetime(self):
+        widget = FakeRoot()
+        self.bus.attach(self.root)
+        self.bus.subscribe(event_bus.SESSION_ADDED, self.batches.append, widget=widget, user_id=1)
+        self.bus.publish(event_bus.SESSION_ADDED, 2)
+        self.bus.publish(event_bus.GOAL_CHANGED, 1)
+        self.root.run()
+        self.assertEqual(self.batches, [])
+
+        widget.alive = False
+        self.bus.publish(event_bus.SESSION_ADDED, 1)
+        self.root.run()
+        self.assertEqual(self.batches, [])
+        self.assertEqual(self.bus._subscriptions, [])
+
+    def test_without_root_delivers_immediately(self):
+        self.bus.subscribe(event_bus.SUBJECT_CHANGED, self.batches.append)
+        self.bus.publish(event_bus.SUBJECT_CHANGED, 3, subject_id=7)
+        self.assertEqual(self.batches, [[{'type': 'subject_changed', 'user_id': 3, 'subject_id': 7}]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import importlib.util
+import os
+import subprocess
+import sys
+import unittest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Cumulative import budget for what the login window needs before it paints
+LOGIN_IMPORT_BUDGET_MS = 600
+# Must never be pulled in just to show the login screen
+DEFERRED_MODULES = ('mysql', 'database', 'setup_database', 'dashboard', 'groq', 'pystray', 'signup')
+
+
+def import_profile(module):
+    """Run `python -X importtime -c 'import module'` -> {name: cumulative_us}"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=HERE, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise AssertionError(result.stderr[-2000:])
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split(':', 1)[1].split('|')
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+class TestImportTime(unittest.TestCase):
+    def test_groq_client_is_lazy(self):
+        print("\n⏱️ Checking groq_service import...")
+        timings = import_profile('groq_service')
+        self.assertNotIn('groq', timings)
+        print("✅ groq is only imported on first AI request")
+
+    @unittest.skipUnless(importlib.util.find_spec('customtkinter'), "customtkinter not installed")
+    def test_login_import_budget(self):
+        print("\n⏱️ Checking login import budget...")
+        timings = import_profile('login')
+        for name in DEFERRED_MODULES:
+            self.assertNotIn(name, timings, f"{name} is imported before the login window paints")
+        login_ms = timings['login'] / 1000
+        self.assertLess(login_ms, LOGIN_IMPORT_BUDGET_MS)
+        print(f"✅ login imports in {login_ms:.0f} ms")
+
+if __name__ == '__main__':
+    unittest.main()
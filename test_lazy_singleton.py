@@ -0,0 +1,51 @@
+import threading
+import time
+import unittest
+from lazy_singleton import LazySingleton
+
+class Service:
+    created = 0
+
+    def __init__(self):
+        time.sleep(0.01)  # Widen the race window
+        Service.created += 1
+        self.closed = False
+
+    def ping(self):
+        return "pong"
+
+    def close(self):
+        self.closed = True
+
+class TestLazySingleton(unittest.TestCase):
+    def setUp(self):
+        Service.created = 0
+
+    def test_created_on_first_use_only_once(self):
+        print("\n💤 Testing lazy, thread-safe creation...")
+        proxy = LazySingleton(Service, "svc")
+        self.assertFalse(proxy.is_initialized)
+        self.assertEqual(Service.created, 0)
+
+        threads = [threading.Thread(target=proxy.ping) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(Service.created, 1)
+        self.assertEqual(proxy.ping(), "pong")
+        print("✅ One instance, built on first call")
+
+    def test_inject_and_close(self):
+        proxy = LazySingleton(Service, "svc")
+        fake = Service()
+        proxy.set(fake)
+        self.assertIs(proxy.get(), fake)
+
+        proxy.close()
+        self.assertTrue(fake.closed)
+        self.assertFalse(proxy.is_initialized)
+        self.assertIsNot(proxy.get(), fake)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+from live_search import PrefixIndex
+
+class TestPrefixIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = PrefixIndex([
+            "Linear Algebra", "Calculus", "Chain rule", "chain rule",
+            "Chemistry  lab", None, "", "Linear regression",
+        ])
+
+    def test_suggests_phrases_and_words_by_frequency(self):
+        print("\n🔤 Testing prefix suggestions...")
+        self.assertEqual(self.index.suggest("ch"), ["Chain", "Chain rule", "Chemistry", "Chemistry lab"])
+        self.assertEqual(self.index.suggest("LIN"), ["Linear", "Linear Algebra", "Linear regression"])
+        self.assertEqual(self.index.suggest("ch", limit=1), ["Chain"])
+        print("✅ Most frequent, then shortest terms first")
+
+    def test_prefix_normalization_and_misses(self):
+        self.assertEqual(self.index.suggest("  chain   r"), ["Chain rule"])
+        self.assertEqual(self.index.suggest("chain rule"), [])  # Exact match is not a suggestion
+        # The exact hit "Chain" (most frequent) does not take one of the slots
+        self.assertEqual(self.index.suggest("chain", limit=1), ["Chain rule"])
+        self.assertEqual(self.index.suggest("zz"), [])
+        self.assertEqual(self.index.suggest("   "), [])
+
+    def test_rebuild_replaces_the_vocabulary(self):
+        self.assertTrue(self.index.suggest("cal"))
+        self.assertFalse(self.index.is_stale)
+        self.index.rebuild(["Physics"])
+        self.assertEqual(self.index.suggest("cal"), [])
+        self.assertEqual(self.index.suggest("ph"), ["Physics"])
+        self.assertEqual(len(self.index), 1)
+        self.assertTrue(PrefixIndex().is_stale)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from markdown_utils import MarkdownParser, tokenize
+
+class FakeText:
+    """Minimal stand-in for tk.Text: records inserted (text, tags) pairs"""
+    def __init__(self):
+        self.spans = []
+
+    def tag_config(self, *args, **kwargs):
+        pass
+
+    def insert(self, index, *args):
+        self.spans.extend(zip(args[0::2], args[1::2]))
+
+    def text(self):
+        return "".join(t for t, _ in self.spans)
+
+class TestMarkdownParser(unittest.TestCase):
+    def test_block_formatting(self):
+        print("\n📝 Testing block formatting...")
+        spans = tokenize("# Title\n## Sub\n- item\n1. first")
+        self.assertEqual(spans[0], ("Title\n", ("h1",)))
+        self.assertEqual(spans[1], ("Sub\n", ("h2",)))
+        self.assertEqual(spans[2], ("• item\n1. first\n", ("bullet",)))
+        print("✅ Headers and lists tagged")
+
+    def test_inline_formatting(self):
+        print("\n✨ Testing inline formatting...")
+        spans = tokenize("a **b** *c* `d`")
+        self.assertIn(("b", ("bold",)), spans)
+        self.assertIn(("c", ("italic",)), spans)
+        self.assertIn(("d", ("code",)), spans)
+        self.assertIn(("x", ("bold", "bullet")), tokenize("- **x**"))
+        print("✅ Bold, italic and code tagged")
+
+    def test_streaming_matches_full_render(self):
+        print("\n📡 Testing incremental append...")
+        text = "# Plan\nDay 1: **Math**\n- review *limits*\nDone"
+
+        full = FakeText()
+        MarkdownParser(full).parse_and_insert(text)
+
+        streamed = FakeText()
+        parser = MarkdownParser(streamed)
+        for i in range(0, len(text), 5):
+            parser.append(text[i:i + 5])
+        parser.flush()
+
+        self.assertEqual(full.text(), streamed.text())
+        print("✅ Streamed render matches full render")
+
+    def test_cache(self):
+        self.assertIs(tokenize("same **text**"), tokenize("same **text**"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+import offline_queue
+from offline_queue import WriteQueue, SyncWorker
+
+class FakeDB:
+    """MySQL stand-in: up/down switch and a list of applied writes"""
+    def __init__(self):
+        self.up = True
+        self.applied = []
+        self.reject = set()
+        self.drop_after = None  # Link drops after this many replays
+        self.crash_after = None  # Process dies after this many replays
+
+    def ping(self):
+        return self.up
+
+    def replay_write(self, method, args, kwargs):
+        if self.drop_after is not None and len(self.applied) >= self.drop_after:
+            raise offline_queue.ConnectionLost(method)
+        if self.crash_after is not None and len(self.applied) >= self.crash_after:
+            raise SystemExit("killed")
+        if not self.up or args[-1] in self.reject:
+            return None
+        self.applied.append((method, args, kwargs))
+        return len(self.applied)
+
+class TestOfflineQueue(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "queue.db")
+        self.queue = WriteQueue(self.path)
+        self.db = FakeDB()
+        self.set_aside = []
+        self.worker = SyncWorker(self.db, self.queue, batch_size=10, max_attempts=3,
+                                 on_failed=lambda entry, error: self.set_aside.append(entry['args'][2]))
+
+    def tearDown(self):
+        self.queue.close()
+        self.dir.cleanup()
+
+    def test_writes_survive_restart_and_sync_in_order(self):
+        print("\n💾 Testing offline write queue...")
+        self.db.up = False
+        for i in range(15):
+            self.queue.enqueue('add_mood', (1, f"mood{i}"), {'mood_date': date(2025, 6, 15)})
+        self.assertEqual(self.worker.sync_once(), (0, False, False))
+        self.assertFalse(self.worker.online)
+
+        self.queue.close()
+        self.queue = WriteQueue(self.path)  # App restarted
+        self.worker.queue = self.queue
+        self.db.up = True
+        self.assertEqual(self.worker.sync_once(), (10, True, True))
+        self.assertEqual(self.worker.sync_once(), (5, True, False))
+        self.assertEqual([a[1][1] for a in self.db.applied], [f"mood{i}" for i in range(15)])
+        self.assertEqual(self.db.applied[0][2], {'mood_date': date(2025, 6, 15)})
+        self.assertEqual(self.queue.count(), 0)
+        print("✅ 15 writes replayed in order after reconnect")
+
+    def test_bad_write_is_set_aside_after_retries(self):
+        for name in ("a", "bad", "c"):
+            self.queue.enqueue('add_note', (1, "title", name))
+        self.db.reject.add("bad")
+        self.assertEqual(self.worker.sync_once()[:2], (1, False))  # Stops at "bad", keeps order
+        self.worker.sync_once()
+        self.worker.sync_once()  # Third failure sets it aside; "c" goes through
+        self.assertEqual([a[1][2] for a in self.db.applied], ["a", "c"])
+        self.assertEqual((self.queue.count(), self.queue.count('failed')), (0, 1))
+        self.assertEqual(self.set_aside, ["bad"])
+        self.assertEqual(self.queue.retry_failed(), 1)
+
+    def test_dropped_connection_does_not_count_as_attempt(self):
+        for name in ("a", "b", "c"):
+            self.queue.enqueue('add_note', (1, "title", name))
+        self.db.drop_after = 1
+        self.assertEqual(self.worker.sync_once(), (1, False, False))
+        for _ in range(4):  # More drops than max_attempts
+            self.assertEqual(self.worker.sync_once(), (0, False, False))
+            self.assertFalse(self.worker.online)
+        self.assertEqual((self.queue.count(), self.queue.count('failed')), (2, 0))
+        self.assertEqual(self.queue.peek()[0]['attempts'], 0)
+        self.db.drop_after = None
+        self.assertEqual(self.worker.sync_once(), (2, True, False))
+        self.assertEqual(self.set_aside, [])
+
+    def test_crash_mid_batch_keeps_applied_entries_acked(self):
+        for name in ("a", "b", "c"):
+            self.queue.enqueue('add_note', (1, "title", name))
+        self.db.crash_after = 2
+        with self.assertRaises(SystemExit):
+            self.worker.sync_once()
+        self.assertEqual([e['args'][2] for e in self.queue.peek()], ["c"])  # Only "c" replays
+        self.db.crash_after = None
+        self.worker.sync_once()
+        self.assertEqual([a[1][2] for a in self.db.applied], ["a", "b", "c"])
+
+    def test_local_reads_round_trip_mysql_types(self):
+        row = {'session_date': date(2025, 6, 15), 'start_time': timedelta(hours=9, minutes=30),
+               'created_at': datetime(2025, 6, 15, 8, 0), 'avg': Decimal("1.50")}
+        key = offline_queue.read_key('get_user_sessions', (1,), {'limit': 10})
+        self.assertIs(self.queue.cached(key), offline_queue.MISSING)
+        self.queue.remember(key, [row])
+        self.assertEqual(self.queue.cached(key), [row])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+from query_metrics import QueryMetrics, fingerprint
+
+class TestQueryMetrics(unittest.TestCase):
+    def test_fingerprint(self):
+        print("\n🔎 Testing SQL fingerprints...")
+        a = fingerprint("SELECT * FROM users\n  WHERE user_id = %s AND name = 'bob' LIMIT 10")
+        b = fingerprint("SELECT * FROM users WHERE user_id = 42 AND name = 'alice' LIMIT 5")
+        self.assertEqual(a, b)
+        self.assertEqual(a, "SELECT * FROM users WHERE user_id = ? AND name = ? LIMIT ?")
+        self.assertEqual(fingerprint("SELECT 1 FROM t WHERE id IN (1, 2, 3)"),
+                         "SELECT ? FROM t WHERE id IN (?, ...)")
+        print("✅ Literals normalized")
+
+    def test_aggregation_and_slow_log(self):
+        print("\n⏱️ Testing aggregation...")
+        m = QueryMetrics(slow_query_ms=100)
+        events = []
+        m.add_listener(events.append)
+        m.record('get_user_subjects', "SELECT * FROM subjects WHERE user_id = %s", 0.002, rows=5)
+        m.record('get_user_subjects', "SELECT * FROM subjects WHERE user_id = 7", 0.3, rows=3)
+        m.record('delete_note', "DELETE FROM quick_notes WHERE note_id = %s", 0.001, error="boom")
+        snap = m.snapshot()
+        top = snap['queries'][0]
+        self.assertEqual((top['caller'], top['count'], top['rows']), ('get_user_subjects', 2, 8))
+        self.assertEqual(snap['queries'][1]['errors'], 1)
+        self.assertEqual(len(snap['slow_queries']), 1)
+        self.assertEqual(len(events), 3)
+        print("✅ Stats grouped by caller and fingerprint")
+
+    def test_prometheus_export(self):
+        m = QueryMetrics(slow_query_ms=None)
+        m.record('get_leaderboard', "SELECT 1", 0.004)
+        m.record_connect(0.01)
+        text = m.to_prometheus()
+        self.assertIn('study_planner_query_duration_seconds_bucket{caller="get_leaderboard",query="SELECT ?",le="0.005"} 1', text)
+        self.assertIn('le="+Inf"} 1', text)
+        self.assertIn("study_planner_db_connect_seconds_count 1", text)
+
+if __name__ == '__main__':
+    unittest.main()
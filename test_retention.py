@@ -0,0 +1,62 @@
+import unittest
+from datetime import date, datetime
+import retention
+
+class FakeDB:
+    """Expired rows as (id, date), with just the retention API"""
+    def __init__(self, rows):
+        self.rows = {table: dict(r) for table, r in rows.items()}
+        self.batches = []
+
+    def get_expired_ids(self, table, key, date_column, cutoff, where="", limit=1000):
+        return sorted(i for i, d in self.rows.get(table, {}).items() if d < cutoff)[:limit]
+
+    def archive_rows(self, table, key, date_column, ids, archive=None, columns=None):
+        self.batches.append((table, len(ids), archive))
+        for i in ids:
+            del self.rows[table][i]
+        return len(ids)
+
+    def purge_archive_rows(self, archive, date_column, cutoff, limit=1000):
+        return 0
+
+class TestRetention(unittest.TestCase):
+    def test_partition_plan(self):
+        print("\n🧹 Testing retention...")
+        self.assertEqual(retention.to_days(date(2007, 10, 7)), 733321)  # MySQL docs example
+        today = date(2025, 6, 15)
+        parts = retention.initial_partitions(today, 2)
+        self.assertEqual([p.split()[1] for p in parts], ['p_old', 'p202506', 'p202507', 'p202508', 'pmax'])
+
+        existing = [('p_old', date(2023, 6, 1)), ('p202306', date(2023, 7, 1)),
+                    ('p202307', date(2023, 8, 1)), ('pmax', None)]
+        to_add, to_drop = retention.plan_partitions(existing, today, 1, keep_days=700)
+        self.assertEqual(to_add[0], date(2023, 8, 1))
+        self.assertEqual(to_add[-1], date(2025, 7, 1))
+        self.assertEqual(to_drop, ['p_old', 'p202306'])  # Cutoff is 2023-07-16
+        self.assertEqual(retention.plan_partitions(existing[:1] + [('p202508', date(2025, 9, 1)), ('pmax', None)],
+                                                   today, 2)[0], [])
+
+    def test_policies(self):
+        result = retention.policies({'notifications': {'days': 60, 'action': 'archive'},
+                                     'reminders': {'days': 30, 'action': 'archive'}})
+        self.assertEqual(result['reminders']['action'], 'delete')  # No archive table
+        self.assertEqual(result['chat_history']['action'], 'keep')
+        with self.assertRaises(ValueError):
+            retention.policies({'notifications': {'days': 1, 'action': 'shred'}})
+
+    def test_batched_run(self):
+        now = datetime(2025, 6, 15)
+        db = FakeDB({'notifications': {i: datetime(2025, 1, 1) for i in range(1, 251)},
+                     'reminders': {1: datetime(2025, 6, 14)}})
+        settings = {'notifications': {'days': 60, 'action': 'archive'},
+                    'reminders': {'days': 30, 'action': 'delete'},
+                    'batch_size': 100, 'pause_ms': 0, 'archive_keep_days': None}
+        report = retention.run_retention(db, settings, now)
+        self.assertEqual(report, {'notifications': 250, 'reminders': 0})
+        self.assertEqual([b[1] for b in db.batches], [100, 100, 50])
+        self.assertEqual(db.batches[0][2], 'notifications_archive')
+        print("✅ 250 notifications archived in 3 batches")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from search_index import (SEARCH_SOURCES, build_boolean_query, fulltext_clause, highlight,
+                          like_clause, mark, tokenize)
+
+class TestSearchIndex(unittest.TestCase):
+    def test_boolean_query_prefixes_every_word(self):
+        print("\n🔎 Testing boolean-mode query building...")
+        self.assertEqual(tokenize("Chain RULE, limits"), ["chain", "rule", "limits"])
+        self.assertEqual(build_boolean_query("Chain rule"), "+chain* +rule*")
+        self.assertEqual(build_boolean_query("chain ru"), "+chain*")  # "ru" is below the index's token size
+        print("✅ Every token required, matched as a prefix")
+
+    def test_operator_characters_are_not_passed_through(self):
+        query = build_boolean_query('+c++ -"exam" (notes)* @2 ~x <y> derivative\'s')
+        self.assertEqual(query, "+exam* +notes* +derivative*")
+        for operator in '-"()@~<>':
+            self.assertNotIn(operator, query)
+
+    def test_short_terms_fall_back_to_like(self):
+        self.assertIsNone(build_boolean_query("ab"))
+        self.assertIsNone(build_boolean_query("a b c"))
+        self.assertIsNone(build_boolean_query("  ** "))
+        source = SEARCH_SOURCES['notes']
+        self.assertEqual(like_clause(source), "(n.note_title LIKE %s OR n.note_content LIKE %s)")
+        self.assertEqual(fulltext_clause(source),
+                         "MATCH(n.note_title, n.note_content) AGAINST(%s IN BOOLEAN MODE)")
+
+    def test_highlight_spans_every_match(self):
+        print("\n🔎 Testing snippet highlighting...")
+        snippet, spans = highlight("The  chain rule\nfor CHAIN functions", "chain")
+        self.assertEqual(snippet, "The chain rule for CHAIN functions")
+        self.assertEqual(mark(snippet, spans), "The «chain» rule for «CHAIN» functions")
+        print("✅ Case-insensitive matches marked in the snippet")
+
+    def test_highlight_centres_long_text_on_first_match(self):
+        text = "word " * 40 + "target here and more words after that to fill " * 3
+        snippet, spans = highlight(text, "target", width=60)
+        self.assertTrue(snippet.startswith("…word "))
+        self.assertTrue(snippet.endswith("…"))
+        self.assertEqual(len(snippet), 62)
+        self.assertEqual([snippet[s:e] for s, e in spans], ["target"])
+
+    def test_highlight_edge_cases(self):
+        self.assertEqual(highlight(None, "chain"), ("", []))
+        self.assertEqual(highlight("x" * 10, "", width=4), ("xxxx…", []))
+        snippet, spans = highlight("Chain rule", "chain ch")  # Longer token wins
+        self.assertEqual([snippet[s:e] for s, e in spans], ["Chain"])
+
+if __name__ == '__main__':
+    unittest.main()
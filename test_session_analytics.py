@@ -0,0 +1,60 @@
+import time
+import unittest
+from datetime import date, timedelta
+from session_analytics import SessionFrame
+
+def session(day, minutes, subject="Math", start="09:00:00"):
+    return {'session_date': day, 'duration_minutes': minutes, 'subject_name': subject,
+            'color_code': "#fff", 'start_time': start}
+
+class TestSessionAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.monday = date(2025, 3, 3)
+        self.frame = SessionFrame.from_rows([
+            session(self.monday, 30),
+            session(self.monday, 60, "Physics", "14:00:00"),
+            session(self.monday + timedelta(days=2), 45, "Physics"),
+            session(self.monday + timedelta(days=9), 20),
+        ])
+
+    def test_totals_and_breakdowns(self):
+        print("\n📊 Testing columnar session stats...")
+        f = self.frame
+        self.assertEqual((len(f), f.total()), (4, 155))
+        self.assertEqual(f.total(self.monday, self.monday + timedelta(days=6)), 135)
+        self.assertEqual(f.count(self.monday + timedelta(days=1)), 2)
+        self.assertEqual(f.total(date(2020, 1, 1), date(2020, 1, 31)), 0)
+        self.assertEqual(f.by_subject(), {"Physics": 105, "Math": 50})
+        self.assertEqual(f.strongest_weakest(), ("Physics", "Math"))
+        self.assertEqual(f.by_weekday(self.monday, self.monday + timedelta(days=13)), [90, 0, 65, 0, 0, 0, 0])
+        series = f.series(self.monday - timedelta(days=2), self.monday + timedelta(days=2))
+        self.assertEqual(series, [0, 0, 90, 0, 45])
+        self.assertEqual(f.rolling_average(self.monday, self.monday, window=2), [45.0])
+        self.assertLess(f.trend(self.monday, self.monday + timedelta(days=9)), 0)
+
+    def test_rows_between_newest_first(self):
+        rows = self.frame.rows_between(self.monday, self.monday, newest_first=True)
+        self.assertEqual([r['start_time'] for r in rows], ["14:00:00", "09:00:00"])
+
+    def test_am_pm_start_times_sort_by_time_of_day(self):
+        frame = SessionFrame.from_rows([session(self.monday, 30, start=start)
+                                        for start in ("02:30 PM", "09:15 AM", "12:05 PM", "07:45", "bad")])
+        rows = frame.rows_between(self.monday, self.monday)
+        self.assertEqual([r['start_time'] for r in rows], ["bad", "07:45", "09:15 AM", "12:05 PM", "02:30 PM"])
+
+    def test_large_history(self):
+        start = date(2015, 1, 1)
+        rows = [session(start + timedelta(days=i % 3650), 30 + i % 90, f"S{i % 8}") for i in range(100000)]
+        frame = SessionFrame.from_rows(rows)
+        t = time.perf_counter()
+        end = start + timedelta(days=3649)
+        frame.total(start, end)
+        frame.by_weekday(end - timedelta(days=364), end)
+        frame.consistency(end - timedelta(days=89), end)
+        frame.trend(end - timedelta(days=364), end)
+        elapsed = (time.perf_counter() - t) * 1000
+        self.assertEqual(frame.total(), sum(r['duration_minutes'] for r in rows))
+        print(f"✅ 100k sessions: stats in {elapsed:.1f} ms")
+
+if __name__ == '__main__':
+    unittest.main()
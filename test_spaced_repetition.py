@@ -0,0 +1,53 @@
+import unittest
+from datetime import date, timedelta
+import spaced_repetition as sr
+
+class TestSpacedRepetition(unittest.TestCase):
+    def test_split_topics(self):
+        print("\n📚 Splitting topics...")
+        topics = sr.split_topics("Derivatives, Chain rule; derivatives\n- Limits")
+        self.assertEqual(topics, ["Derivatives", "Chain rule", "Limits"])
+        self.assertEqual(sr.split_topics(""), [])
+        self.assertEqual(sr.split_topics(None), [])
+        print("✅ Topics split and de-duplicated")
+
+    def test_topic_key(self):
+        self.assertEqual(sr.topic_key("Linear  Algebra"), sr.topic_key("linear algebra"))
+        self.assertEqual(len(sr.topic_key("x" * 500)), 40)
+
+    def test_sm2_intervals(self):
+        print("\n🔁 Testing SM-2 intervals...")
+        today = date(2024, 1, 1)
+        card = {'ease_factor': sr.DEFAULT_EASE, 'interval_days': 0, 'repetitions': 0, 'lapses': 0}
+
+        card = sr.schedule_review(card, 'good', today)
+        self.assertEqual(card['interval_days'], 1)
+        card = sr.schedule_review(card, 'good', today)
+        self.assertEqual(card['interval_days'], 6)
+        card = sr.schedule_review(card, 'good', today)
+        self.assertEqual(card['interval_days'], 15)
+        self.assertEqual(card['next_due'], today + timedelta(days=15))
+        print("✅ Intervals grow 1 → 6 → 15")
+
+        lapsed = sr.schedule_review(card, 'again', today)
+        self.assertEqual(lapsed['repetitions'], 0)
+        self.assertEqual(lapsed['interval_days'], 1)
+        self.assertEqual(lapsed['lapses'], 1)
+        self.assertLess(lapsed['ease_factor'], card['ease_factor'])
+        print("✅ Failed review resets the card")
+
+    def test_ease_floor(self):
+        card = {'ease_factor': 1.3, 'interval_days': 1, 'repetitions': 0, 'lapses': 0}
+        for _ in range(5):
+            card = sr.schedule_review(card, 0, date(2024, 1, 1))
+        self.assertEqual(card['ease_factor'], sr.MIN_EASE)
+
+    def test_review_message(self):
+        cards = [{'topic': 'A'}, {'topic': 'B'}, {'topic': 'C'}]
+        msg = sr.build_review_message(cards, total_due=10)
+        self.assertIn("10 topics", msg)
+        self.assertIn("7 more", msg)
+        self.assertIsNone(sr.build_review_message([]))
+
+if __name__ == '__main__':
+    unittest.main()
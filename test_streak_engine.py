@@ -0,0 +1,58 @@
+import unittest
+from datetime import date, timedelta
+import streak_engine
+
+TODAY = date(2026, 3, 10)
+
+def day(offset):
+    return TODAY - timedelta(days=offset)
+
+class TestStreakEngine(unittest.TestCase):
+    def test_incremental_matches_recompute(self):
+        print("\n🔥 Testing incremental streak updates...")
+        state = streak_engine.empty_state()
+        for d in (day(6), day(5), day(5), day(3), day(2), day(1), day(0)):
+            state = streak_engine.record_activity(state, d)
+        state = streak_engine.record_activity(state, day(0), studied=True)
+        self.assertEqual(state['current_streak'], 4)
+        self.assertEqual(state['longest_streak'], 4)
+
+        rebuilt = streak_engine.recompute([day(6), day(5), day(3), day(2), day(1)], [day(0)])
+        self.assertEqual(state, rebuilt)
+        print("✅ Duplicates ignored, gaps reset the streak")
+
+    def test_backdated_day_fills_gap(self):
+        state = streak_engine.recompute([day(2), day(1), day(0), day(4)])
+        self.assertEqual(state['current_streak'], 3)
+        state = streak_engine.record_activity(state, day(3))
+        self.assertEqual((state['current_streak'], state['longest_streak']), (5, 5))
+
+    def test_backdated_day_joining_past_runs_updates_longest(self):
+        past = [day(i) for i in (10, 9, 8, 6, 5, 4)]
+        state = streak_engine.recompute(past + [day(0)])
+        self.assertEqual((state['current_streak'], state['longest_streak']), (1, 3))
+        state = streak_engine.record_activity(state, day(7))
+        self.assertEqual((state['current_streak'], state['longest_streak']), (1, 7))
+        self.assertEqual(state, streak_engine.recompute(past + [day(7), day(0)]))
+
+    def test_long_streak_survives_window(self):
+        days = [day(i) for i in range(100)]
+        state = streak_engine.recompute(days)
+        self.assertEqual(state['current_streak'], 100)
+        state = streak_engine.record_activity(state, day(-1))
+        self.assertEqual(state['current_streak'], 101)
+        self.assertEqual(state['active_bits'], streak_engine.MASK)
+
+    def test_reads_are_gap_aware(self):
+        print("\n🌱 Testing garden...")
+        state = streak_engine.recompute([day(3), day(2)], [day(2)])
+        self.assertEqual(streak_engine.current_streak(state, TODAY), 0)
+        self.assertEqual(streak_engine.current_streak(state, day(1)), 2)
+        garden = streak_engine.garden(state, days=5, today=TODAY)
+        self.assertEqual([g['streak_date'] for g in garden], [day(i) for i in range(4, -1, -1)])
+        self.assertEqual([(g['active'], g['studied']) for g in garden],
+                         [(False, False), (True, False), (True, True), (False, False), (False, False)])
+        print("✅ Missed days show up in place")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import time
+import unittest
+from datetime import date, timedelta
+import study_forecast
+from session_analytics import SessionFrame
+
+TODAY = date(2025, 6, 15)  # A Sunday
+
+def history(days, minutes_for, subject="Math"):
+    return [{'session_date': TODAY - timedelta(days=i), 'duration_minutes': minutes_for(TODAY - timedelta(days=i)),
+             'subject_name': subject, 'color_code': "#fff", 'start_time': None}
+            for i in range(days) if minutes_for(TODAY - timedelta(days=i))]
+
+class TestStudyForecast(unittest.TestCase):
+    def test_smoothing_follows_weekly_pattern(self):
+        print("\n🔮 Testing study forecast...")
+        series = [0 if i % 7 in (5, 6) else 60 for i in range(84)]  # Weekdays only
+        predictions = study_forecast.smooth(series)
+        self.assertEqual(len(predictions), 7)
+        self.assertAlmostEqual(sum(predictions), 300, delta=30)
+        self.assertLess(max(predictions[5:]), 15)
+        self.assertEqual(study_forecast.smooth([30, 30], horizon=3), [30, 30, 30])
+
+    def test_productivity_against_own_baseline(self):
+        frame = SessionFrame.from_rows(history(70, lambda d: 30))
+        week_start = TODAY - timedelta(days=6)
+        # 30 min/day is this user's normal week, so it scores well despite being far below 2h/day
+        self.assertGreaterEqual(study_forecast.productivity_score(frame, week_start, TODAY, TODAY), 95)
+        self.assertEqual(study_forecast.productivity_score(SessionFrame(), week_start, TODAY, TODAY), 0)
+
+    def test_at_risk_subject(self):
+        rows = history(84, lambda d: 60 if (TODAY - d).days > 14 else 0, "Physics")
+        rows += history(84, lambda d: 45, "Math")
+        goals = [{'subject_name': "Physics", 'goal_title': "Final exam", 'status': 'pending',
+                  'target_date': TODAY + timedelta(days=5)},
+                 {'subject_name': "Math", 'goal_title': "Quiz", 'status': 'pending',
+                  'target_date': TODAY + timedelta(days=3)}]
+        report = study_forecast.forecast(SessionFrame.from_rows(rows), goals, TODAY)
+        self.assertEqual([r['subject_name'] for r in report['at_risk']], ["Physics"])
+        self.assertFalse(report['routine'])
+        self.assertIn("Final exam", study_forecast.format_analysis(report))
+
+    def test_batch_speed(self):
+        frames = [SessionFrame.from_rows(history(84, lambda d, k=k: (d.day * k) % 90, f"S{k % 4}"))
+                  for k in range(200)]
+        start = time.perf_counter()
+        for frame in frames:
+            study_forecast.forecast(frame, (), TODAY)
+        per_user = (time.perf_counter() - start) / len(frames) * 1000
+        self.assertLess(per_user, 20)
+        print(f"✅ {per_user:.2f} ms per user forecast")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from ui_profiler import UIProfiler
+
+class TestUIProfiler(unittest.TestCase):
+    def test_nested_freeze_is_reported_once(self):
+        print("\n🔬 Testing freeze attribution...")
+        p = UIProfiler(enabled=True, block_ms=10)
+        with p.span('Button.click', 'callback'):
+            with p.span('Dashboard.navigate_to', 'view'):
+                with p.span('Dashboard.show_analytics', 'view'):
+                    time.sleep(0.02)
+        with p.span('quick'):
+            pass
+        blocked = p.summary()['blocked']
+        self.assertEqual(len(blocked), 1)
+        self.assertEqual(blocked[0]['name'], 'Button.click')
+        self.assertEqual(blocked[0]['inner'], ['Dashboard.navigate_to', 'Dashboard.show_analytics'])
+        print("✅ Freeze attributed to the outer callback")
+
+    def test_chrome_trace(self):
+        p = UIProfiler(enabled=True)
+        with p.span('work', page='home'):
+            pass
+        path = os.path.join(tempfile.mkdtemp(), 'trace.json')
+        p.write_trace(path)
+        with open(path) as f:
+            events = json.load(f)['traceEvents']
+        span = events[0]
+        self.assertEqual((span['name'], span['ph'], span['args']), ('work', 'X', {'page': 'home'}))
+
+    def test_disabled_is_noop(self):
+        p = UIProfiler(enabled=False)
+        with p.span('x'):
+            pass
+        self.assertEqual(len(p.events), 0)
+
+if __name__ == '__main__':
+    unittest.main()
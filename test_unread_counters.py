@@ -0,0 +1,69 @@
+import unittest
+import unread_counters
+
+class FakeCounters:
+    """notification_counters in memory, updated the way ADJUST does"""
+    def __init__(self, counts):
+        self.counts = dict(counts)
+
+    def apply(self, changes):
+        for delta, user_id in changes:
+            if user_id in self.counts:
+                self.counts[user_id] = max(0, self.counts[user_id] + delta)
+
+class TestUnreadCounters(unittest.TestCase):
+    def setUp(self):
+        self.notifications = [
+            {'notification_id': 1, 'user_id': 1, 'is_read': 0},
+            {'notification_id': 2, 'user_id': 1, 'is_read': 1},
+            {'notification_id': 3, 'user_id': 1, 'is_read': 0},
+            {'notification_id': 4, 'user_id': 2, 'is_read': 0},
+        ]
+        self.counters = FakeCounters({1: 2, 2: 1})
+
+    def locked(self, *ids):
+        return [n for n in self.notifications if n['notification_id'] in ids]
+
+    def read(self, *ids):
+        """mark_notification_read: lock, decrement by what is still unread, mark"""
+        rows = self.locked(*ids)
+        self.counters.apply(unread_counters.decrements(rows))
+        for row in rows:
+            row['is_read'] = 1
+
+    def test_decrement_counts_only_unread_rows(self):
+        print("\n🔔 Testing unread counter decrements...")
+        self.assertEqual(unread_counters.decrements(self.locked(1, 2, 3, 4)), [(-2, 1), (-1, 2)])
+        self.assertEqual(unread_counters.decrements(self.locked(2)), [])
+        self.assertEqual(unread_counters.decrements([]), [])
+        print("✅ Read rows are not counted twice")
+
+    def test_serialized_double_read_decrements_once(self):
+        # With the row locked, the second call sees the first one's is_read = 1
+        self.read(1)
+        self.read(1)
+        self.assertEqual(self.counters.counts, {1: 1, 2: 1})
+        self.read(1, 2, 3, 4)  # Mark all / archive
+        self.assertEqual(self.counters.counts, {1: 0, 2: 0})
+
+    def test_counters_never_go_negative(self):
+        self.counters.counts[1] = 1  # Drifted low
+        self.read(1, 3)
+        self.assertEqual(self.counters.counts[1], 0)
+
+    def test_reconcile_applies_the_difference(self):
+        print("\n🔔 Testing unread counter reconcile...")
+        counts = [{'user_id': 1, 'counted': 5, 'unread': 2},
+                  {'user_id': 2, 'counted': 1, 'unread': 1},
+                  {'user_id': 3, 'counted': 0, 'unread': 4}]
+        changes = unread_counters.corrections(counts)
+        self.assertEqual(changes, [(-3, 1), (4, 3)])
+
+        # A notification added between the count and the fix is kept
+        counters = FakeCounters({1: 6, 2: 1, 3: 0})
+        counters.apply(changes)
+        self.assertEqual(counters.counts, {1: 3, 2: 1, 3: 4})
+        print("✅ Drifted counters corrected by delta")
+
+if __name__ == '__main__':
+    unittest.main()
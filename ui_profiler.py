@@ -0,0 +1,304 @@
+"""
+UI Profiler - Opt-in frame-time and event-loop latency profiling
+Measures Tk event-loop lag with periodic `after` probes, times every Tk
+callback and dashboard navigation, and records which callbacks blocked the
+main thread. Results go to a debug overlay (F12) and a Chrome trace file
+(open in chrome://tracing or ui.perfetto.dev).
+
+Enable with UI_PROFILER['enabled'] in config.py or STUDY_PLANNER_PROFILE=1.
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+import tkinter
+from collections import deque
+from contextlib import contextmanager
+
+try:
+    from config import UI_PROFILER as SETTINGS
+except ImportError:
+    SETTINGS = {}
+
+MAX_EVENTS = 200000
+MIN_CALLBACK_MS = 5  # Shorter callbacks are not written to the trace
+BLOCKED_HISTORY = 50
+
+
+class UIProfiler:
+    """Collects spans, callback timings and loop lag as Chrome trace events"""
+
+    def __init__(self, enabled=False, block_ms=50, probe_ms=100, trace_file='ui_trace.json'):
+        self.enabled = enabled
+        self.block_ms = block_ms
+        self.probe_ms = probe_ms
+        self.trace_file = trace_file
+        self.events = deque(maxlen=MAX_EVENTS)
+        self.blocked = deque(maxlen=BLOCKED_HISTORY)
+        self.lag_ms = 0.0
+        self.worst_lag_ms = 0.0
+        self.root = None
+        self.overlay = None
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._main_thread = threading.get_ident()
+        self._expected = None
+        self._probe_id = None
+        self._last_long = None
+        self._original_call = None
+        self._lock = threading.Lock()
+
+    # ---------- Lifecycle ----------
+
+    def start(self, root):
+        """Begin probing the event loop of `root` and timing Tk callbacks"""
+        if not self.enabled or self.root is not None:
+            return
+        self.root = root
+        self._main_thread = threading.get_ident()
+        self._patch_callbacks()
+        self._patch_markdown()
+        self._schedule_probe()
+        root.bind_all("<F12>", lambda e: self.toggle_overlay(), add="+")
+        atexit.register(self.stop)
+        print(f"🔬 UI profiler on (freeze threshold {self.block_ms} ms, F12 for overlay)")
+
+    def stop(self):
+        """Stop probing and write the trace file"""
+        if self.root is None:
+            return
+        if self._probe_id is not None:
+            try:
+                self.root.after_cancel(self._probe_id)
+            except Exception:
+                pass
+        self._probe_id = None
+        if self._original_call is not None:
+            tkinter.CallWrapper.__call__ = self._original_call
+            self._original_call = None
+        self.root = None
+        if self.trace_file:
+            self.write_trace(self.trace_file)
+
+    # ---------- Spans ----------
+
+    @contextmanager
+    def span(self, name, category='ui', **args):
+        """Time a block of code as a complete ('X') trace event"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._complete(name, category, start, time.perf_counter(), args)
+
+    def wrap(self, fn, name=None, category='ui'):
+        """Decorate fn so each call is recorded as a span"""
+        label = name or _describe(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with self.span(label, category):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    def instrument(self, obj, names, category='ui'):
+        """Replace bound methods on one instance with timed versions"""
+        if not self.enabled:
+            return
+        cls_name = type(obj).__name__
+        for name in names:
+            method = getattr(obj, name, None)
+            if callable(method):
+                setattr(obj, name, self.wrap(method, f"{cls_name}.{name}", category))
+
+    def instrument_dashboard(self, dashboard):
+        """Time navigation and every show_* page constructor"""
+        names = ['navigate_to', 'load_user_data', 'create_ui']
+        names += [n for n in dir(type(dashboard)) if n.startswith('show_')]
+        self.instrument(dashboard, names, category='view')
+
+    def _complete(self, name, category, start, end, args=None):
+        duration_ms = (end - start) * 1000
+        tid = threading.get_ident()
+        event = {
+            'name': name, 'cat': category, 'ph': 'X',
+            'ts': (start - self._origin) * 1e6, 'dur': duration_ms * 1000,
+            'pid': self._pid, 'tid': tid,
+        }
+        if args:
+            event['args'] = {k: str(v) for k, v in args.items()}
+        with self._lock:
+            self.events.append(event)
+        if tid == self._main_thread and duration_ms >= self.block_ms:
+            self._note_blocked(name, category, duration_ms, end)
+
+    def _note_blocked(self, name, category, duration_ms, end):
+        end_s = end - self._origin
+        entry = {'name': name, 'category': category, 'ms': round(duration_ms, 1),
+                 'at': round(end_s, 3), 'inner': []}
+        start_s = end_s - duration_ms / 1000
+        with self._lock:
+            # Inner spans finish first; fold them into the outer entry so one
+            # freeze reads "callback -> Dashboard.navigate_to -> Dashboard.show_home"
+            while self.blocked and self.blocked[-1]['at'] >= start_s and self.blocked[-1]['category'] != 'lag':
+                inner = self.blocked.pop()
+                entry['inner'] = [inner['name']] + inner['inner'] + entry['inner']
+            self.blocked.append(entry)
+            self._last_long = entry
+
+    # ---------- Tk callbacks ----------
+
+    def _patch_callbacks(self):
+        """Time every Tk callback (commands, bindings, after) via CallWrapper"""
+        if self._original_call is not None:
+            return
+        original = tkinter.CallWrapper.__call__
+        self._original_call = original
+        profiler = self
+
+        def timed_call(wrapper, *args):
+            start = time.perf_counter()
+            try:
+                return original(wrapper, *args)
+            finally:
+                end = time.perf_counter()
+                if (end - start) * 1000 >= MIN_CALLBACK_MS:
+                    profiler._complete(_describe(wrapper.func), 'callback', start, end)
+
+        tkinter.CallWrapper.__call__ = timed_call
+
+    def _patch_markdown(self):
+        try:
+            from markdown_utils import MarkdownParser
+        except ImportError:
+            return
+        if not getattr(MarkdownParser.parse_and_insert, '_profiled', False):
+            wrapped = self.wrap(MarkdownParser.parse_and_insert, "MarkdownParser.parse_and_insert", 'render')
+            wrapped._profiled = True
+            MarkdownParser.parse_and_insert = wrapped
+
+    # ---------- Event-loop lag ----------
+
+    def _schedule_probe(self):
+        self._expected = time.perf_counter() + self.probe_ms / 1000
+        self._probe_id = self.root.after(self.probe_ms, self._probe)
+
+    def _probe(self):
+        now = time.perf_counter()
+        lag = max(0.0, (now - self._expected) * 1000)
+        self.lag_ms = lag
+        self.worst_lag_ms = max(self.worst_lag_ms, lag)
+        with self._lock:
+            self.events.append({
+                'name': 'event_loop_lag', 'ph': 'C', 'ts': (now - self._origin) * 1e6,
+                'pid': self._pid, 'tid': self._main_thread, 'args': {'lag_ms': round(lag, 2)},
+            })
+        if lag >= self.block_ms:
+            culprit = self._last_long
+            if culprit is None or now - self._origin - culprit['at'] > (lag + self.probe_ms) / 1000:
+                # Nothing we timed explains it: Tk redraw/layout or untracked work
+                self._note_blocked("(untracked: redraw / layout)", 'lag', lag, now)
+        if self.overlay is not None:
+            self.overlay.refresh()
+        if self.root is not None:
+            self._schedule_probe()
+
+    # ---------- Output ----------
+
+    def summary(self):
+        with self._lock:
+            blocked = list(self.blocked)
+        return {
+            'lag_ms': round(self.lag_ms, 1),
+            'worst_lag_ms': round(self.worst_lag_ms, 1),
+            'blocked': blocked,
+        }
+
+    def write_trace(self, path):
+        with self._lock:
+            events = list(self.events)
+        events.append({'name': 'thread_name', 'ph': 'M', 'pid': self._pid,
+                       'tid': self._main_thread, 'args': {'name': 'Tk main thread'}})
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+            print(f"🔬 UI trace written to {path} ({len(events)} events)")
+        except OSError as e:
+            print(f"⚠️ Could not write UI trace: {e}")
+
+    def toggle_overlay(self):
+        if self.overlay is not None and self.overlay.winfo_exists():
+            self.overlay.destroy()
+            self.overlay = None
+        elif self.root is not None:
+            self.overlay = DebugOverlay(self.root, self)
+
+
+class DebugOverlay(tkinter.Toplevel):
+    """Small always-on-top window with live loop lag and recent freezes"""
+
+    def __init__(self, root, profiler):
+        super().__init__(root)
+        self.profiler = profiler
+        self.title("UI Profiler")
+        self.geometry("420x300+20+20")
+        self.attributes('-topmost', True)
+        self.configure(bg="#0F172A")
+        self.protocol("WM_DELETE_WINDOW", profiler.toggle_overlay)
+
+        self.lag_label = tkinter.Label(self, font=("Consolas", 12, "bold"),
+                                       bg="#0F172A", fg="#34D399", anchor="w")
+        self.lag_label.pack(fill="x", padx=10, pady=(10, 5))
+        self.blocked_text = tkinter.Text(self, font=("Consolas", 9), bg="#1E293B",
+                                         fg="#F8FAFC", relief="flat", height=14)
+        self.blocked_text.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self.refresh()
+
+    def refresh(self):
+        if not self.winfo_exists():
+            return
+        s = self.profiler.summary()
+        color = "#34D399" if s['lag_ms'] < self.profiler.block_ms else "#fbbf24"
+        self.lag_label.configure(text=f"Loop lag {s['lag_ms']:6.1f} ms   worst {s['worst_lag_ms']:.1f} ms",
+                                 fg=color)
+        self.blocked_text.delete("1.0", "end")
+        for entry in reversed(s['blocked']):
+            path = " → ".join([entry['name']] + entry['inner'])
+            self.blocked_text.insert("end", f"{entry['at']:9.2f}s {entry['ms']:7.1f} ms  {path}\n")
+
+
+def _describe(func):
+    """Readable name for a callback, unwrapping after() closures"""
+    if getattr(func, '__qualname__', '').endswith('after.<locals>.callit'):
+        for cell in func.__closure__ or ():
+            inner = cell.cell_contents
+            if callable(inner):
+                func = inner
+                break
+    bound_self = getattr(func, '__self__', None)
+    name = getattr(func, '__qualname__', None) or repr(func)
+    if name.endswith('<lambda>') and hasattr(func, '__code__'):
+        code = func.__code__
+        return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    if bound_self is not None and not name.startswith(type(bound_self).__name__):
+        return f"{type(bound_self).__name__}.{func.__name__}"
+    return name
+
+
+def _enabled_from_env():
+    return os.environ.get('STUDY_PLANNER_PROFILE', '').lower() in ('1', 'true', 'yes')
+
+
+# Global profiler; a no-op unless enabled
+profiler = UIProfiler(
+    enabled=SETTINGS.get('enabled', False) or _enabled_from_env(),
+    block_ms=SETTINGS.get('block_ms', 50),
+    probe_ms=SETTINGS.get('probe_ms', 100),
+    trace_file=SETTINGS.get('trace_file', 'ui_trace.json'),
+)
@@ -0,0 +1,24 @@
+"""
+Unread Counters - Arithmetic behind notification_counters
+The badge reads one counter row per user instead of counting unread
+notifications. Writes that read or delete notifications lock the rows
+first and lower the counters by what was still unread among them;
+the reconcile job applies the difference to counters that drifted.
+"""
+
+from collections import Counter
+
+# Changes are applied as deltas so concurrent additions still count
+ADJUST = "UPDATE notification_counters SET unread_count = GREATEST(0, unread_count + %s) WHERE user_id = %s"
+
+
+def decrements(rows):
+    """Locked notification rows (user_id, is_read) -> [(delta, user_id)] for reading/deleting them"""
+    unread = Counter(row['user_id'] for row in rows if not row['is_read'])
+    return [(-count, user_id) for user_id, count in sorted(unread.items())]
+
+
+def corrections(counts):
+    """Rows of (user_id, counted, unread) -> [(delta, user_id)] for the counters that drifted"""
+    return [(row['unread'] - row['counted'], row['user_id'])
+            for row in counts if row['unread'] != row['counted']]